@@ -1,13 +1,8 @@
 import streamlit as st
 
-st.set_page_config(
-    page_title="CEO AI Assistant - Financial Intelligence Platform",
-    page_icon="💼",
-    layout="wide"
-)
-
-# --- Simple styling ---
-st.markdown("""
+# Static page markup (plain literals; Streamlit re-runs this script, and so
+# re-evaluates them, on every interaction)
+_CSS = """
 <style>
     .hero-section { 
         padding: 3rem 1rem; 
@@ -20,15 +15,26 @@ st.markdown("""
         margin-top: 2rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# --- Hero Section ---
-st.markdown("""
+_HERO = """
 <div class="hero-section">
     <h1>💼 CEO AI Assistant</h1>
     <p>Your AI-powered platform for financial and competitive intelligence</p>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+st.set_page_config(
+    page_title="CEO AI Assistant - Financial Intelligence Platform",
+    page_icon="💼",
+    layout="wide"
+)
+
+# --- Simple styling ---
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# --- Hero Section ---
+st.markdown(_HERO, unsafe_allow_html=True)
 
 # --- Navigation Buttons ---
 st.markdown("---")
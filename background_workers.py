@@ -1,96 +1,155 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Research, online, trend and summary crews are independent and run side by side
+RESEARCH_MAX_WORKERS = 4
+
 def _ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
+def _write_job_file(job_file, payload):
+    """Atomically write a job payload, using orjson when installed.
+
+    The payload goes to a temp file that is fsynced and then renamed over the
+    job file, so a poller never reads a truncated or half-written JSON.
+    """
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+    tmp_file = f"{job_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, job_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+def _run_crew(agent_factory, task_factory, *args, **kwargs):
+    """Run a single-agent crew and return its raw output, or None if it produced nothing.
+
+    The agent and its task are built here, on the thread that runs the crew:
+    agents are memoized per thread, so concurrent crews never share one.
+    """
+    from crewai import Crew, Process
+
+    agent = agent_factory()
+    task = task_factory(agent, *args, **kwargs)
+    result = Crew(agents=[agent], tasks=[task], process=Process.sequential).kickoff()
+    return getattr(result, 'raw', None) if result else None
+
+def _result_or_none(future, label):
+    """Return a crew future's output, logging and swallowing its failure."""
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"{label} crew failed: {str(e)}")
+        return None
+
+def _load_runtime():
+    """Import the agent stack and build the shared agents, tasks and memory once.
+
+    Imports happen here, not at module level, so a worker process can load the
+    modules independently and the Streamlit app does not pay for them.
+    """
+    from financial_agents import FinancialAgents
+    from financial_tasks import FinancialTasks
+    from utils import get_memory
+    import crewai  # noqa: F401 - fail early if the agent runtime is missing
+
+    return {
+        "memory": get_memory(),
+        "agents": FinancialAgents(),
+        "tasks": FinancialTasks(),
+    }
+
+def _job_file_path(session_id, workspace_path):
+    job_dir = os.path.join(workspace_path, ".jobs")
+    _ensure_dir(job_dir)
+    return os.path.join(job_dir, f"{session_id}.json")
+
+def _write_error(job_file, error):
+    _write_job_file(job_file, {"status": "error", "error": str(error), "ts": datetime.now().isoformat()})
+
 def run_company_research(session_id: str, company_name: str, workspace_path: str):
     """Run company research using local agent factories and save results to a job file.
 
-    This runs in a separate process (ProcessPoolExecutor) so it must import modules
-    locally and avoid relying on Streamlit state.
+    Safe to call in a separate process (e.g. ProcessPoolExecutor): modules are
+    imported locally and no Streamlit state is relied on.
     """
-    # Import inside function so worker process can load modules independently
     try:
-        from financial_agents import FinancialAgents
-        from financial_tasks import FinancialTasks
-        from utils import get_memory
-        from crewai import Crew, Process
+        runtime = _load_runtime()
     except Exception as e:
         # If imports fail, write an error job file
-        job_dir = os.path.join(workspace_path, ".jobs")
-        _ensure_dir(job_dir)
-        job_file = os.path.join(job_dir, f"{session_id}.json")
-        json.dump({"status": "error", "error": str(e), "ts": datetime.now().isoformat()}, open(job_file, "w"))
+        _write_error(_job_file_path(session_id, workspace_path), e)
         return
 
-    job_dir = os.path.join(workspace_path, ".jobs")
-    _ensure_dir(job_dir)
-    job_file = os.path.join(job_dir, f"{session_id}.json")
+    _research_company(session_id, company_name, workspace_path, runtime)
+
+def _research_company(session_id, company_name, workspace_path, runtime):
+    """Run the research crews for one company with an already-loaded runtime."""
+    job_file = _job_file_path(session_id, workspace_path)
 
     try:
-        memory = get_memory()
-        financial_agents = FinancialAgents()
-        financial_tasks = FinancialTasks()
-
-        expert_outputs = []
-
-        # Company research
-        research_agent = financial_agents.company_research_agent()
-        research_task = financial_tasks.research_company_task(research_agent, company_name)
-        research_crew = Crew(agents=[research_agent], tasks=[research_task], process=Process.sequential)
-        research_result = research_crew.kickoff()
-        if research_result and getattr(research_result, 'raw', None):
-            expert_outputs.append(research_result.raw)
-
-        # Online research
-        online_agent = financial_agents.online_research_agent()
-        online_task = financial_tasks.online_research_task(online_agent, query=company_name, company_name=company_name)
-        online_crew = Crew(agents=[online_agent], tasks=[online_task], process=Process.sequential)
-        online_result = online_crew.kickoff()
-        if online_result and getattr(online_result, 'raw', None):
-            expert_outputs.append(online_result.raw)
-
-        # Trend analysis
-        trend_agent = financial_agents.financial_trend_analyst_agent()
-        trend_task = financial_tasks.trend_analysis_task(trend_agent, historical_data=company_name)
-        trend_crew = Crew(agents=[trend_agent], tasks=[trend_task], process=Process.sequential)
-        trend_result = trend_crew.kickoff()
-        if trend_result and getattr(trend_result, 'raw', None):
-            expert_outputs.append(trend_result.raw)
-
-        # Quick financial summary
-        summary_agent = financial_agents.financial_trend_analyst_agent()
-        summary_task = financial_tasks.quick_financial_summary_task(summary_agent, company_name)
-        summary_crew = Crew(agents=[summary_agent], tasks=[summary_task], process=Process.sequential)
-        summary_result = summary_crew.kickoff()
-        if summary_result and getattr(summary_result, 'raw', None):
-            expert_outputs.append(summary_result.raw)
-
-        # Investment advisor
-        advisor_agent = financial_agents.investment_advisor_agent()
-        analysis_summary = research_result.raw if (research_result and getattr(research_result, 'raw', None)) else company_name
-        advisor_task = financial_tasks.investment_recommendation_task(advisor_agent, analysis_summary)
-        advisor_crew = Crew(agents=[advisor_agent], tasks=[advisor_task], process=Process.sequential)
-        advisor_result = advisor_crew.kickoff()
-        if advisor_result and getattr(advisor_result, 'raw', None):
-            expert_outputs.append(advisor_result.raw)
+        memory = runtime["memory"]
+        financial_agents = runtime["agents"]
+        financial_tasks = runtime["tasks"]
+
+        # Fan out the independent crews; the advisor only needs the research
+        # output, so it is queued as soon as research finishes.
+        with ThreadPoolExecutor(max_workers=RESEARCH_MAX_WORKERS) as executor:
+            research_future = executor.submit(
+                _run_crew, financial_agents.company_research_agent, financial_tasks.research_company_task, company_name)
+            online_future = executor.submit(
+                _run_crew, financial_agents.online_research_agent, financial_tasks.online_research_task,
+                query=company_name, company_name=company_name)
+            trend_future = executor.submit(
+                _run_crew, financial_agents.financial_trend_analyst_agent, financial_tasks.trend_analysis_task,
+                historical_data=company_name)
+            summary_future = executor.submit(
+                _run_crew, financial_agents.financial_trend_analyst_agent, financial_tasks.quick_financial_summary_task,
+                company_name)
+
+            research_output = _result_or_none(research_future, "Company research")
+            analysis_summary = research_output or company_name
+            advisor_future = executor.submit(
+                _run_crew, financial_agents.investment_advisor_agent, financial_tasks.investment_recommendation_task,
+                analysis_summary)
+
+            expert_outputs = [research_output] + [
+                _result_or_none(future, label) for future, label in (
+                    (online_future, "Online research"),
+                    (trend_future, "Trend analysis"),
+                    (summary_future, "Financial summary"),
+                    (advisor_future, "Investment advisor"),
+                )
+            ]
+        # Keep the original research/online/trend/summary/advisor order, minus empty results
+        expert_outputs = [output for output in expert_outputs if output]
 
         # Synthesize using the dedicated company insights synthesis agent if available
         synth_output = None
         try:
-            synth_agent = financial_agents.company_insights_synthesis_agent()
             expert_join = "\n\n---\n\n".join(expert_outputs)
-            synth_task = financial_tasks.strategy_synthesis_task(
-                synth_agent,
+            synth_output = _run_crew(
+                financial_agents.company_insights_synthesis_agent,
+                financial_tasks.strategy_synthesis_task,
                 query=f"List up to 10 concise, actionable insights for {company_name} for an executive (each 1-2 short bullets).",
                 expert_responses=expert_join
             )
-            synth_crew = Crew(agents=[synth_agent], tasks=[synth_task], process=Process.sequential)
-            synth_result = synth_crew.kickoff()
-            if synth_result and getattr(synth_result, 'raw', None):
-                synth_output = synth_result.raw
         except Exception:
             synth_output = None
 
@@ -101,8 +160,7 @@ def run_company_research(session_id: str, company_name: str, workspace_path: str
             "expert_outputs": expert_outputs,
             "synth_output": synth_output
         }
-        with open(job_file, "w") as f:
-            json.dump(payload, f)
+        _write_job_file(job_file, payload)
 
         # Optionally update knowledge graph (best-effort)
         try:
@@ -112,5 +170,4 @@ def run_company_research(session_id: str, company_name: str, workspace_path: str
             pass
 
     except Exception as e:
-        with open(job_file, "w") as f:
-            json.dump({"status": "error", "error": str(e), "ts": datetime.now().isoformat()}, f)
+        _write_error(job_file, e)
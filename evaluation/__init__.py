@@ -1,20 +1,33 @@
 # LLM-as-a-Judge Evaluation Framework
 # Compares Basic, Detailed, and Agentic (multi-agent) systems
+#
+# Exports are resolved on first access (PEP 562), so importing the package
+# for TEST_CASES or BasicGemini does not pull in CrewAI.
 
-from .llm_judge import LLMJudge, EvaluationResult
-from .baseline_gemini import BasicGemini
-from .detailed_gemini import DetailedGemini
-from .agentic_system import AgenticSystem
-from .test_cases import TEST_CASES, TestCase
-from .run_evaluation import run_full_evaluation
+import importlib
 
-__all__ = [
-    "LLMJudge",
-    "EvaluationResult", 
-    "BasicGemini",
-    "DetailedGemini",
-    "AgenticSystem",
-    "TEST_CASES",
-    "TestCase",
-    "run_full_evaluation"
-]
+_EXPORTS = {
+    "LLMJudge": ".llm_judge",
+    "EvaluationResult": ".llm_judge",
+    "BasicGemini": ".baseline_gemini",
+    "DetailedGemini": ".detailed_gemini",
+    "AgenticSystem": ".agentic_system",
+    "TEST_CASES": ".test_cases",
+    "TestCase": ".test_cases",
+    "run_full_evaluation": ".run_evaluation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,74 @@
+"""
+Adaptive Concurrency Control
+
+AIMD (additive-increase, multiplicative-decrease) admission control for async
+Gemini calls: the number of requests in flight grows while responses come
+back quickly and is halved as soon as the API reports overload (429/5xx).
+"""
+
+import math
+import asyncio
+from typing import Optional
+
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:  # only the message heuristics are available without google-api-core
+    api_exceptions = None
+
+# Substrings of transient server-side failures that should shrink concurrency
+_SERVER_ERROR_MARKERS = ("500", "502", "503", "504", "internal error", "unavailable", "deadline exceeded")
+
+
+def is_server_error(error: Exception) -> bool:
+    """Return True for transient 5xx failures (typed for Google API errors, else by message)."""
+    if api_exceptions is not None and isinstance(error, api_exceptions.GoogleAPICallError):
+        return isinstance(error, (
+            api_exceptions.ServiceUnavailable,
+            api_exceptions.DeadlineExceeded,
+            api_exceptions.InternalServerError,
+        ))
+    message = str(error).lower()
+    return any(marker in message for marker in _SERVER_ERROR_MARKERS)
+
+
+class AIMDController:
+    """Async concurrency limit that adapts to the provider's real capacity."""
+
+    def __init__(self, initial: float = 2.0, minimum: float = 1.0, maximum: float = 8.0,
+                 increase: float = 0.5, decrease: float = 0.5, target_latency: float = 15.0):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._condition = None
+        self._loop = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Return a Condition bound to the running loop (each asyncio.run gets a new one)."""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self) -> None:
+        """Wait until fewer than ceil(limit) requests are in flight, then take a slot."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < math.ceil(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        """Return a slot and adjust the limit from how the request went."""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            elif latency is not None and latency <= self.target_latency:
+                self.limit = min(self.maximum, self.limit + self.increase)
+            condition.notify_all()
@@ -0,0 +1,55 @@
+"""
+Gemini Request Loop
+
+A single background asyncio event loop that runs every DetailedGemini request.
+Blocking callers submit a coroutine and wait on its future; rate-limit and
+backoff waits are awaited on the loop instead of time.sleep() in the caller,
+and async gRPC clients always run on the loop they were created on.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+
+class GeminiQueue:
+    """Owns the background event loop and hands coroutines to it."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="gemini-queue", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro) -> Future:
+        """Schedule `coro` on the loop and return a concurrent.futures.Future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def run(self, coro):
+        """Run `coro` on the loop and block until it finishes."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("GeminiQueue.run() called from the queue's own loop; await the coroutine instead")
+        return self.submit(coro).result()
+
+
+_queue: Optional[GeminiQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> GeminiQueue:
+    """Return the process-wide request loop."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = GeminiQueue()
+        return _queue
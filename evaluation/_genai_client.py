@@ -0,0 +1,111 @@
+"""
+Shared Gemini Client
+
+Configures the google.generativeai SDK once per process and hands out shared
+GenerativeModel instances, so evaluation wrappers created repeatedly reuse
+the same underlying connection instead of building a new one each time.
+"""
+
+import sys
+import threading
+import dataclasses
+import importlib
+import importlib.util
+from functools import lru_cache
+
+
+def _lazy_import(name: str):
+    """Import `name` lazily: the module body only runs on first attribute access."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        # Not installed; let the regular import raise the usual ImportError
+        return importlib.import_module(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# google.generativeai pulls in grpc/protobuf; defer that until the first call
+genai = _lazy_import("google.generativeai")
+
+_configure_lock = threading.Lock()
+_configured_key = None
+
+
+def configure(api_key: str) -> None:
+    """Configure the SDK for `api_key`; repeat calls with the same key are no-ops."""
+    global _configured_key
+    with _configure_lock:
+        if api_key != _configured_key:
+            genai.configure(api_key=api_key)
+            _configured_key = api_key
+            get_model.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def get_model(name: str) -> "genai.GenerativeModel":
+    """Return the shared GenerativeModel for `name` (safe to use from multiple threads)."""
+    return genai.GenerativeModel(name)
+
+
+def _to_genai_contents(prompt):
+    """Convert a prompt (text or a text-only genai.protos.Content) for the google-genai SDK."""
+    if isinstance(prompt, str):
+        return prompt
+    return {"role": prompt.role or "user", "parts": [{"text": part.text} for part in prompt.parts]}
+
+
+def _to_genai_config(generation_config):
+    """Convert a genai.GenerationConfig (or dict) into a google-genai config dict."""
+    if generation_config is None or isinstance(generation_config, dict):
+        return generation_config
+    return {
+        field.name: getattr(generation_config, field.name)
+        for field in dataclasses.fields(generation_config)
+        if getattr(generation_config, field.name) is not None
+    }
+
+
+class KeyedModel:
+    """
+    Model whose requests are sent with its own API key instead of the configured one.
+    
+    genai.configure() is process-global, so each extra key gets its own
+    google-genai Client. Offers the subset of the GenerativeModel interface the
+    evaluation systems use: model_name, generate_content (optionally streamed)
+    and generate_content_async; responses and chunks expose .text.
+    """
+    
+    def __init__(self, name: str, api_key: str):
+        # The per-key client lives in the google-genai SDK, not google.generativeai
+        from google import genai as google_genai
+        
+        # Same "models/..." form as GenerativeModel.model_name, so cache keys match across keys
+        self.model_name = name if "/" in name else f"models/{name}"
+        self.client = google_genai.Client(api_key=api_key)
+    
+    def generate_content(self, prompt, generation_config=None, stream: bool = False):
+        """Generate a response, or an iterator of chunks with `stream=True`."""
+        request = dict(model=self.model_name, contents=_to_genai_contents(prompt),
+                       config=_to_genai_config(generation_config))
+        if stream:
+            return self.client.models.generate_content_stream(**request)
+        return self.client.models.generate_content(**request)
+    
+    async def generate_content_async(self, prompt, generation_config=None):
+        """Async variant of generate_content()."""
+        return await self.client.aio.models.generate_content(
+            model=self.model_name, contents=_to_genai_contents(prompt),
+            config=_to_genai_config(generation_config)
+        )
+
+
+@lru_cache(maxsize=32)
+def get_keyed_model(name: str, api_key: str) -> KeyedModel:
+    """Return the shared model for `name` whose requests are sent with `api_key`."""
+    return KeyedModel(name, api_key)
@@ -0,0 +1,20 @@
+"""
+Input Guards
+
+Shared checks that let every evaluation system return early on empty or
+trivially short inputs instead of spending an API round-trip on them.
+"""
+
+# Below this many characters a "document" has nothing worth analyzing
+MIN_DOCUMENT_CHARS = 50
+DOCUMENT_TOO_SHORT = "The document is too short to analyze."
+
+
+def is_blank(*values) -> bool:
+    """Return True if any of the given inputs is None, empty, or whitespace only."""
+    return any(not (value or "").strip() for value in values)
+
+
+def document_too_short(document_content: str) -> bool:
+    """Return True if a document has fewer than MIN_DOCUMENT_CHARS meaningful characters."""
+    return len((document_content or "").strip()) < MIN_DOCUMENT_CHARS
@@ -0,0 +1,101 @@
+"""
+LLM Response Cache
+
+Content-addressed on-disk cache for the evaluation harness. Responses are keyed
+by a hash of (model id, prompt), so re-running an evaluation over the same test
+cases returns stored answers instead of calling the model again.
+
+Set LLM_CACHE_DISABLED=1 to bypass the cache for a fresh run, or
+LLM_CACHE_REFRESH=1 to ignore stored answers but overwrite them with new ones.
+Answers older than LLM_CACHE_TTL_HOURS (default: never) are treated as misses;
+callers whose answers depend on live web data pass `max_age=WEB_MAX_AGE`
+(LLM_CACHE_WEB_TTL_HOURS, default 24) so they are refetched at least daily.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+
+CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache.sqlite3")
+)
+
+def _hours_env(name: str, default: Optional[float]) -> Optional[float]:
+    """Read an hours setting as seconds; unset or <= 0 means no expiry."""
+    value = os.getenv(name, "").strip()
+    hours = float(value) if value else default
+    return hours * 3600 if hours and hours > 0 else None
+
+
+# Default age limit for stored answers, in seconds (None: never expire)
+DEFAULT_MAX_AGE = _hours_env("LLM_CACHE_TTL_HOURS", None)
+# Age limit for answers built from web search or other time-sensitive data
+WEB_MAX_AGE = _hours_env("LLM_CACHE_WEB_TTL_HOURS", 24)
+
+_lock = threading.Lock()
+_connection = None
+
+
+def cache_enabled() -> bool:
+    """Return False when LLM_CACHE_DISABLED is set to a truthy value."""
+    return os.getenv("LLM_CACHE_DISABLED", "").strip().lower() not in ("1", "true", "yes")
+
+
+def cache_refresh() -> bool:
+    """Return True when LLM_CACHE_REFRESH is set: lookups miss, stores still happen."""
+    return os.getenv("LLM_CACHE_REFRESH", "").strip().lower() in ("1", "true", "yes")
+
+
+def cache_key(model_id: str, prompt: str) -> str:
+    """Hash a (model id, prompt) pair into a fixed-length cache key."""
+    return hashlib.blake2b(f"{model_id}\x00{prompt}".encode("utf-8"), digest_size=32).hexdigest()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Open the cache database once per process; callers must hold _lock."""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, created_at REAL)"
+        )
+        _connection.commit()
+    return _connection
+
+
+def cached_call(model_id: str, prompt: str, max_age: Optional[float] = DEFAULT_MAX_AGE) -> Optional[str]:
+    """
+    Return the stored response for this model/prompt, or None on a miss.
+    
+    A response stored more than `max_age` seconds ago counts as a miss.
+    """
+    if not cache_enabled() or cache_refresh():
+        return None
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (cache_key(model_id, prompt),)
+        ).fetchone()
+    if not row:
+        return None
+    response, created_at = row
+    if max_age is not None and (created_at is None or time.time() - created_at > max_age):
+        return None
+    return response
+
+
+def store(model_id: str, prompt: str, text: str) -> None:
+    """Store a successful response. Empty responses are not cached."""
+    if not cache_enabled() or not text:
+        return
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, created_at) VALUES (?, ?, ?, ?)",
+            (cache_key(model_id, prompt), model_id, text, time.time())
+        )
+        conn.commit()
@@ -0,0 +1,100 @@
+"""
+Rate Limiting Helpers
+
+Client-side request pacing for the Gemini API, shared by every evaluation
+system so concurrent callers stay under the per-minute quota together.
+
+Set GEMINI_RPM to the requests-per-minute quota of your API tier.
+"""
+
+import os
+import re
+import time
+import random
+import threading
+from typing import Dict, Optional
+
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:  # only the message heuristics are available without google-api-core
+    api_exceptions = None
+
+DEFAULT_RPM = 10  # Gemini free tier for flash models
+MAX_BACKOFF = 60  # seconds
+
+# Gemini 429 payloads carry the server's hint either as a protobuf
+# "retry_delay { seconds: N }" block or as "Please retry in N.Ns".
+_RETRY_DELAY_RE = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)")
+_RETRY_IN_RE = re.compile(r"retry in\s*([\d.]+)\s*s", re.IGNORECASE)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per `per` seconds."""
+
+    def __init__(self, rate: float, per: float = 60.0):
+        self.capacity = max(1.0, float(rate))
+        self.fill_rate = self.capacity / per
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.fill_rate
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str = "gemini") -> TokenBucket:
+    """Return the process-wide limiter for a quota key (e.g. an API key or model)."""
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rpm = float(os.getenv("GEMINI_RPM", DEFAULT_RPM))
+            limiter = _limiters[key] = TokenBucket(rpm)
+        return limiter
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Return True for quota/rate-limit failures.
+    
+    Google API errors are classified by type alone, so e.g. an auth error
+    whose message mentions a quota is not retried. Other clients (LiteLLM,
+    google-genai) fall back to matching the message.
+    """
+    if api_exceptions is not None and isinstance(error, api_exceptions.GoogleAPICallError):
+        return isinstance(error, api_exceptions.ResourceExhausted)
+    message = str(error).lower()
+    return any(marker in message for marker in ("429", "quota", "rate limit", "resource exhausted", "resource_exhausted"))
+
+
+def retry_delay_from_error(error: Exception) -> Optional[float]:
+    """Extract the server-suggested retry delay (seconds) from a 429 error, if present."""
+    # google.api_core errors expose the decoded RetryInfo detail directly
+    for detail in getattr(error, "details", None) or ():
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is not None and hasattr(retry_delay, "seconds"):
+            return retry_delay.seconds + getattr(retry_delay, "nanos", 0) / 1e9
+    
+    message = str(error)
+    match = _RETRY_DELAY_RE.search(message) or _RETRY_IN_RE.search(message)
+    return float(match.group(1)) if match else None
+
+
+def backoff_delay(attempt: int, cap: float = MAX_BACKOFF) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt."""
+    return random.uniform(0, min(cap, 2 ** attempt))
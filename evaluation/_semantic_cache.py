@@ -0,0 +1,95 @@
+"""
+Semantic Response Cache
+
+Opt-in cache that answers a prompt with the stored response of an earlier,
+near-identical prompt (cosine similarity of embeddings above a threshold).
+It sits behind the exact-match cache and only catches rewordings, so it is
+off by default. Prompts that differ only by a company name can score very
+high, so entries are partitioned by a scope (the model and the entity the
+prompt is about) and a lookup only compares against its own scope.
+
+Set SEMANTIC_CACHE_ENABLED=1 to turn it on and SEMANTIC_CACHE_THRESHOLD to
+tune how close a match must be (default 0.97).
+"""
+
+import os
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from evaluation._genai_client import genai
+from evaluation._llm_cache import cached_call, store
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+DEFAULT_THRESHOLD = 0.97
+
+
+def semantic_cache_enabled() -> bool:
+    """Return True when SEMANTIC_CACHE_ENABLED is set to a truthy value."""
+    return os.getenv("SEMANTIC_CACHE_ENABLED", "").strip().lower() in ("1", "true", "yes")
+
+
+def _embed(text: str) -> np.ndarray:
+    """L2-normalized embedding for `text`; embeddings themselves go through the response cache."""
+    cached = cached_call(EMBEDDING_MODEL, text)
+    if cached is not None:
+        vector = json.loads(cached)
+    else:
+        vector = genai.embed_content(model=EMBEDDING_MODEL, content=text)["embedding"]
+        store(EMBEDDING_MODEL, text, json.dumps(vector))
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+def semantic_scope(model_id: str, entity: str) -> str:
+    """Scope key for prompts about `entity` sent to `model_id`."""
+    return f"{model_id}\x00{entity.strip().lower()}"
+
+
+class SemanticCache:
+    """In-memory nearest-neighbour index of (prompt embedding, response) pairs, per scope."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._indexes: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, scope: str, prompt: str) -> Optional[str]:
+        """Return the response of the most similar prompt stored under `scope` if it clears the threshold."""
+        with self._lock:
+            if scope not in self._indexes:
+                return None
+        query = _embed(prompt)
+        with self._lock:
+            vectors, responses = self._indexes[scope]
+            scores = vectors @ query
+            best = int(np.argmax(scores))
+            return responses[best] if scores[best] >= self.threshold else None
+
+    def add(self, scope: str, prompt: str, response: str) -> None:
+        """Index a prompt's response under `scope` for later near-duplicate lookups."""
+        if not response:
+            return
+        vector = _embed(prompt)[np.newaxis, :]
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                self._indexes[scope] = (vector, [response])
+            else:
+                self._indexes[scope] = (np.vstack([index[0], vector]), index[1] + [response])
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Return the process-wide semantic cache."""
+    global _semantic_cache
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_THRESHOLD))
+            _semantic_cache = SemanticCache(threshold)
+        return _semantic_cache
@@ -0,0 +1,60 @@
+"""
+Streaming Calls
+
+Shared streaming loop for the Gemini wrappers: serves repeats from the LLM
+response cache, paces requests with a rate limiter and retries rate-limited
+requests until the first chunk has been handed to the caller.
+"""
+
+import time
+import logging
+from typing import Callable, Iterator, Optional, Union
+
+from evaluation._llm_cache import cached_call, store
+from evaluation._rate_limit import get_limiter, is_rate_limit_error, retry_delay_from_error, backoff_delay
+
+MAX_RETRIES = 5
+
+logger = logging.getLogger(__name__)
+
+
+def stream_with_retry(model, prompt: Union[str, Callable[[], str]], cache_prompt: Optional[str] = None,
+                      limiter=None) -> Iterator[str]:
+    """
+    Stream the model's answer chunk by chunk, with caching and rate-limit retries.
+    
+    `prompt` may be a function building the prompt, only called on a cache miss;
+    `cache_prompt` then keys the cache. `limiter` is the quota of the API key
+    behind `model` (default: the shared one).
+    Rate-limit retries only happen before the first chunk is yielded; once text
+    has been handed to the caller a failure is raised rather than replayed.
+    """
+    model_id = getattr(model, "model_name", "")
+    cache_prompt = cache_prompt or prompt
+    cached = cached_call(model_id, cache_prompt)
+    if cached is not None:
+        yield cached
+        return
+    
+    if callable(prompt):
+        prompt = prompt()
+    limiter = limiter or get_limiter()
+    for attempt in range(MAX_RETRIES):
+        limiter.acquire()
+        parts = []
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+            store(model_id, cache_prompt, "".join(parts))
+            return
+        except Exception as e:
+            if is_rate_limit_error(e) and not parts:
+                wait_time = retry_delay_from_error(e) or backoff_delay(attempt)
+                logger.warning("Rate limited, waiting %.1fs (attempt %d/%d)", wait_time, attempt + 1, MAX_RETRIES)
+                time.sleep(wait_time)
+            else:
+                raise
+    raise Exception("Max retries exceeded")
@@ -0,0 +1,98 @@
+"""
+Token-Budget Truncation
+
+Trims long inputs (documents, analysis context) to a token budget measured by
+the model's own tokenizer instead of a fixed character count, so dense text
+is not sent over budget and plain English prose is not cut short.
+"""
+
+import hashlib
+import threading
+from typing import Dict, Tuple
+
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:  # without google-api-core only network errors are recognised
+    api_exceptions = None
+
+# Used only when count_tokens is unavailable (e.g. offline); ~4 chars/token for English
+FALLBACK_CHARS_PER_TOKEN = 4
+# Upper bound on shrink steps when the proportional cut still overshoots
+MAX_REFINEMENTS = 5
+
+# Errors after which count_tokens falls back to the estimate (quota, server or network trouble)
+_COUNT_ERRORS = (OSError,) + ((api_exceptions.GoogleAPIError,) if api_exceptions else ())
+
+_counts: Dict[Tuple[str, str], int] = {}
+_counts_lock = threading.Lock()
+
+
+def count_tokens(model, text: str) -> int:
+    """
+    Count tokens for `text` with the model's tokenizer, caching by content hash.
+    
+    If the API call fails the character estimate is returned but not cached,
+    so a transient error does not pin a wrong count for the process lifetime.
+    """
+    key = (getattr(model, "model_name", ""), hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest())
+    with _counts_lock:
+        if key in _counts:
+            return _counts[key]
+    try:
+        total = model.count_tokens(text).total_tokens
+    except _COUNT_ERRORS:
+        return -(-len(text) // FALLBACK_CHARS_PER_TOKEN)
+    with _counts_lock:
+        _counts[key] = total
+    return total
+
+
+# Marker placed where head+tail truncation removed the middle of a text
+TRUNCATION_MARKER = "\n...[TRUNCATED]...\n"
+
+
+def _fitting_length(model, text: str, max_tokens: int, total: int, from_end: bool = False) -> int:
+    """Number of characters from the start (or end) of `text` that fit `max_tokens`."""
+    # Cut proportionally, then shrink until the tokenizer agrees it fits
+    cut = int(len(text) * max_tokens / total)
+    for _ in range(MAX_REFINEMENTS):
+        tokens = count_tokens(model, text[-cut:] if from_end else text[:cut])
+        if tokens <= max_tokens:
+            break
+        cut = int(cut * max_tokens / tokens * 0.98)
+    return max(cut, 0)
+
+
+def truncate_to_tokens(model, text: str, max_tokens: int) -> str:
+    """Return the longest prefix of `text` (found in a few count calls) that fits `max_tokens`."""
+    if not text or len(text) <= max_tokens:
+        # Every token covers at least one character, so this always fits
+        return text
+
+    total = count_tokens(model, text)
+    if total <= max_tokens:
+        return text
+
+    return text[:_fitting_length(model, text, max_tokens, total)]
+
+
+def truncate_head_tail(model, text: str, max_tokens: int, head_share: float = 0.7) -> str:
+    """
+    Fit `text` into `max_tokens` by keeping its beginning and its end.
+    
+    Financial filings put the summary up front and the statements and notes at
+    the back, so dropping the middle loses less than cutting off the tail.
+    """
+    if not text or len(text) <= max_tokens:
+        return text
+
+    total = count_tokens(model, text)
+    if total <= max_tokens:
+        return text
+
+    head_budget = int(max_tokens * head_share)
+    tail_budget = max_tokens - head_budget
+    head = text[:_fitting_length(model, text, head_budget, total)]
+    tail_len = _fitting_length(model, text, tail_budget, total, from_end=True)
+    tail = text[-tail_len:] if tail_len else ""
+    return head + TRUNCATION_MARKER + tail
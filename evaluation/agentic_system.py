@@ -6,17 +6,46 @@ a consistent interface for evaluation against the baseline Gemini.
 """
 
 import os
+import re
 import sys
+import json
 from typing import Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import project modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from crewai import Crew, Process
 from dotenv import load_dotenv
 
-load_dotenv()
+from evaluation._llm_cache import cached_call, store, WEB_MAX_AGE
+from evaluation._inputs import is_blank, document_too_short, DOCUMENT_TOO_SHORT
+
+
+# Competitor name extraction for the full pipeline
+_JSON_ARRAY_RE = re.compile(r'\[[^\]]*\]')
+_COMPETITOR_BULLET_RE = re.compile(r'\*\*\d+\.\s*([^*\n]+?)\*\*')
+
+
+def _crew_cache_key(agents, tasks) -> str:
+    """Describe a crew by what determines its output: agent roles and task specs."""
+    parts = [f"{agent.role}|{getattr(agent.llm, 'model', '')}" for agent in agents]
+    parts += [f"{task.description}\x00{task.expected_output}" for task in tasks]
+    return "\x1e".join(parts)
+
+
+def _cached_kickoff(crew, cache_key: str) -> str:
+    """Return the crew's raw output, reusing a recent stored result for an identical crew."""
+    # The agents search the web, so their answers go stale
+    cached = cached_call("crewai", cache_key, max_age=WEB_MAX_AGE)
+    if cached is not None:
+        return cached
+    
+    result = crew.kickoff()
+    raw = result.raw if result else None
+    if raw:
+        store("crewai", cache_key, raw)
+    return raw
 
 
 class AgenticSystem:
@@ -29,22 +58,32 @@ class AgenticSystem:
     
     def __init__(self):
         """Initialize the agentic system with all required agents."""
-        # Import here to avoid circular imports and ensure env is loaded
-        from financial_agents import FinancialAgents
+        # CrewAI (and LiteLLM behind it) is slow to import, so it and the
+        # project modules are only loaded once an agentic system is created
+        load_dotenv()
+        from financial_agents import FinancialAgents, get_llm
         from financial_tasks import FinancialTasks
         
         self.agents = FinancialAgents()
         self.tasks = FinancialTasks()
         self.current_date = datetime.now()
-    
-    def identify_competitors(self, company_name: str) -> str:
-        """
-        Identify top 3 competitors using the competitor identification agent.
+        self._get_llm = get_llm
         
-        Uses the specialized agent with web search tools and structured output format.
-        """
-        agent = self.agents.competitor_identification_agent()
-        task = self.tasks.identify_competitors_task(agent, company_name)
+        # Model per agent factory. Extraction/formatting-style steps run on the
+        # cheaper lite model; anything not listed keeps its default model.
+        self.AGENT_MODEL_TIER = {
+            "competitor_identification_agent": "gemini-2.5-flash-lite",
+            "financial_ratio_analyst_agent": "gemini-2.5-flash-lite",
+        }
+    
+    def _agent(self, role: str):
+        """Return the named agent on its configured model tier (memoized per thread by FinancialAgents)."""
+        model = self.AGENT_MODEL_TIER.get(role)
+        return getattr(self.agents, role)(llm=self._get_llm(model) if model else None)
+    
+    def _run_crew(self, agent, task) -> str:
+        """Run a single-agent crew and return its raw output (cached across runs)."""
+        from crewai import Crew, Process
         
         crew = Crew(
             agents=[agent],
@@ -52,9 +91,21 @@ class AgenticSystem:
             process=Process.sequential,
             verbose=False
         )
+        return _cached_kickoff(crew, _crew_cache_key([agent], [task]))
+    
+    def identify_competitors(self, company_name: str) -> str:
+        """
+        Identify top 3 competitors using the competitor identification agent.
         
-        result = crew.kickoff()
-        return result.raw
+        Uses the specialized agent with web search tools and structured output format.
+        """
+        if is_blank(company_name):
+            return ""
+        
+        agent = self._agent("competitor_identification_agent")
+        task = self.tasks.identify_competitors_task(agent, company_name)
+        
+        return self._run_crew(agent, task)
     
     def competitive_intelligence(self, user_company: str, competitor_company: str) -> str:
         """
@@ -63,33 +114,23 @@ class AgenticSystem:
         Uses web search tools, structured output format with specific sections,
         strict output rules, and includes regulatory analysis.
         """
+        if is_blank(user_company, competitor_company):
+            return ""
+        
         # Step 1: Competitive Intelligence
-        intel_agent = self.agents.competitive_intelligence_agent()
+        intel_agent = self._agent("competitive_intelligence_agent")
         intel_task = self.tasks.competitive_intelligence_task(intel_agent, user_company, competitor_company)
         
-        crew = Crew(
-            agents=[intel_agent],
-            tasks=[intel_task],
-            process=Process.sequential,
-            verbose=False
-        )
-        
-        competitive_analysis = crew.kickoff()
-        competitive_analysis = competitive_analysis.raw
+        competitive_analysis = self._run_crew(intel_agent, intel_task)
         
         # Step 2: Regulatory Analysis
         # Extract strategic recommendations for context
-        strategic_recs = ""
-        if "## Strategic Recommendations" in competitive_analysis:
-            recs_section = competitive_analysis.split("## Strategic Recommendations")[1]
-            if "\n##" in recs_section:
-                strategic_recs = recs_section.split("\n##")[0]
-            else:
-                strategic_recs = recs_section
+        from utils import extract_strategic_recommendations, strip_agent_scratch
+        strategic_recs = extract_strategic_recommendations(competitive_analysis or "")
         
         industry_context = f"{competitor_company} and {user_company} industry"
         
-        regulatory_agent = self.agents.regulatory_analyst_agent()
+        regulatory_agent = self._agent("regulatory_analyst_agent")
         regulatory_task = self.tasks.regulatory_concerns_task(
             regulatory_agent,
             user_company,
@@ -98,43 +139,10 @@ class AgenticSystem:
             industry_context
         )
         
-        regulatory_crew = Crew(
-            agents=[regulatory_agent],
-            tasks=[regulatory_task],
-            process=Process.sequential,
-            verbose=False
-        )
-        
-        regulatory_analysis = regulatory_crew.kickoff()
-        if regulatory_analysis and regulatory_analysis.raw:
-            regulatory_analysis = regulatory_analysis.raw
-            
+        regulatory_analysis = self._run_crew(regulatory_agent, regulatory_task)
+        if regulatory_analysis:
             # Clean up any agent thinking/reasoning text
-            if "##" in regulatory_analysis:
-                first_heading_idx = regulatory_analysis.find("##")
-                regulatory_analysis = regulatory_analysis[first_heading_idx:]
-            
-            # Remove agent thought lines
-            lines = regulatory_analysis.split('\n')
-            cleaned_lines = []
-            skip_mode = False
-            
-            for line in lines:
-                if line.strip().startswith("Thought:") or \
-                   line.strip().startswith("Action:") or \
-                   line.strip().startswith("Using Tool:") or \
-                   line.strip().startswith("Tool Input:") or \
-                   line.strip().startswith("Observation:"):
-                    skip_mode = True
-                    continue
-                
-                if line.strip().startswith("##"):
-                    skip_mode = False
-                
-                if not skip_mode:
-                    cleaned_lines.append(line)
-            
-            regulatory_analysis = '\n'.join(cleaned_lines)
+            regulatory_analysis = strip_agent_scratch(regulatory_analysis)
         else:
             regulatory_analysis = "## Regulatory & Compliance Concerns\n\nNo significant regulatory concerns identified at this time."
         
@@ -146,53 +154,40 @@ class AgenticSystem:
         """
         Analyze a financial document using the document analyzer agent.
         """
-        agent = self.agents.financial_document_analyzer_agent()
-        task = self.tasks.analyze_financial_document_task(agent, document_content, analysis_focus)
+        if is_blank(document_content):
+            return ""
+        if document_too_short(document_content):
+            return DOCUMENT_TOO_SHORT
         
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
+        agent = self._agent("financial_document_analyzer_agent")
+        task = self.tasks.analyze_financial_document_task(agent, document_content, analysis_focus)
         
-        result = crew.kickoff()
-        return result.raw
+        return self._run_crew(agent, task)
     
     def calculate_financial_ratios(self, financial_data: str) -> str:
         """
         Calculate financial ratios using the specialized ratio analyst agent.
         """
-        agent = self.agents.financial_ratio_analyst_agent()
-        task = self.tasks.calculate_financial_ratios_task(agent, financial_data)
+        if is_blank(financial_data):
+            return ""
         
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
+        agent = self._agent("financial_ratio_analyst_agent")
+        task = self.tasks.calculate_financial_ratios_task(agent, financial_data)
         
-        result = crew.kickoff()
-        return result.raw
+        return self._run_crew(agent, task)
     
     def answer_question(self, question: str, context: str = "") -> str:
         """
         Answer a financial/competitive question using the chat response agent.
         """
+        if is_blank(question):
+            return ""
+        
         # Use strategy synthesis for complex questions
-        agent = self.agents.strategy_synthesis_agent()
+        agent = self._agent("strategy_synthesis_agent")
         task = self.tasks.financial_chat_response_task(agent, question, context)
         
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
-        
-        result = crew.kickoff()
-        return result.raw
+        return self._run_crew(agent, task)
     
     def research_company(self, company_name: str, specific_question: str = None) -> str:
         """
@@ -200,11 +195,14 @@ class AgenticSystem:
         Uses online_research_agent for specific questions (recency tests) to leverage web search.
         Uses company_research_agent for general research.
         """
+        if is_blank(specific_question or company_name):
+            return ""
+        
         from crewai import Task
         
         if specific_question:
             # Use online research agent for specific/recency questions
-            agent = self.agents.online_research_agent()
+            agent = self._agent("online_research_agent")
             task = Task(
                 description=f"""Research and answer this specific question about {company_name}:
 
@@ -222,44 +220,34 @@ Be thorough and cite your sources with dates.""",
                 agent=agent
             )
         else:
-            agent = self.agents.company_research_agent()
+            agent = self._agent("company_research_agent")
             task = self.tasks.research_company_task(agent, company_name)
         
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
-        
-        result = crew.kickoff()
-        return result.raw
+        return self._run_crew(agent, task)
     
     def risk_assessment(self, company_analysis: str) -> str:
         """
         Conduct risk assessment using the risk assessment agent.
         """
-        agent = self.agents.risk_assessment_agent()
-        task = self.tasks.risk_assessment_task(agent, company_analysis)
+        if is_blank(company_analysis):
+            return ""
         
-        crew = Crew(
-            agents=[agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
+        agent = self._agent("risk_assessment_agent")
+        task = self.tasks.risk_assessment_task(agent, company_analysis)
         
-        result = crew.kickoff()
-        return result.raw
+        return self._run_crew(agent, task)
     
     def regulatory_analysis(self, company_name: str) -> str:
         """
         Analyze regulatory risks using the regulatory analyst agent.
         Uses web search tools for current regulatory information.
         """
+        if is_blank(company_name):
+            return ""
+        
         industry_context = f"{company_name} industry"
         
-        regulatory_agent = self.agents.regulatory_analyst_agent()
+        regulatory_agent = self._agent("regulatory_analyst_agent")
         regulatory_task = self.tasks.regulatory_concerns_task(
             regulatory_agent,
             company_name,
@@ -268,42 +256,11 @@ Be thorough and cite your sources with dates.""",
             industry_context
         )
         
-        crew = Crew(
-            agents=[regulatory_agent],
-            tasks=[regulatory_task],
-            process=Process.sequential,
-            verbose=False
-        )
-        
-        result = crew.kickoff()
-        regulatory_analysis = result.raw
+        regulatory_analysis = self._run_crew(regulatory_agent, regulatory_task)
         
         # Clean up any agent thinking/reasoning text
-        if "##" in regulatory_analysis:
-            first_heading_idx = regulatory_analysis.find("##")
-            regulatory_analysis = regulatory_analysis[first_heading_idx:]
-        
-        # Remove agent thought lines
-        lines = regulatory_analysis.split('\n')
-        cleaned_lines = []
-        skip_mode = False
-        
-        for line in lines:
-            if line.strip().startswith("Thought:") or \
-               line.strip().startswith("Action:") or \
-               line.strip().startswith("Using Tool:") or \
-               line.strip().startswith("Tool Input:") or \
-               line.strip().startswith("Observation:"):
-                skip_mode = True
-                continue
-            
-            if line.strip().startswith("##"):
-                skip_mode = False
-            
-            if not skip_mode:
-                cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
+        from utils import strip_agent_scratch
+        return strip_agent_scratch(regulatory_analysis)
     
     def full_competitor_analysis_pipeline(self, user_company: str) -> dict:
         """
@@ -325,32 +282,34 @@ Be thorough and cite your sources with dates.""",
         results["competitor_identification"] = self.identify_competitors(user_company)
         
         # Step 2: Parse competitor names (simplified extraction)
-        import re
-        import json
-        
         competitors = []
         # Try JSON array first
-        try:
-            start = results["competitor_identification"].find('[')
-            end = results["competitor_identification"].find(']', start)
-            if start != -1 and end != -1:
-                competitors = json.loads(results["competitor_identification"][start:end+1])
-        except:
-            pass
+        match = _JSON_ARRAY_RE.search(results["competitor_identification"])
+        if match:
+            try:
+                competitors = json.loads(match.group(0))
+            except json.JSONDecodeError:
+                pass
         
         # Fallback to pattern matching
         if not competitors:
-            pattern = r'\*\*\d+\.\s*([^*\n]+?)\*\*'
-            matches = re.findall(pattern, results["competitor_identification"])
+            matches = _COMPETITOR_BULLET_RE.findall(results["competitor_identification"])
             competitors = [m.strip() for m in matches[:3]]
         
-        # Step 3: Generate intelligence for each competitor
-        for competitor in competitors[:3]:  # Limit to top 3
-            try:
-                results["competitor_analyses"][competitor] = self.competitive_intelligence(
-                    user_company, competitor
-                )
-            except Exception as e:
-                results["competitor_analyses"][competitor] = f"Error: {str(e)}"
+        # Step 3: Generate intelligence for each competitor (top 3) concurrently
+        competitors = competitors[:3]
+        if competitors:
+            max_workers = min(len(competitors), int(os.getenv("AGENTIC_MAX_WORKERS", "3")))
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                futures = [
+                    pool.submit(self.competitive_intelligence, user_company, competitor)
+                    for competitor in competitors
+                ]
+                # Collect in competitor order so the output stays deterministic
+                for competitor, future in zip(competitors, futures):
+                    try:
+                        results["competitor_analyses"][competitor] = future.result()
+                    except Exception as e:
+                        results["competitor_analyses"][competitor] = f"Error: {str(e)}"
         
         return results
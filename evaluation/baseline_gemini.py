@@ -7,28 +7,62 @@ This represents a typical user query without any structured instructions.
 
 import os
 import time
-from typing import Optional
+import logging
+from typing import Callable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+from evaluation._genai_client import configure, get_model
+from evaluation._inputs import is_blank, document_too_short, DOCUMENT_TOO_SHORT
+from evaluation._llm_cache import cached_call, store
+from evaluation._streaming import stream_with_retry
+from evaluation._tokens import truncate_to_tokens
+from evaluation._rate_limit import get_limiter, is_rate_limit_error, retry_delay_from_error, backoff_delay
+
 load_dotenv()
 
-# Rate limiting settings
-RATE_LIMIT_DELAY = 30  # seconds between API calls (increased for free tier)
+# Rate limiting settings (request pacing is set by GEMINI_RPM, see _rate_limit)
 MAX_RETRIES = 5
 
+# Input budgets (tokens); roughly the previous 50k/30k character cut-offs
+DOCUMENT_TOKEN_BUDGET = 12_500
+CONTEXT_TOKEN_BUDGET = 7_500
+
+# Batch API polling
+BATCH_POLL_INTERVAL = 30  # seconds between job status checks
+BATCH_TIMEOUT = 24 * 3600  # Gemini completes batch jobs within 24 hours
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+logger = logging.getLogger(__name__)
+
 
-def _call_with_retry(model, prompt: str) -> str:
-    """Call model with retry logic for rate limits."""
+def _call_with_retry(model, prompt: Union[str, Callable[[], str]], cache_prompt: Optional[str] = None) -> str:
+    """
+    Call model with retry logic for rate limits, serving repeats from the response cache.
+    
+    `prompt` may be a function building the prompt, only called on a cache miss;
+    `cache_prompt` then keys the cache (see BasicGemini._prompt_and_key).
+    """
+    model_id = getattr(model, "model_name", "")
+    cache_prompt = cache_prompt or prompt
+    cached = cached_call(model_id, cache_prompt)
+    if cached is not None:
+        return cached
+    
+    if callable(prompt):
+        prompt = prompt()
+    limiter = get_limiter()
     for attempt in range(MAX_RETRIES):
+        limiter.acquire()
         try:
             response = model.generate_content(prompt)
+            store(model_id, cache_prompt, response.text)
             return response.text
         except Exception as e:
-            if "429" in str(e) or "quota" in str(e).lower():
-                wait_time = RATE_LIMIT_DELAY * (attempt + 1)
-                print(f"      Rate limited, waiting {wait_time}s (attempt {attempt + 1}/{MAX_RETRIES})...")
+            if is_rate_limit_error(e):
+                # Prefer the server's retry hint over a blind backoff
+                wait_time = retry_delay_from_error(e) or backoff_delay(attempt)
+                logger.warning("Rate limited, waiting %.1fs (attempt %d/%d)", wait_time, attempt + 1, MAX_RETRIES)
                 time.sleep(wait_time)
             else:
                 raise
@@ -55,87 +89,189 @@ class BasicGemini:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found. Set it in .env or pass as argument.")
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(model)
+        configure(self.api_key)
+        self.model_name = model
+        self.model = get_model(model)
         self.current_date = datetime.now()
         self.six_weeks_ago = self.current_date - timedelta(weeks=6)
     
+    # Prompt helpers that truncate an input to a token budget; they take truncate=False
+    _TRUNCATING_PROMPTS = frozenset({"analyze_financial_document", "answer_question", "risk_assessment"})
+    
+    def _prompt_and_key(self, method: str, *args, **kwargs) -> Tuple[Callable[[], str], str]:
+        """
+        Return a function building the prompt of `method` and the text keying its cached answer.
+        
+        Truncation counts tokens with API requests, so truncating prompts are keyed
+        by their untruncated form: a cached answer is found without any requests.
+        """
+        build = getattr(self, f"_{method}_prompt")
+        if method in self._TRUNCATING_PROMPTS:
+            return lambda: build(*args, **kwargs), build(*args, truncate=False, **kwargs)
+        prompt = build(*args, **kwargs)
+        return lambda: prompt, prompt
+    
+    def _call(self, method: str, *args) -> str:
+        """Answer the prompt of `method`, checking the cache before the prompt is truncated."""
+        build, cache_prompt = self._prompt_and_key(method, *args)
+        return _call_with_retry(self.model, build, cache_prompt)
+    
+    def _identify_competitors_prompt(self, company_name: str) -> str:
+        return f"""Who are the top 3 competitors of {company_name}? Explain why they compete."""
+    
     def identify_competitors(self, company_name: str) -> str:
         """
         Identify top 3 competitors using the simplest possible prompt.
         """
-        prompt = f"""Who are the top 3 competitors of {company_name}? Explain why they compete."""
-        
-        return _call_with_retry(self.model, prompt)
+        if is_blank(company_name):
+            return ""
+        return _call_with_retry(self.model, self._identify_competitors_prompt(company_name))
+    
+    def _competitive_intelligence_prompt(self, user_company: str, competitor_company: str) -> str:
+        return f"""Do market research on {competitor_company} as a competitor to {user_company}. 
+Include recent news (today is {self.current_date.strftime('%B %d, %Y')}), financial information, strategic recommendations for {user_company}, and regulatory concerns they might face."""
     
     def competitive_intelligence(self, user_company: str, competitor_company: str) -> str:
         """
         Generate competitive intelligence using the simplest possible prompt.
         """
-        prompt = f"""Do market research on {competitor_company} as a competitor to {user_company}. 
-Include recent news (today is {self.current_date.strftime('%B %d, %Y')}), financial information, strategic recommendations for {user_company}, and regulatory concerns they might face."""
-        
-        return _call_with_retry(self.model, prompt)
+        if is_blank(user_company, competitor_company):
+            return ""
+        return _call_with_retry(self.model, self._competitive_intelligence_prompt(user_company, competitor_company))
+    
+    def _analyze_financial_document_prompt(self, document_content: str, analysis_focus: str = "comprehensive",
+                                           truncate: bool = True) -> str:
+        if truncate:
+            document_content = truncate_to_tokens(self.model, document_content, DOCUMENT_TOKEN_BUDGET)
+        return f"""Analyze this financial document and tell me what's important.
+
+DOCUMENT:
+{document_content}"""
     
     def analyze_financial_document(self, document_content: str, analysis_focus: str = "comprehensive") -> str:
         """
         Analyze a financial document using the simplest possible prompt.
         """
-        prompt = f"""Analyze this financial document and tell me what's important.
+        if is_blank(document_content):
+            return ""
+        if document_too_short(document_content):
+            return DOCUMENT_TOO_SHORT
+        return self._call("analyze_financial_document", document_content, analysis_focus)
+    
+    def _calculate_financial_ratios_prompt(self, financial_data: str) -> str:
+        return f"""Calculate the key financial ratios from this data and explain them.
 
-DOCUMENT:
-{document_content[:50000]}"""  # Truncate very long documents
-        
-        return _call_with_retry(self.model, prompt)
+FINANCIAL DATA:
+{financial_data}"""
     
     def calculate_financial_ratios(self, financial_data: str) -> str:
         """
         Calculate financial ratios using the simplest possible prompt.
         """
-        prompt = f"""Calculate the key financial ratios from this data and explain them.
+        if is_blank(financial_data):
+            return ""
+        return _call_with_retry(self.model, self._calculate_financial_ratios_prompt(financial_data))
+    
+    def _answer_question_prompt(self, question: str, context: str = "", truncate: bool = True) -> str:
+        if context and truncate:
+            context = truncate_to_tokens(self.model, context, CONTEXT_TOKEN_BUDGET)
+        return f"""{question}
 
-FINANCIAL DATA:
-{financial_data}"""
-        
-        return _call_with_retry(self.model, prompt)
+{context}"""
     
     def answer_question(self, question: str, context: str = "") -> str:
         """
         Answer a question using the simplest possible prompt.
         """
-        prompt = f"""{question}
-
-{context[:30000] if context else ""}"""
-        
-        return _call_with_retry(self.model, prompt)
+        if is_blank(question):
+            return ""
+        return self._call("answer_question", question, context)
+    
+    def _research_company_prompt(self, company_name: str, specific_question: str = None) -> str:
+        if specific_question:
+            return specific_question
+        return f"""Tell me about {company_name} - their business, finances, competition, and risks."""
     
     def research_company(self, company_name: str, specific_question: str = None) -> str:
         """
         Research a company using the simplest possible prompt.
         If specific_question is provided, answer that instead.
         """
-        if specific_question:
-            prompt = specific_question
-        else:
-            prompt = f"""Tell me about {company_name} - their business, finances, competition, and risks."""
-        
-        return _call_with_retry(self.model, prompt)
+        if is_blank(specific_question or company_name):
+            return ""
+        return _call_with_retry(self.model, self._research_company_prompt(company_name, specific_question))
+    
+    def _risk_assessment_prompt(self, company_analysis: str, truncate: bool = True) -> str:
+        if truncate:
+            company_analysis = truncate_to_tokens(self.model, company_analysis, CONTEXT_TOKEN_BUDGET)
+        return f"""What are the risks for this company?
+
+COMPANY ANALYSIS:
+{company_analysis}"""
     
     def risk_assessment(self, company_analysis: str) -> str:
         """
         Conduct risk assessment using the simplest possible prompt.
         """
-        prompt = f"""What are the risks for this company?
-
-COMPANY ANALYSIS:
-{company_analysis[:30000]}"""
-        
-        return _call_with_retry(self.model, prompt)
+        if is_blank(company_analysis):
+            return ""
+        return self._call("risk_assessment", company_analysis)
+    
+    def _regulatory_analysis_prompt(self, company_name: str) -> str:
+        return f"""What are the regulatory and compliance risks for {company_name}? Today is {self.current_date.strftime('%B %d, %Y')}."""
     
     def regulatory_analysis(self, company_name: str) -> str:
         """
         Analyze regulatory risks using the simplest possible prompt.
         """
-        prompt = f"""What are the regulatory and compliance risks for {company_name}? Today is {self.current_date.strftime('%B %d, %Y')}."""
+        if is_blank(company_name):
+            return ""
+        return _call_with_retry(self.model, self._regulatory_analysis_prompt(company_name))
+    
+    def stream(self, method: str, *args, **kwargs) -> Iterator[str]:
+        """
+        Stream the response of any prompt method as it is generated.
+        
+        Example: ``for text in basic.stream("regulatory_analysis", "Tesla"): ...``
+        The regular methods stay non-streaming for evaluation runs.
+        """
+        build, cache_prompt = self._prompt_and_key(method, *args, **kwargs)
+        return stream_with_retry(self.model, build, cache_prompt)
+    
+    def run_batch(self, prompts: List[str], cache_prompts: Optional[List[str]] = None) -> List[Optional[str]]:
+        """
+        Run many prompts through the Gemini Batch API (half the per-request cost).
+        
+        Successful responses are written to the LLM response cache (under
+        `cache_prompts` when given, see _prompt_and_key), so the regular methods
+        return them without another request. Returns one entry per prompt; None
+        marks a prompt the batch could not answer.
+        """
+        # The Batch API lives in the google-genai SDK, not google.generativeai
+        from google import genai as google_genai
+        
+        client = google_genai.Client(api_key=self.api_key)
+        job = client.batches.create(
+            model=self.model_name,
+            src=[{"contents": [{"parts": [{"text": prompt}], "role": "user"}]} for prompt in prompts],
+            config={"display_name": f"basic-gemini-eval-{datetime.now():%Y%m%d-%H%M%S}"}
+        )
+        
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while job.state.name not in BATCH_DONE_STATES:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Batch job {job.name} did not finish in {BATCH_TIMEOUT}s")
+            time.sleep(BATCH_POLL_INTERVAL)
+            job = client.batches.get(name=job.name)
+        
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise Exception(f"Batch job {job.name} ended in state {job.state.name}")
         
-        return _call_with_retry(self.model, prompt)
+        model_id = self.model.model_name
+        results = []
+        for prompt, item in zip(cache_prompts or prompts, job.dest.inlined_responses):
+            text = item.response.text if getattr(item, "response", None) else None
+            if text:
+                store(model_id, prompt, text)
+            results.append(text)
+        return results
@@ -6,36 +6,197 @@ that provide guidance but without extensive formatting requirements.
 Represents an improved single-LLM approach between Basic and Agentic.
 """
 
+import io
 import os
+import re
+import json
 import time
-from typing import Optional
+import asyncio
+import logging
+import hashlib
+import itertools
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+from evaluation._genai_client import genai, configure, get_model, get_keyed_model
+from evaluation._aimd import AIMDController, is_server_error
+from evaluation._gemini_queue import get_queue
+from evaluation._llm_cache import cached_call, store
+from evaluation._streaming import stream_with_retry
+from evaluation._semantic_cache import semantic_cache_enabled, get_semantic_cache, semantic_scope
+from evaluation._tokens import truncate_head_tail
+from evaluation.schemas import Competitors, RiskAssessment, FinancialRatios
+from evaluation._rate_limit import get_limiter, is_rate_limit_error, retry_delay_from_error, backoff_delay
+
 load_dotenv()
 
-# Rate limiting settings
-RATE_LIMIT_DELAY = 30  # seconds between API calls (increased for free tier)
+# Rate limiting settings (request pacing is set by GEMINI_RPM, see _rate_limit)
 MAX_RETRIES = 5
 
+logger = logging.getLogger(__name__)
+
+# Prompt templates for the date-sensitive methods. "{date}" is filled in once
+# per DetailedGemini (see _refresh_date); the rest is formatted per call.
+DATE_REFRESH_INTERVAL = timedelta(hours=1)
+
+COMPETITIVE_INTELLIGENCE_TEMPLATE = """Analyze {competitor_company} as a competitor to {user_company}.
+
+Cover these areas:
+1. Recent developments (past 6 weeks if available)
+2. Main products and markets
+3. Key financial metrics
+4. Threats they pose to {user_company}
+5. Recommendations for {user_company}
+6. Any regulatory concerns
+
+Today's date: {date}"""
+
+REGULATORY_AREA_LIST = """1. Key industry regulations affecting them
+2. Current compliance risks (rate severity)
+3. Recent regulatory actions or investigations
+4. Cross-border/international considerations
+5. Upcoming regulatory changes to watch"""
+
+REGULATORY_AREAS = """Cover these areas:
+""" + REGULATORY_AREA_LIST + """
+
+Today's date: {date}"""
+
+REGULATORY_HEADER_TEMPLATE = """Analyze the regulatory and compliance landscape for {company_name}.
+
+"""
+
+REGULATORY_ANALYSIS_TEMPLATE = REGULATORY_HEADER_TEMPLATE + REGULATORY_AREAS
+
+BATCH_REGULATORY_INSTRUCTIONS = """Analyze the regulatory and compliance landscape for each company.
+
+""" + REGULATORY_AREAS
+
+# One call covering competitive_intelligence, regulatory_analysis and
+# risk_assessment for a company, returned as a JSON object
+DOSSIER_TEMPLATE = """Prepare a dossier on {company_name} as a competitor to {user_company}.
+
+Return a JSON object with exactly these string fields (markdown allowed inside them):
+
+"competitive": cover
+1. Recent developments (past 6 weeks if available)
+2. Main products and markets
+3. Key financial metrics
+4. Threats they pose to {user_company}
+5. Recommendations for {user_company}
+6. Any regulatory concerns
+
+"regulatory": cover
+""" + REGULATORY_AREA_LIST + """
+
+"risks": the key risks for {company_name}, categorized by financial, operational,
+market, and strategic risks, each rated Low, Medium, or High.
+
+Today's date: {date}"""
+DOSSIER_SECTIONS = ("competitive", "regulatory", "risks")
+
+# Input budgets (tokens), the same as BasicGemini's so the comparison stays fair
+DOCUMENT_TOKEN_BUDGET = 12_500
+CONTEXT_TOKEN_BUDGET = 7_500
+
+# Server-side context caching for long documents. Gemini only caches contexts
+# above a minimum size (a few thousand tokens), so short documents are sent inline.
+CONTEXT_CACHE_MIN_CHARS = 16_000
+CONTEXT_CACHE_TTL = timedelta(hours=1)
+# Mid-sized documents are uploaded once through the File API and referenced by
+# handle; uploaded files are kept by Gemini for 48 hours
+FILE_UPLOAD_MIN_CHARS = 8_000
+FILE_UPLOAD_TTL = timedelta(hours=47)
+
+# Companies packed into one prompt by the batch_* methods; larger batches make
+# fewer requests against the RPM quota but produce longer, slower responses
+ROW_BATCH_SIZE = 8
+# Each company's answer starts with a "### <n>. <Company>" heading
+_ROW_HEADING_RE = re.compile(r'^###\s*(\d+)\.[^\n]*$', re.MULTILINE)
+
 
-def _call_with_retry(model, prompt: str) -> str:
-    """Call model with retry logic for rate limits."""
+def _call_with_retry(model, prompt: Union[str, "genai.protos.Content"], semantic_entity: Optional[str] = None,
+                     cache_prompt: Optional[str] = None, limiter=None, generation_config=None) -> str:
+    """
+    Call model with retry logic for rate limits, serving repeats from the response cache.
+    
+    With `semantic_entity` (and SEMANTIC_CACHE_ENABLED set) a near-duplicate of an
+    earlier prompt about the same entity (e.g. the company name) is also answered
+    from cache. Only pass it for prompts built from short, stable inputs, never
+    for pasted documents or context.
+    `cache_prompt` keys the caches when `prompt` is not the full input as text
+    (e.g. the rest lives in a server-side cached context, or `prompt` is a
+    prebuilt Content).
+    `limiter` is the quota of the API key behind `model` (default: the shared one).
+    """
+    model_id = getattr(model, "model_name", "")
+    cache_prompt = cache_prompt or prompt
+    cached = cached_call(model_id, cache_prompt)
+    if cached is not None:
+        return cached
+    
+    scope = semantic_scope(model_id, semantic_entity) if semantic_entity and semantic_cache_enabled() else None
+    if scope:
+        cached = get_semantic_cache().lookup(scope, cache_prompt)
+        if cached is not None:
+            return cached
+    
+    text = get_queue().run(_agenerate(model, prompt, limiter or get_limiter(), generation_config=generation_config))
+    store(model_id, cache_prompt, text)
+    if scope:
+        get_semantic_cache().add(scope, cache_prompt, text)
+    return text
+
+
+async def _agenerate(model, prompt, limiter, controller: Optional[AIMDController] = None,
+                     generation_config=None) -> str:
+    """
+    Generate a response with retries, on the event loop.
+    
+    Quota waits and backoff after a 429/5xx are awaited rather than slept, so
+    no thread sits idle while the API recovers. With a `controller`, each
+    attempt also goes through AIMD admission control.
+    """
     for attempt in range(MAX_RETRIES):
+        if controller:
+            await controller.acquire()
+        succeeded = overloaded = False
+        started = time.monotonic()
         try:
-            response = model.generate_content(prompt)
+            # Wait for a slot in the per-minute quota instead of running into 429s
+            await asyncio.sleep(limiter.reserve())
+            started = time.monotonic()
+            response = await model.generate_content_async(prompt, generation_config=generation_config)
+            succeeded = True
             return response.text
         except Exception as e:
-            if "429" in str(e) or "quota" in str(e).lower():
-                wait_time = RATE_LIMIT_DELAY * (attempt + 1)
-                print(f"      Rate limited, waiting {wait_time}s (attempt {attempt + 1}/{MAX_RETRIES})...")
-                time.sleep(wait_time)
-            else:
+            overloaded = is_rate_limit_error(e) or is_server_error(e)
+            if not overloaded:
                 raise
+            # Wait exactly as long as the server asks, else back off with jitter
+            wait_time = retry_delay_from_error(e) or backoff_delay(attempt)
+        finally:
+            if controller:
+                await controller.release(time.monotonic() - started if succeeded else None, overloaded)
+        logger.warning("Overloaded, waiting %.1fs (attempt %d/%d)", wait_time, attempt + 1, MAX_RETRIES)
+        await asyncio.sleep(wait_time)
     raise Exception("Max retries exceeded")
 
 
+async def _acall_with_retry(model, prompt: str, controller: AIMDController, limiter=None) -> str:
+    """Async variant of _call_with_retry that also feeds the AIMD concurrency controller."""
+    model_id = getattr(model, "model_name", "")
+    cached = cached_call(model_id, prompt)
+    if cached is not None:
+        return cached
+    
+    text = await _agenerate(model, prompt, limiter or get_limiter(), controller)
+    store(model_id, prompt, text)
+    return text
+
+
 class DetailedGemini:
     """
     Gemini wrapper with moderately structured prompts.
@@ -45,60 +206,179 @@ class DetailedGemini:
     tools, or web search capabilities.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash",
+                 api_keys: Optional[List[str]] = None, light_model: Optional[str] = "gemini-2.5-flash-lite"):
         """
         Initialize the detailed Gemini model.
         
         Args:
             api_key: Google API key. If None, reads from GEMINI_API_KEY env var.
             model: Model to use. Default matches the agentic system's model.
+            api_keys: Extra API keys to spread calls across (round-robin), each with
+                its own rate limit. If None, reads the comma-separated GEMINI_API_KEYS.
+            light_model: Cheaper model for questions asked without context.
+                None sends those to `model` as well.
         """
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if api_keys is None:
+            api_keys = [key.strip() for key in os.getenv("GEMINI_API_KEYS", "").split(",") if key.strip()]
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY") or (api_keys[0] if api_keys else None)
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found. Set it in .env or pass as argument.")
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(model)
-        self.current_date = datetime.now()
-        self.six_weeks_ago = self.current_date - timedelta(weeks=6)
+        # Shared SDK configuration and model: every DetailedGemini (and BasicGemini)
+        # in the process reuses one client and its persistent HTTP/2 channel
+        configure(self.api_key)
+        self.model_name = model
+        self.model = get_model(model)
+        self.light_model = get_model(light_model) if light_model else self.model
+        # One (model, limiter) route per distinct key; the configured key shares
+        # the default limiter with BasicGemini since they draw on the same quota
+        self._routes = [(self.model, get_limiter())] + [
+            (get_keyed_model(model, key), get_limiter(f"gemini:{hashlib.sha256(key.encode()).hexdigest()[:12]}"))
+            for key in dict.fromkeys(api_keys) if key != self.api_key
+        ]
+        self._route_cycle = itertools.cycle(self._routes)
+        self.current_date = None
+        self._refresh_date()
+        self._aimd = AIMDController()
+        # (company, user_company) -> sections from full_dossier, reused by the single-section methods
+        self._dossiers: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # sha256(document) -> (model bound to its cached context or None, expiry)
+        self._document_models: Dict[str, Tuple[Optional[genai.GenerativeModel], datetime]] = {}
+        self._document_models_lock = threading.Lock()
+        # sha256(document) -> (uploaded File handle, expiry)
+        self._document_files: Dict[str, Tuple[object, datetime]] = {}
     
-    def identify_competitors(self, company_name: str) -> str:
+    def _document_model(self, document: str) -> Optional[genai.GenerativeModel]:
         """
-        Identify top 3 competitors with some structure.
+        Return a model bound to a server-side cached copy of `document`, or None.
+        
+        Repeated analyses of the same long document (e.g. several focus areas)
+        then pay for its input tokens once per TTL instead of on every call.
+        Documents too short to cache, or a failed cache creation, fall back to
+        sending the document inline.
         """
-        prompt = f"""Identify the top 3 direct competitors of {company_name}.
+        if len(document) < CONTEXT_CACHE_MIN_CHARS:
+            return None
+        
+        key = hashlib.sha256(document.encode("utf-8")).hexdigest()
+        now = datetime.now()
+        with self._document_models_lock:
+            entry = self._document_models.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+            
+            try:
+                cached_content = genai.caching.CachedContent.create(
+                    model=f"models/{self.model_name}",
+                    display_name=f"detailed-doc-{key[:16]}",
+                    contents=[document],
+                    ttl=CONTEXT_CACHE_TTL
+                )
+                model = genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+            except Exception as e:
+                logger.warning("Context caching unavailable, sending document inline: %s", e)
+                model = None
+            # Expire locally a little before the server does
+            self._document_models[key] = (model, now + CONTEXT_CACHE_TTL - timedelta(minutes=5))
+            return model
+    
+    def _document_file(self, document: str):
+        """
+        Return a File API handle for `document`, uploading it only the first time.
+        
+        Returns None for short documents or when the upload fails, in which case
+        the document is sent inline.
+        """
+        if len(document) < FILE_UPLOAD_MIN_CHARS:
+            return None
+        
+        key = hashlib.sha256(document.encode("utf-8")).hexdigest()
+        now = datetime.now()
+        with self._document_models_lock:
+            entry = self._document_files.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+            
+            try:
+                uploaded = genai.upload_file(
+                    io.BytesIO(document.encode("utf-8")),
+                    mime_type="text/plain",
+                    display_name=f"detailed-doc-{key[:16]}"
+                )
+            except Exception as e:
+                logger.warning("File upload failed, sending document inline: %s", e)
+                uploaded = None
+            self._document_files[key] = (uploaded, now + FILE_UPLOAD_TTL)
+            return uploaded
+    
+    def _refresh_date(self) -> None:
+        """Bake today's date into the prompt templates, redoing it once the date is an hour old."""
+        now = datetime.now()
+        if self.current_date is not None and now - self.current_date <= DATE_REFRESH_INTERVAL:
+            return
+        self.current_date = now
+        self.six_weeks_ago = now - timedelta(weeks=6)
+        date_str = now.strftime('%B %d, %Y')
+        self._competitive_intelligence_template = COMPETITIVE_INTELLIGENCE_TEMPLATE.replace("{date}", date_str)
+        self._regulatory_analysis_template = REGULATORY_ANALYSIS_TEMPLATE.replace("{date}", date_str)
+        self._batch_regulatory_instructions = BATCH_REGULATORY_INSTRUCTIONS.replace("{date}", date_str)
+        self._dossier_template = DOSSIER_TEMPLATE.replace("{date}", date_str)
+        # The static part of the regulatory prompt, built as a proto once and
+        # reused by every request; only the company header varies per call
+        self._regulatory_areas_part = genai.protos.Part(text=REGULATORY_AREAS.replace("{date}", date_str))
+    
+    def _call(self, prompt: str, **kwargs) -> str:
+        """Send `prompt` through the next API key in the round-robin."""
+        model, limiter = next(self._route_cycle)
+        return _call_with_retry(model, prompt, limiter=limiter, **kwargs)
+    
+    def _fit(self, text: str, budget: int) -> str:
+        """Trim `text` to `budget` tokens, keeping its head and tail."""
+        return truncate_head_tail(self.model, text, budget)
+    
+    def _identify_competitors_prompt(self, company_name: str) -> str:
+        return f"""Identify the top 3 direct competitors of {company_name}.
 
 For each competitor, briefly explain:
 - What market/industry they overlap in
 - Why they are a threat
 
 Be concise but specific."""
-        
-        return _call_with_retry(self.model, prompt)
+    
+    def identify_competitors(self, company_name: str) -> str:
+        """
+        Identify top 3 competitors with some structure.
+        """
+        return self._call(self._identify_competitors_prompt(company_name), semantic_entity=company_name)
+    
+    def _competitive_intelligence_prompt(self, user_company: str, competitor_company: str) -> str:
+        self._refresh_date()
+        return self._competitive_intelligence_template.format(
+            user_company=user_company, competitor_company=competitor_company
+        )
     
     def competitive_intelligence(self, user_company: str, competitor_company: str) -> str:
         """
         Generate competitive intelligence report with moderate structure.
         """
-        prompt = f"""Analyze {competitor_company} as a competitor to {user_company}.
+        dossier = self._dossiers.get((competitor_company, user_company))
+        if dossier:
+            return dossier["competitive"]
+        return self._call(self._competitive_intelligence_prompt(user_company, competitor_company))
+    
+    def _analyze_cached_document_prompt(self, analysis_focus: str = "comprehensive") -> str:
+        return f"""Analyze the financial document provided above.
 
-Cover these areas:
-1. Recent developments (past 6 weeks if available)
-2. Main products and markets
-3. Key financial metrics
-4. Threats they pose to {user_company}
-5. Recommendations for {user_company}
-6. Any regulatory concerns
+Focus: {analysis_focus}
 
-Today's date: {self.current_date.strftime('%B %d, %Y')}"""
-        
-        return _call_with_retry(self.model, prompt)
+Provide:
+- Key takeaways
+- Important financial metrics
+- Notable strengths and concerns"""
     
-    def analyze_financial_document(self, document_content: str, analysis_focus: str = "comprehensive") -> str:
-        """
-        Analyze a financial document with some structure.
-        """
-        prompt = f"""Analyze this financial document.
+    def _analyze_financial_document_prompt(self, document_content: str, analysis_focus: str = "comprehensive") -> str:
+        return f"""Analyze this financial document.
 
 Focus: {analysis_focus}
 
@@ -108,48 +388,69 @@ Provide:
 - Notable strengths and concerns
 
 DOCUMENT:
-{document_content[:50000]}"""
-        
-        return _call_with_retry(self.model, prompt)
+{self._fit(document_content, DOCUMENT_TOKEN_BUDGET)}"""
     
-    def calculate_financial_ratios(self, financial_data: str) -> str:
+    def analyze_financial_document(self, document_content: str, analysis_focus: str = "comprehensive") -> str:
         """
-        Calculate financial ratios with some guidance.
+        Analyze a financial document with some structure.
         """
-        prompt = f"""Calculate key financial ratios from this data.
+        prompt = self._analyze_financial_document_prompt(document_content, analysis_focus)
+        cached = cached_call(self.model.model_name, prompt)
+        if cached is not None:
+            return cached
+        
+        # Prefer a server-side context cache, then an uploaded file, then inline text
+        document = self._fit(document_content, DOCUMENT_TOKEN_BUDGET)
+        document_model = self._document_model(document)
+        if document_model is not None:
+            return _call_with_retry(
+                document_model, self._analyze_cached_document_prompt(analysis_focus), cache_prompt=prompt
+            )
+        document_file = self._document_file(document)
+        if document_file is not None:
+            return _call_with_retry(
+                self.model, [document_file, self._analyze_cached_document_prompt(analysis_focus)], cache_prompt=prompt
+            )
+        return self._call(prompt)
+    
+    def _calculate_financial_ratios_prompt(self, financial_data: str) -> str:
+        return f"""Calculate key financial ratios from this data.
 
 Include liquidity, profitability, and leverage ratios.
 Explain what each ratio means.
 
 FINANCIAL DATA:
 {financial_data}"""
-        
-        return _call_with_retry(self.model, prompt)
     
-    def answer_question(self, question: str, context: str = "") -> str:
+    def calculate_financial_ratios(self, financial_data: str) -> str:
         """
-        Answer a question with context awareness.
+        Calculate financial ratios with some guidance.
         """
-        context_section = f"\nContext:\n{context[:30000]}" if context else ""
+        return self._call(self._calculate_financial_ratios_prompt(financial_data))
+    
+    def _answer_question_prompt(self, question: str, context: str = "") -> str:
+        context_section = f"\nContext:\n{self._fit(context, CONTEXT_TOKEN_BUDGET)}" if context else ""
         
-        prompt = f"""Answer this question clearly and directly.
+        return f"""Answer this question clearly and directly.
 
 Question: {question}{context_section}"""
-        
-        return _call_with_retry(self.model, prompt)
     
-    def research_company(self, company_name: str, specific_question: str = None) -> str:
+    def answer_question(self, question: str, context: str = "") -> str:
         """
-        Research a company with moderate structure.
-        If specific_question is provided, answer that instead.
+        Answer a question with context awareness.
         """
+        if not context:
+            # Nothing to read through: a plain Q&A prompt goes to the lighter model
+            return _call_with_retry(self.light_model, self._answer_question_prompt(question))
+        return self._call(self._answer_question_prompt(question, context))
+    
+    def _research_company_prompt(self, company_name: str, specific_question: str = None) -> str:
         if specific_question:
-            prompt = f"""Research and answer this question:
+            return f"""Research and answer this question:
 {specific_question}
 
 Provide specific details including dates, numbers, and sources where possible."""
-        else:
-            prompt = f"""Provide an analysis of {company_name}.
+        return f"""Provide an analysis of {company_name}.
 
 Cover:
 - Business overview
@@ -157,36 +458,184 @@ Cover:
 - Competitive position
 - Key risks
 - Growth outlook"""
-        
-        return _call_with_retry(self.model, prompt)
     
-    def risk_assessment(self, company_analysis: str) -> str:
+    def research_company(self, company_name: str, specific_question: str = None) -> str:
         """
-        Conduct risk assessment with some structure.
+        Research a company with moderate structure.
+        If specific_question is provided, answer that instead.
         """
-        prompt = f"""Based on this analysis, identify the key risks.
+        return self._call(
+            self._research_company_prompt(company_name, specific_question), semantic_entity=company_name
+        )
+    
+    def _risk_assessment_prompt(self, company_analysis: str) -> str:
+        return f"""Based on this analysis, identify the key risks.
 
 Categorize by: financial, operational, market, and strategic risks.
 Rate each as Low, Medium, or High.
 
 COMPANY ANALYSIS:
-{company_analysis[:30000]}"""
-        
-        return _call_with_retry(self.model, prompt)
+{self._fit(company_analysis, CONTEXT_TOKEN_BUDGET)}"""
+    
+    def risk_assessment(self, company_analysis: str) -> str:
+        """
+        Conduct risk assessment with some structure.
+        """
+        return self._call(self._risk_assessment_prompt(company_analysis))
+    
+    def _regulatory_analysis_prompt(self, company_name: str) -> str:
+        self._refresh_date()
+        return self._regulatory_analysis_template.format(company_name=company_name)
+    
+    def _regulatory_analysis_contents(self, company_name: str) -> "genai.protos.Content":
+        self._refresh_date()
+        header = genai.protos.Part(text=REGULATORY_HEADER_TEMPLATE.format(company_name=company_name))
+        return genai.protos.Content(role="user", parts=[header, self._regulatory_areas_part])
     
     def regulatory_analysis(self, company_name: str) -> str:
         """
         Analyze regulatory risks with moderate structure.
         """
-        prompt = f"""Analyze the regulatory and compliance landscape for {company_name}.
+        for (company, _), dossier in self._dossiers.items():
+            if company == company_name:
+                return dossier["regulatory"]
+        return self._call(
+            self._regulatory_analysis_contents(company_name),
+            cache_prompt=self._regulatory_analysis_prompt(company_name),
+            semantic_entity=company_name
+        )
+    
+    def full_dossier(self, company_name: str, user_company: str) -> Dict[str, str]:
+        """
+        Competitive, regulatory and risk analysis of a company in one request.
+        
+        Returns {"competitive": ..., "regulatory": ..., "risks": ...}. Afterwards
+        competitive_intelligence(user_company, company_name) and
+        regulatory_analysis(company_name) return their section without another call.
+        """
+        self._refresh_date()
+        prompt = self._dossier_template.format(company_name=company_name, user_company=user_company)
+        response = self._call(
+            prompt, generation_config=genai.GenerationConfig(response_mime_type="application/json")
+        )
+        try:
+            data = json.loads(response)
+            dossier = {section: str(data[section]) for section in DOSSIER_SECTIONS}
+        except (ValueError, KeyError, TypeError):
+            # Malformed JSON: fall back to the separate calls
+            competitive = self.competitive_intelligence(user_company, company_name)
+            dossier = {
+                "competitive": competitive,
+                "regulatory": self.regulatory_analysis(company_name),
+                "risks": self.risk_assessment(competitive),
+            }
+        self._dossiers[(company_name, user_company)] = dossier
+        return dossier
+    
+    def _call_structured(self, prompt: str, schema):
+        """Call the model with `schema` as the response schema and return the validated object."""
+        config = genai.GenerationConfig(response_mime_type="application/json", response_schema=schema)
+        # Keyed apart from the free-text answer to the same prompt
+        text = self._call(prompt, generation_config=config, cache_prompt=f"{prompt}\x00schema:{schema.__name__}")
+        return schema.model_validate_json(text)
+    
+    def identify_competitors_structured(self, company_name: str) -> Competitors:
+        """Identify top 3 competitors as a validated Competitors object."""
+        return self._call_structured(self._identify_competitors_prompt(company_name), Competitors)
+    
+    def risk_assessment_structured(self, company_analysis: str) -> RiskAssessment:
+        """Assess risks as a validated RiskAssessment with Low/Medium/High severities."""
+        return self._call_structured(self._risk_assessment_prompt(company_analysis), RiskAssessment)
+    
+    def calculate_financial_ratios_structured(self, financial_data: str) -> FinancialRatios:
+        """Calculate financial ratios as a validated FinancialRatios object."""
+        return self._call_structured(self._calculate_financial_ratios_prompt(financial_data), FinancialRatios)
+    
+    def _row_batch(self, names: List[str], instructions: str, single_call, batch_size: int) -> Dict[str, str]:
+        """
+        Answer the same question for many companies with one request per chunk.
+        
+        Companies are numbered in the prompt and the response is split back on
+        its "### <n>." headings; any company the model skipped is answered with
+        a regular single call.
+        """
+        results: Dict[str, str] = {}
+        for start in range(0, len(names), batch_size):
+            chunk = names[start:start + batch_size]
+            numbered = "\n".join(f"{i}. {name}" for i, name in enumerate(chunk, 1))
+            prompt = f"""{instructions}
 
-Cover these areas:
-1. Key industry regulations affecting them
-2. Current compliance risks (rate severity)
-3. Recent regulatory actions or investigations
-4. Cross-border/international considerations
-5. Upcoming regulatory changes to watch
+Answer for each company below, in order. Start each company's answer with a heading
+of the form "### <number>. <company name>" and do not use "###" anywhere else.
 
-Today's date: {self.current_date.strftime('%B %d, %Y')}"""
+COMPANIES:
+{numbered}"""
+            response = self._call(prompt)
+            
+            headings = list(_ROW_HEADING_RE.finditer(response or ""))
+            for heading, next_heading in zip(headings, headings[1:] + [None]):
+                index = int(heading.group(1)) - 1
+                if 0 <= index < len(chunk) and chunk[index] not in results:
+                    end = next_heading.start() if next_heading else len(response)
+                    results[chunk[index]] = response[heading.end():end].strip()
         
-        return _call_with_retry(self.model, prompt)
+        for name in names:
+            if not results.get(name):
+                results[name] = single_call(name)
+        return results
+    
+    def batch_identify_competitors(self, names: List[str], batch_size: int = ROW_BATCH_SIZE) -> Dict[str, str]:
+        """Identify competitors for many companies, packing `batch_size` companies per request."""
+        return self._row_batch(
+            names,
+            """Identify the top 3 direct competitors of each company.
+
+For each competitor, briefly explain:
+- What market/industry they overlap in
+- Why they are a threat
+
+Be concise but specific.""",
+            self.identify_competitors,
+            batch_size
+        )
+    
+    def batch_regulatory_analysis(self, names: List[str], batch_size: int = ROW_BATCH_SIZE) -> Dict[str, str]:
+        """Analyze the regulatory landscape for many companies, packing `batch_size` per request."""
+        self._refresh_date()
+        return self._row_batch(
+            names,
+            self._batch_regulatory_instructions,
+            self.regulatory_analysis,
+            batch_size
+        )
+    
+    def stream(self, method: str, *args, **kwargs) -> Iterator[str]:
+        """
+        Stream the response of any prompt method as it is generated.
+        
+        Example: ``for text in detailed.stream("risk_assessment", analysis): ...``
+        lets a caller log or parse the first section before the rest is written.
+        The regular methods stay buffered for evaluation runs.
+        """
+        prompt = getattr(self, f"_{method}_prompt")(*args, **kwargs)
+        model, limiter = next(self._route_cycle)
+        return stream_with_retry(model, prompt, limiter=limiter)
+    
+    async def abatch(self, prompts: List[str]) -> List[Optional[str]]:
+        """Run prompts concurrently under the AIMD controller; None marks a failed prompt."""
+        results = await asyncio.gather(
+            *(_acall_with_retry(model, prompt, self._aimd, limiter)
+              for prompt, (model, limiter) in zip(prompts, self._route_cycle)),
+            return_exceptions=True
+        )
+        return [None if isinstance(result, BaseException) else result for result in results]
+    
+    def batch(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Answer independent prompts in parallel instead of one at a time.
+        
+        Build prompts with the ``_<method>_prompt`` helpers, e.g.
+        ``detailed.batch([detailed._regulatory_analysis_prompt(c) for c in companies])``.
+        Concurrency starts low and adapts to how the API responds.
+        """
+        return get_queue().run(self.abatch(prompts))
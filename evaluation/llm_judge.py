@@ -6,23 +6,151 @@ a baseline Gemini model against the multi-agent CrewAI system.
 """
 
 import os
+import re
 import json
+import logging
 import random
 import time
+import asyncio
+import statistics
+from collections import Counter
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import google.generativeai as genai
 from dotenv import load_dotenv
 
-# Rate limiting settings
-RATE_LIMIT_DELAY = 30  # seconds between retry attempts on rate limit
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser/encoder
+    orjson = None
+
+from evaluation._genai_client import configure, get_model
+from evaluation._gemini_queue import get_queue
+from evaluation._llm_cache import cached_call, store
+from evaluation._tokens import truncate_to_tokens
+from evaluation.schemas import ThreeSystemVerdict
+from evaluation._rate_limit import get_limiter, is_rate_limit_error, retry_delay_from_error, backoff_delay
+
+# Rate limiting settings (backoff: server retry hint, else exponential with jitter)
 MAX_RETRIES = 5  # increased from 3 to handle rate limits better
+DEFAULT_MAX_CONCURRENT = 8  # judge calls in flight at once (async path)
+
+# Per-response token budgets for the judge prompts (~15k / ~10k characters of English)
+PAIRWISE_RESPONSE_TOKEN_BUDGET = 3_750
+THREE_SYSTEM_RESPONSE_TOKEN_BUDGET = 2_500
+
+# Score dimensions in rubric order
+SCORE_DIMENSIONS = ("accuracy", "completeness", "actionability", "recency", "structure")
+
+# Judge output parsing: strip a surrounding ```json fence, else grab the outermost object/array
+_FENCE_RE = re.compile(r'\A```(?:json)?\s*|\s*```\Z')
+_JSON_RE = re.compile(r'\{.*\}|\[.*\]', re.S)
+
+# Test cases judged together in one three-system batch prompt
+THREE_SYSTEM_BATCH_SIZE = 5
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(text: str):
+    """Parse JSON with orjson when installed (its errors subclass json.JSONDecodeError)."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize `obj` as indented UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+# (today, six weeks ago) shared by every evaluation of a running batch
+_date_context: ContextVar[Optional[Tuple[str, str]]] = ContextVar("judge_date_context", default=None)
+
+
+def _build_date_context() -> Tuple[str, str]:
+    """Today's date and the date six weeks ago, formatted for the judge prompts."""
+    current_date = datetime.now()
+    six_weeks_ago = current_date - timedelta(weeks=6)
+    return current_date.strftime("%B %d, %Y"), six_weeks_ago.strftime("%B %d, %Y")
+
+
+def _current_date_context() -> Tuple[str, str]:
+    """The batch's date context if one is running, else a fresh one."""
+    return _date_context.get() or _build_date_context()
 
-@dataclass
+
+def _combine_verdicts(verdicts: List[Dict]) -> Dict:
+    """
+    Merge the parsed verdicts of an ensemble of judges.
+    
+    Each score dimension takes the median across judges; the winner is the
+    majority vote, with split votes settled by the median score totals. The
+    rationale comes from a judge that picked the combined winner.
+    """
+    if len(verdicts) == 1:
+        return verdicts[0]
+    
+    combined = {
+        key: {dim: statistics.median(v[key][dim] for v in verdicts) for dim in SCORE_DIMENSIONS}
+        for key in verdicts[0] if key.endswith("_scores")
+    }
+    source = verdicts[0]
+    if "winner" in source:
+        votes = Counter(v.get("winner") for v in verdicts).most_common()
+        if len(votes) > 1 and votes[0][1] == votes[1][1]:
+            winner = _derive_winner(combined["response_a_scores"], combined["response_b_scores"])
+            winner = winner.upper() if winner != "tie" else winner
+        else:
+            winner = votes[0][0]
+        combined["winner"] = winner
+        source = next((v for v in verdicts if v.get("winner") == winner), source)
+    if "rationale" in source:
+        combined["rationale"] = source["rationale"]
+    return combined
+
+
+def _json_value_end(text: str) -> int:
+    """Index just past the first complete top-level JSON object or array in `text`, or -1 if none yet."""
+    depth = 0
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"' and depth:
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]" and depth:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _derive_winner(scores_a: Dict, scores_b: Dict) -> str:
+    """Pairwise winner from two score dicts by total: "a", "b" or "tie"."""
+    total_a = sum(scores_a[dim] for dim in SCORE_DIMENSIONS)
+    total_b = sum(scores_b[dim] for dim in SCORE_DIMENSIONS)
+    return "a" if total_a > total_b else "b" if total_b > total_a else "tie"
+
+
+def _compute_backoff(attempt: int, error: Exception) -> float:
+    """Seconds to wait before retrying: the server's retry hint if it sent one, else jittered backoff."""
+    return retry_delay_from_error(error) or backoff_delay(attempt)
+
+
+@dataclass(slots=True)
 class ScoreBreakdown:
     """Individual scores for each evaluation dimension."""
     accuracy: int  # 1-5: Factual correctness of information
@@ -31,6 +159,17 @@ class ScoreBreakdown:
     recency: int  # 1-5: Uses data from past 6 weeks (current 2024/2025)
     structure: int  # 1-5: Proper formatting with required headings
     
+    @classmethod
+    def from_dict(cls, scores: Dict) -> "ScoreBreakdown":
+        """Build from a judge score dict, ignoring any extra keys (e.g. "total")."""
+        return cls(scores["accuracy"], scores["completeness"], scores["actionability"],
+                   scores["recency"], scores["structure"])
+    
+    @property
+    def values(self) -> Tuple[int, int, int, int, int]:
+        """Scores in SCORE_DIMENSIONS order."""
+        return (self.accuracy, self.completeness, self.actionability, self.recency, self.structure)
+    
     @property
     def total(self) -> int:
         return self.accuracy + self.completeness + self.actionability + self.recency + self.structure
@@ -51,7 +190,7 @@ class ScoreBreakdown:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     """Complete evaluation result for a single test case."""
     test_case_id: str
@@ -266,7 +405,15 @@ Score each response on a scale of 1-5 for each dimension:
 
     DEFAULT_RUBRIC = COMPETITIVE_INTEL_RUBRIC  # Use comprehensive rubric as default
 
-    JUDGE_PROMPT_TEMPLATE = """You are an expert evaluator comparing two AI-generated responses to a business intelligence query.
+    # Rubric per test case type; anything else uses DEFAULT_RUBRIC
+    RUBRICS = {
+        "competitor_identification": COMPETITOR_ID_RUBRIC,
+        "competitive_intelligence": COMPETITIVE_INTEL_RUBRIC,
+        "regulatory_analysis": REGULATORY_RUBRIC,
+    }
+
+    # Pairwise prompt = header (dates + rubric, cached per type and day) + query/responses + footer
+    JUDGE_PROMPT_HEADER = """You are an expert evaluator comparing two AI-generated responses to a business intelligence query.
 
 ## Your Task
 Evaluate both responses using the rubric below, then declare a winner.
@@ -276,149 +423,231 @@ Evaluate both responses using the rubric below, then declare a winner.
 - "Past 6 weeks" means content from {six_weeks_ago} to {current_date}
 
 {rubric}
+"""
 
-## The Query
-{query}
-
-## Response A
-{response_a}
-
-## Response B
-{response_b}
-
+    JUDGE_PROMPT_FOOTER = """
 ## Your Evaluation
 
 Provide your evaluation in the following JSON format:
 ```json
-{{
-    "response_a_scores": {{
+{
+    "response_a_scores": {
         "accuracy": <1-5>,
         "completeness": <1-5>,
         "actionability": <1-5>,
         "recency": <1-5>,
         "structure": <1-5>
-    }},
-    "response_b_scores": {{
+    },
+    "response_b_scores": {
         "accuracy": <1-5>,
         "completeness": <1-5>,
         "actionability": <1-5>,
         "recency": <1-5>,
         "structure": <1-5>
-    }},
+    },
     "winner": "<A|B|tie>",
     "rationale": "<2-3 sentence explanation of why the winner was chosen, citing specific differences>"
-}}
+}
 ```
 
 Respond ONLY with the JSON object, no other text.
 """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.5-flash",
+                 max_concurrent: Optional[int] = None, models: Optional[List[str]] = None):
         """
         Initialize the LLM Judge.
         
         Args:
             api_key: Gemini API key. If None, reads from GEMINI_API_KEY env var.
             model: Model to use for judging. Default is gemini-2.5-flash.
+            max_concurrent: Max judge calls in flight in the async methods.
+                If None, reads JUDGE_MAX_CONCURRENT (default 8).
+            models: Gemini models to judge with as an ensemble (e.g. flash + pro).
+                They are queried concurrently and their verdicts combined.
+                Overrides `model` when given.
         """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found. Set it in .env or pass as argument.")
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(model)
-        self.model_name = model
+        # Shared SDK client and model: the judge reuses the evaluation systems'
+        # persistent connection instead of opening its own
+        configure(self.api_key)
+        self.model_names = list(models) if models else [model]
+        self.models = [get_model(name) for name in self.model_names]
+        # The first judge also drives token counting and the A/B orientation cache
+        self.model = self.models[0]
+        self.model_name = self.model_names[0]
+        self.max_concurrent = max_concurrent or int(os.getenv("JUDGE_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT))
+        self._sem = None
+        self._sem_loop = None
+        self._prefixes: Dict[Tuple[str, Tuple[str, str]], str] = {}
+        # Judge calls draw on the same key's per-minute quota as the systems under test
+        self._limiter = get_limiter()
+    
+    @property
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore for the running event loop (created lazily, as __init__ may run outside one)."""
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+            self._sem_loop = loop
+        return self._sem
         
     def _parse_judge_response(self, response_text: str) -> Dict:
         """Parse the JSON response from the judge."""
         # Extract JSON from response (handle markdown code blocks)
-        text = response_text.strip()
-        if text.startswith("```"):
-            # Remove markdown code block
-            lines = text.split("\n")
-            text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
+        text = _FENCE_RE.sub("", response_text.strip())
         
         try:
-            return json.loads(text)
+            return _json_loads(text)
         except json.JSONDecodeError as e:
             # Try to find JSON object in the text
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', text)
+            json_match = _JSON_RE.search(text)
             if json_match:
-                return json.loads(json_match.group())
+                return _json_loads(json_match.group())
             raise ValueError(f"Could not parse judge response as JSON: {e}")
     
-    def evaluate(
-        self,
-        query: str,
-        baseline_response: str,
-        agentic_response: str,
-        test_case_id: str = "unknown",
-        test_case_type: str = "general"
-    ) -> EvaluationResult:
-        """
-        Evaluate and compare two responses using the LLM judge.
-        
-        Args:
-            query: The original query/prompt
-            baseline_response: Response from baseline Gemini
-            agentic_response: Response from multi-agent system
-            test_case_id: Identifier for this test case
-            test_case_type: Category of test (competitor_id, competitive_intel, etc.)
-            
-        Returns:
-            EvaluationResult with scores, winner, and rationale
-        """
-        # Randomize assignment to prevent position bias
-        if random.random() < 0.5:
-            response_a = baseline_response
-            response_b = agentic_response
-            a_is_baseline = True
-        else:
-            response_a = agentic_response
-            response_b = baseline_response
-            a_is_baseline = False
-        
-        # Select appropriate rubric based on task type
-        if test_case_type == "competitor_identification":
-            rubric = self.COMPETITOR_ID_RUBRIC
-        elif test_case_type == "competitive_intelligence":
-            rubric = self.COMPETITIVE_INTEL_RUBRIC
-        elif test_case_type == "regulatory_analysis":
-            rubric = self.REGULATORY_RUBRIC
-        else:
-            rubric = self.DEFAULT_RUBRIC
-        
-        # Build the judge prompt
-        current_date = datetime.now()
-        six_weeks_ago = current_date - timedelta(weeks=6)
-        
-        prompt = self.JUDGE_PROMPT_TEMPLATE.format(
-            current_date=current_date.strftime("%B %d, %Y"),
-            six_weeks_ago=six_weeks_ago.strftime("%B %d, %Y"),
-            rubric=rubric,
-            query=query,
-            response_a=response_a[:15000],  # Truncate very long responses
-            response_b=response_b[:15000]
-        )
+    def _cached_verdict(self, prompt: str, force_refresh: bool = False, model=None) -> Optional[str]:
+        """Stored judge response for this exact prompt and model, unless a refresh is forced."""
+        model = model or self.model
+        return None if force_refresh else cached_call(model.model_name, prompt)
+    
+    def _call_judge(self, prompt: str, force_refresh: bool = False, model=None) -> str:
+        """Call a judge model with retry logic for rate limits (cached unless force_refresh)."""
+        model = model or self.model
+        cached = self._cached_verdict(prompt, force_refresh, model)
+        if cached is not None:
+            return cached
         
-        # Call the judge model with retry logic for rate limits
         for attempt in range(MAX_RETRIES):
+            self._limiter.acquire()
             try:
-                response = self.model.generate_content(prompt)
-                break
+                text = ""
+                # Stream so the rest of the output is not waited for once the verdict is closed
+                for chunk in model.generate_content(prompt, stream=True):
+                    text += chunk.text
+                    end = _json_value_end(text)
+                    if end != -1:
+                        text = text[:end]
+                        break
+                store(model.model_name, prompt, text)
+                return text
             except Exception as e:
-                if "429" in str(e) or "rate" in str(e).lower() or "quota" in str(e).lower():
-                    wait_time = RATE_LIMIT_DELAY * (attempt + 1)
-                    print(f"    Rate limited, waiting {wait_time}s (attempt {attempt + 1}/{MAX_RETRIES})...")
+                if is_rate_limit_error(e):
+                    wait_time = _compute_backoff(attempt, e)
+                    logger.warning("Rate limited, waiting %.1fs (attempt %d/%d)", wait_time, attempt + 1, MAX_RETRIES)
                     time.sleep(wait_time)
                 else:
                     raise
-        else:
-            raise Exception("Max retries exceeded for judge evaluation")
+        raise Exception(f"Max retries ({MAX_RETRIES}) exceeded for judge evaluation")
+    
+    async def _acall_judge(self, prompt: str, force_refresh: bool = False, model=None) -> str:
+        """Async variant of _call_judge; rate-limit waits do not block other evaluations."""
+        model = model or self.model
+        cached = self._cached_verdict(prompt, force_refresh, model)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with self._semaphore:
+                    # Wait for a slot in the per-minute quota instead of running into 429s
+                    await asyncio.sleep(self._limiter.reserve())
+                    text = ""
+                    async for chunk in await model.generate_content_async(prompt, stream=True):
+                        text += chunk.text
+                        end = _json_value_end(text)
+                        if end != -1:
+                            text = text[:end]
+                            break
+                store(model.model_name, prompt, text)
+                return text
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    wait_time = _compute_backoff(attempt, e)
+                    logger.warning("Rate limited, waiting %.1fs (attempt %d/%d)", wait_time, attempt + 1, MAX_RETRIES)
+                    await asyncio.sleep(wait_time)
+                else:
+                    raise
+        raise Exception(f"Max retries ({MAX_RETRIES}) exceeded for judge evaluation")
+    
+    def _judge(self, prompt: str, force_refresh: bool = False) -> Dict:
+        """Get the (combined) verdict for `prompt` from every judge model."""
+        if len(self.models) == 1:
+            return self._parse_judge_response(self._call_judge(prompt, force_refresh))
+        # Ensemble members run concurrently, so latency stays at about one judge call
+        return get_queue().run(self._ajudge(prompt, force_refresh))
+    
+    async def _ajudge(self, prompt: str, force_refresh: bool = False) -> Dict:
+        """Async variant of _judge()."""
+        texts = await asyncio.gather(*(self._acall_judge(prompt, force_refresh, m) for m in self.models))
+        verdicts = [self._parse_judge_response(text) for text in texts]
+        if isinstance(verdicts[0], list):
+            # Batched prompt: combine the judges' verdicts case by case
+            return [_combine_verdicts(list(case)) for case in zip(*verdicts)]
+        return _combine_verdicts(verdicts)
+    
+    def _pairwise_prefix(self, test_case_type: str, dates: Tuple[str, str]) -> str:
+        """Static header + rubric of the pairwise prompt, built once per test type and day."""
+        key = (test_case_type, dates)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            rubric = self.RUBRICS.get(test_case_type, self.DEFAULT_RUBRIC)
+            current_date, six_weeks_ago = dates
+            prefix = self._prefixes[key] = self.JUDGE_PROMPT_HEADER.format(
+                current_date=current_date,
+                six_weeks_ago=six_weeks_ago,
+                rubric=rubric
+            )
+        return prefix
+    
+    def _pairwise_prompt(
+        self,
+        query: str,
+        baseline_response: str,
+        agentic_response: str,
+        test_case_type: str,
+        force_refresh: bool = False
+    ) -> Tuple[str, bool]:
+        """Build the blind A/B judge prompt; returns (prompt, a_is_baseline)."""
+        prefix = self._pairwise_prefix(test_case_type, _current_date_context())
+        # Truncate very long responses by tokens so dense text cannot overflow the context
+        baseline_response = truncate_to_tokens(self.model, baseline_response, PAIRWISE_RESPONSE_TOKEN_BUDGET)
+        agentic_response = truncate_to_tokens(self.model, agentic_response, PAIRWISE_RESPONSE_TOKEN_BUDGET)
         
-        result = self._parse_judge_response(response.text)
+        def build(a_is_baseline: bool) -> str:
+            if a_is_baseline:
+                response_a, response_b = baseline_response, agentic_response
+            else:
+                response_a, response_b = agentic_response, baseline_response
+            return (
+                f"{prefix}\n## The Query\n{query}\n\n## Response A\n{response_a}"
+                f"\n\n## Response B\n{response_b}\n{self.JUDGE_PROMPT_FOOTER}"
+            )
         
+        # Randomize assignment to prevent position bias, but if an earlier run
+        # judged this exact pair the other way round, reuse that verdict
+        a_is_baseline = random.random() < 0.5
+        prompt = build(a_is_baseline)
+        if not force_refresh and self._cached_verdict(prompt) is None:
+            flipped = build(not a_is_baseline)
+            if self._cached_verdict(flipped) is not None:
+                return flipped, not a_is_baseline
+        return prompt, a_is_baseline
+    
+    def _pairwise_result(
+        self,
+        result: Dict,
+        a_is_baseline: bool,
+        query: str,
+        baseline_response: str,
+        agentic_response: str,
+        test_case_id: str,
+        test_case_type: str
+    ) -> EvaluationResult:
+        """Map the judge's A/B verdict back onto the baseline and agentic systems."""
         # Map scores back to correct systems
         if a_is_baseline:
             baseline_scores_dict = result["response_a_scores"]
@@ -441,8 +670,8 @@ Respond ONLY with the JSON object, no other text.
             else:
                 winner = "tie"
         
-        baseline_scores = ScoreBreakdown(**baseline_scores_dict)
-        agentic_scores = ScoreBreakdown(**agentic_scores_dict)
+        baseline_scores = ScoreBreakdown.from_dict(baseline_scores_dict)
+        agentic_scores = ScoreBreakdown.from_dict(agentic_scores_dict)
         
         return EvaluationResult(
             test_case_id=test_case_id,
@@ -456,40 +685,58 @@ Respond ONLY with the JSON object, no other text.
             judge_rationale=result.get("rationale", "No rationale provided")
         )
     
-    def evaluate_three_systems(
+    def evaluate(
         self,
         query: str,
-        basic_response: str,
-        detailed_response: str,
+        baseline_response: str,
         agentic_response: str,
         test_case_id: str = "unknown",
-        test_case_type: str = "general"
-    ) -> Dict:
+        test_case_type: str = "general",
+        force_refresh: bool = False
+    ) -> EvaluationResult:
         """
-        Evaluate three systems in a single call for efficiency.
+        Evaluate and compare two responses using the LLM judge.
         
-        Returns dict with scores for all three systems.
+        Args:
+            query: The original query/prompt
+            baseline_response: Response from baseline Gemini
+            agentic_response: Response from multi-agent system
+            test_case_id: Identifier for this test case
+            test_case_type: Category of test (competitor_id, competitive_intel, etc.)
+            force_refresh: Ignore any cached verdict and call the judge again
+            
+        Returns:
+            EvaluationResult with scores, winner, and rationale
         """
-        # Select appropriate rubric based on test case
-        # Recency tests (test_case_id starts with "recency_") use the recency rubric
-        if test_case_id.startswith("recency_"):
-            rubric = self.RECENCY_RUBRIC
-        elif test_case_type == "competitor_identification":
-            rubric = self.COMPETITOR_ID_RUBRIC
-        elif test_case_type == "competitive_intelligence":
-            rubric = self.COMPETITIVE_INTEL_RUBRIC
-        elif test_case_type == "regulatory_analysis":
-            rubric = self.REGULATORY_RUBRIC
-        else:
-            rubric = self.DEFAULT_RUBRIC
-        
-        current_date = datetime.now()
-        six_weeks_ago = current_date - timedelta(weeks=6)
-        
-        # Add web search context for recency tests
-        web_search_context = ""
-        if test_case_id.startswith("recency_"):
-            web_search_context = """
+        prompt, a_is_baseline = self._pairwise_prompt(
+            query, baseline_response, agentic_response, test_case_type, force_refresh
+        )
+        result = self._judge(prompt, force_refresh)
+        return self._pairwise_result(
+            result, a_is_baseline, query, baseline_response, agentic_response, test_case_id, test_case_type
+        )
+    
+    async def aevaluate(
+        self,
+        query: str,
+        baseline_response: str,
+        agentic_response: str,
+        test_case_id: str = "unknown",
+        test_case_type: str = "general",
+        force_refresh: bool = False
+    ) -> EvaluationResult:
+        """Async variant of evaluate()."""
+        # Truncation counts tokens with blocking API calls; keep them off the shared loop
+        prompt, a_is_baseline = await asyncio.to_thread(
+            self._pairwise_prompt, query, baseline_response, agentic_response, test_case_type, force_refresh
+        )
+        result = await self._ajudge(prompt, force_refresh)
+        return self._pairwise_result(
+            result, a_is_baseline, query, baseline_response, agentic_response, test_case_id, test_case_type
+        )
+    
+    # Added to recency prompts: only the agentic system can search the web
+    RECENCY_SEARCH_CONTEXT = """
 ## CRITICAL INFORMATION ABOUT SYSTEM CAPABILITIES
 - The **Agentic System (Response 3)** has access to REAL-TIME WEB SEARCH tools and can retrieve current news and information
 - The Basic and Detailed systems do NOT have web search and rely only on their training data
@@ -497,6 +744,27 @@ Respond ONLY with the JSON object, no other text.
 - Systems that admit they cannot access recent information are being honest but LESS USEFUL for this task
 - For recency-focused queries, the system that provides ACTUAL RECENT DATA with sources should score highest
 """
+    
+    def _three_system_rubric(self, test_case_id: str, test_case_type: str) -> Tuple[str, str]:
+        """(rubric, system capability context) for a three-system evaluation."""
+        # Recency tests (test_case_id starts with "recency_") use the recency rubric
+        # and add web search context
+        if test_case_id.startswith("recency_"):
+            return self.RECENCY_RUBRIC, self.RECENCY_SEARCH_CONTEXT
+        return self.RUBRICS.get(test_case_type, self.DEFAULT_RUBRIC), ""
+    
+    def _three_system_prompt(
+        self,
+        query: str,
+        basic_response: str,
+        detailed_response: str,
+        agentic_response: str,
+        test_case_id: str,
+        test_case_type: str
+    ) -> str:
+        """Build the judge prompt that scores all three systems at once."""
+        rubric, web_search_context = self._three_system_rubric(test_case_id, test_case_type)
+        current_date, six_weeks_ago = _current_date_context()
         
         prompt = f"""You are an expert evaluator comparing three AI-generated responses to a business intelligence query.
 
@@ -504,8 +772,8 @@ Respond ONLY with the JSON object, no other text.
 Evaluate all three responses using the rubric below.
 
 ## Important Context
-- Today's date is {current_date.strftime("%B %d, %Y")}
-- "Past 6 weeks" means content from {six_weeks_ago.strftime("%B %d, %Y")} to {current_date.strftime("%B %d, %Y")}
+- Today's date is {current_date}
+- "Past 6 weeks" means content from {six_weeks_ago} to {current_date}
 {web_search_context}
 
 {rubric}
@@ -514,13 +782,13 @@ Evaluate all three responses using the rubric below.
 {query}
 
 ## Response 1 (Basic System)
-{basic_response[:10000]}
+{truncate_to_tokens(self.model, basic_response, THREE_SYSTEM_RESPONSE_TOKEN_BUDGET)}
 
 ## Response 2 (Detailed System)
-{detailed_response[:10000]}
+{truncate_to_tokens(self.model, detailed_response, THREE_SYSTEM_RESPONSE_TOKEN_BUDGET)}
 
 ## Response 3 (Agentic System)
-{agentic_response[:10000]}
+{truncate_to_tokens(self.model, agentic_response, THREE_SYSTEM_RESPONSE_TOKEN_BUDGET)}
 
 ## Your Evaluation
 
@@ -553,102 +821,390 @@ Provide your evaluation in the following JSON format:
 ```
 
 Respond ONLY with the JSON object, no other text."""
+        return prompt
+    
+    def _three_system_result(
+        self,
+        result: Dict,
+        query: str,
+        test_case_id: str,
+        test_case_type: str
+    ) -> Dict:
+        """
+        Validate the judge's three-system verdict and turn it into the result dict.
+        
+        Raises pydantic.ValidationError (a ValueError) for missing or out-of-range
+        scores; extra keys such as a judge-computed "total" are dropped.
+        """
+        verdict = ThreeSystemVerdict.model_validate(result)
+        return {
+            "test_case_id": test_case_id,
+            "test_case_type": test_case_type,
+            "query": query,
+            "basic_scores": verdict.basic_scores.model_dump(),
+            "detailed_scores": verdict.detailed_scores.model_dump(),
+            "agentic_scores": verdict.agentic_scores.model_dump(),
+            "rationale": verdict.rationale
+        }
+    
+    def evaluate_three_systems(
+        self,
+        query: str,
+        basic_response: str,
+        detailed_response: str,
+        agentic_response: str,
+        test_case_id: str = "unknown",
+        test_case_type: str = "general",
+        force_refresh: bool = False
+    ) -> Dict:
+        """
+        Evaluate three systems in a single call for efficiency.
+        
+        A verdict cached from an earlier run is reused unless force_refresh is set;
+        calls are paced by the shared per-minute rate limiter.
+        Returns dict with scores for all three systems.
+        """
+        prompt = self._three_system_prompt(
+            query, basic_response, detailed_response, agentic_response, test_case_id, test_case_type
+        )
+        return self._three_system_result(self._judge(prompt, force_refresh), query, test_case_id, test_case_type)
+    
+    async def aevaluate_three_systems(
+        self,
+        query: str,
+        basic_response: str,
+        detailed_response: str,
+        agentic_response: str,
+        test_case_id: str = "unknown",
+        test_case_type: str = "general",
+        force_refresh: bool = False
+    ) -> Dict:
+        """Async variant of evaluate_three_systems()."""
+        # Truncation counts tokens with blocking API calls; keep them off the shared loop
+        prompt = await asyncio.to_thread(
+            self._three_system_prompt,
+            query, basic_response, detailed_response, agentic_response, test_case_id, test_case_type
+        )
+        result = await self._ajudge(prompt, force_refresh)
+        return self._three_system_result(result, query, test_case_id, test_case_type)
 
-        # Call the judge model with retry logic
-        for attempt in range(MAX_RETRIES):
+    def _three_system_batch_prompt(self, cases: List[Dict]) -> str:
+        """Build one judge prompt scoring the three systems for several cases that share a rubric."""
+        rubric, web_search_context = self._three_system_rubric(cases[0]["test_case_id"], cases[0]["test_case_type"])
+        current_date, six_weeks_ago = _current_date_context()
+        
+        sections = "\n\n".join(
+            f"""# Case {number}: {case["test_case_id"]}
+
+## The Query
+{case["query"]}
+
+## Response 1 (Basic System)
+{truncate_to_tokens(self.model, case["basic_response"], THREE_SYSTEM_RESPONSE_TOKEN_BUDGET)}
+
+## Response 2 (Detailed System)
+{truncate_to_tokens(self.model, case["detailed_response"], THREE_SYSTEM_RESPONSE_TOKEN_BUDGET)}
+
+## Response 3 (Agentic System)
+{truncate_to_tokens(self.model, case["agentic_response"], THREE_SYSTEM_RESPONSE_TOKEN_BUDGET)}"""
+            for number, case in enumerate(cases, 1)
+        )
+        
+        return f"""You are an expert evaluator comparing three AI-generated responses to each of {len(cases)} business intelligence queries.
+
+## Your Task
+Evaluate all three responses of every case using the rubric below. Judge each case on its own.
+
+## Important Context
+- Today's date is {current_date}
+- "Past 6 weeks" means content from {six_weeks_ago} to {current_date}
+{web_search_context}
+
+{rubric}
+
+{sections}
+
+## Your Evaluation
+
+Provide your evaluation as a JSON array with exactly one object per case, in case order:
+```json
+[
+    {{
+        "test_case_id": "<case id>",
+        "basic_scores": {{"accuracy": <1-5>, "completeness": <1-5>, "actionability": <1-5>, "recency": <1-5>, "structure": <1-5>}},
+        "detailed_scores": {{"accuracy": <1-5>, "completeness": <1-5>, "actionability": <1-5>, "recency": <1-5>, "structure": <1-5>}},
+        "agentic_scores": {{"accuracy": <1-5>, "completeness": <1-5>, "actionability": <1-5>, "recency": <1-5>, "structure": <1-5>}},
+        "rationale": "<2-3 sentence explanation of the key differences between systems>"
+    }}
+]
+```
+
+Respond ONLY with the JSON array, no other text."""
+    
+    async def aevaluate_three_systems_batch(
+        self,
+        cases: List[Dict],
+        force_refresh: bool = False,
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Evaluate three systems for many test cases with one judge call per group of cases.
+        
+        Cases sharing a rubric are judged THREE_SYSTEM_BATCH_SIZE at a time and the
+        groups run concurrently. A group whose reply is malformed or does not match
+        its cases is re-judged one case at a time.
+        
+        Args:
+            cases: Dicts with query, basic_response, detailed_response, agentic_response,
+                test_case_id and test_case_type
+            on_result: Called with (case index, result) as soon as each case is judged
+            
+        Returns:
+            Result dicts as from evaluate_three_systems(), in input order
+            (None where a case could not be judged)
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, case in enumerate(cases):
+            rubric_key = "recency" if case["test_case_id"].startswith("recency_") else case["test_case_type"]
+            groups.setdefault(rubric_key, []).append(index)
+        chunks = [
+            indexes[start:start + THREE_SYSTEM_BATCH_SIZE]
+            for indexes in groups.values()
+            for start in range(0, len(indexes), THREE_SYSTEM_BATCH_SIZE)
+        ]
+        results: List[Optional[Dict]] = [None] * len(cases)
+        
+        def record(index: int, result: Dict) -> None:
+            results[index] = result
+            if on_result:
+                on_result(index, result)
+        
+        async def judge_one(index: int) -> None:
+            case = cases[index]
             try:
-                response = self.model.generate_content(prompt)
-                
-                result = self._parse_judge_response(response.text)
-                
-                # Add delay after successful call to respect rate limits
-                time.sleep(3)
-                
-                return {
-                    "test_case_id": test_case_id,
-                    "test_case_type": test_case_type,
-                    "query": query,
-                    "basic_scores": result["basic_scores"],
-                    "detailed_scores": result["detailed_scores"],
-                    "agentic_scores": result["agentic_scores"],
-                    "rationale": result.get("rationale", "")
-                }
-                
+                result = await self.aevaluate_three_systems(
+                    case["query"], case["basic_response"], case["detailed_response"], case["agentic_response"],
+                    case["test_case_id"], case["test_case_type"], force_refresh
+                )
             except Exception as e:
-                if "429" in str(e) or "rate" in str(e).lower() or "quota" in str(e).lower():
-                    wait_time = RATE_LIMIT_DELAY * (attempt + 1)
-                    print(f"    Rate limited, waiting {wait_time}s (attempt {attempt + 1}/{MAX_RETRIES})...")
-                    time.sleep(wait_time)
-                else:
-                    raise
+                logger.warning("Failed to evaluate %s: %s", case["test_case_id"], e)
+                return
+            record(index, result)
         
-        raise Exception(f"Max retries ({MAX_RETRIES}) exceeded for judge evaluation")
+        async def judge_chunk(chunk: List[int]) -> None:
+            if len(chunk) == 1:
+                return await judge_one(chunk[0])
+            batch = [cases[index] for index in chunk]
+            try:
+                # Built in a worker thread: truncation makes blocking count_tokens calls
+                prompt = await asyncio.to_thread(self._three_system_batch_prompt, batch)
+                verdicts = await self._ajudge(prompt, force_refresh)
+                if not isinstance(verdicts, list) or len(verdicts) != len(batch):
+                    raise ValueError(f"expected {len(batch)} verdicts")
+                parsed = []
+                for case, verdict in zip(batch, verdicts):
+                    if verdict.get("test_case_id", case["test_case_id"]) != case["test_case_id"]:
+                        raise ValueError("verdicts out of case order")
+                    parsed.append(self._three_system_result(
+                        verdict, case["query"], case["test_case_id"], case["test_case_type"]
+                    ))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning("Unusable batched judge reply (%s); judging %d cases one by one", e, len(batch))
+                await asyncio.gather(*(judge_one(index) for index in chunk))
+                return
+            for index, result in zip(chunk, parsed):
+                record(index, result)
+        
+        # Format the dates once; the gathered tasks inherit this context
+        token = _date_context.set(_build_date_context())
+        try:
+            await asyncio.gather(*(judge_chunk(chunk) for chunk in chunks))
+        finally:
+            _date_context.reset(token)
+        return results
+    
+    def evaluate_three_systems_batch(
+        self,
+        cases: List[Dict],
+        force_refresh: bool = False,
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Optional[Dict]]:
+        """Blocking variant of aevaluate_three_systems_batch(), run on the shared Gemini loop."""
+        return get_queue().run(self.aevaluate_three_systems_batch(cases, force_refresh, on_result))
+    
+    # Pairings reported by evaluate_all(): (system in the baseline slot, system in the agentic slot)
+    SYSTEM_PAIRINGS = (("basic", "detailed"), ("basic", "agentic"), ("detailed", "agentic"))
+    
+    def _pairings_from_three_system(
+        self,
+        result: Dict,
+        responses: Dict[str, str]
+    ) -> Dict[Tuple[str, str], EvaluationResult]:
+        """Derive every pairwise EvaluationResult from one three-system verdict."""
+        pairings = {}
+        for first, second in self.SYSTEM_PAIRINGS:
+            first_scores, second_scores = result[f"{first}_scores"], result[f"{second}_scores"]
+            winner = _derive_winner(first_scores, second_scores)
+            pairings[(first, second)] = EvaluationResult(
+                test_case_id=result["test_case_id"],
+                test_case_type=result["test_case_type"],
+                input_query=result["query"],
+                baseline_response=responses[first],
+                agentic_response=responses[second],
+                baseline_scores=ScoreBreakdown.from_dict(first_scores),
+                agentic_scores=ScoreBreakdown.from_dict(second_scores),
+                winner={"a": "baseline", "b": "agentic"}.get(winner, "tie"),
+                judge_rationale=result["rationale"] or "No rationale provided"
+            )
+        return pairings
+    
+    def evaluate_all(
+        self,
+        query: str,
+        basic_response: str,
+        detailed_response: str,
+        agentic_response: str,
+        test_case_id: str = "unknown",
+        test_case_type: str = "general",
+        force_refresh: bool = False
+    ) -> Dict[Tuple[str, str], EvaluationResult]:
+        """
+        Pairwise results for every pairing of the three systems from a single judge call.
+        
+        The three-system verdict already scores every system, so each pairwise
+        winner is derived from the score totals instead of re-querying the judge.
+        
+        Returns:
+            Dict mapping (baseline-slot system, agentic-slot system) to its EvaluationResult
+        """
+        result = self.evaluate_three_systems(
+            query, basic_response, detailed_response, agentic_response,
+            test_case_id, test_case_type, force_refresh
+        )
+        responses = {"basic": basic_response, "detailed": detailed_response, "agentic": agentic_response}
+        return self._pairings_from_three_system(result, responses)
+    
+    async def aevaluate_all(
+        self,
+        query: str,
+        basic_response: str,
+        detailed_response: str,
+        agentic_response: str,
+        test_case_id: str = "unknown",
+        test_case_type: str = "general",
+        force_refresh: bool = False
+    ) -> Dict[Tuple[str, str], EvaluationResult]:
+        """Async variant of evaluate_all()."""
+        result = await self.aevaluate_three_systems(
+            query, basic_response, detailed_response, agentic_response,
+            test_case_id, test_case_type, force_refresh
+        )
+        responses = {"basic": basic_response, "detailed": detailed_response, "agentic": agentic_response}
+        return self._pairings_from_three_system(result, responses)
+
+    async def aevaluate_batch(
+        self,
+        evaluations: List[Tuple[str, str, str, str, str]],
+        force_refresh: bool = False,
+        progress_cb: Optional[Callable[[Dict], None]] = None
+    ) -> List[EvaluationResult]:
+        """
+        Evaluate multiple test cases concurrently.
+        
+        Args:
+            evaluations: List of tuples (query, baseline_response, agentic_response, test_case_id, test_case_type)
+            progress_cb: Called with {"case", "status": "ok"|"error", "winner"|"error"}
+                as each case finishes (e.g. to advance a progress bar)
+            
+        Returns:
+            List of EvaluationResult objects (failed cases are reported and skipped)
+        """
+        async def evaluate_one(args):
+            case_id = args[3]
+            try:
+                result = await self.aevaluate(*args, force_refresh=force_refresh)
+            except Exception as e:
+                logger.warning("Failed to evaluate %s: %s", case_id, e)
+                if progress_cb:
+                    progress_cb({"case": case_id, "status": "error", "error": str(e)})
+                raise
+            logger.info("Evaluated %s: winner = %s", case_id, result.winner)
+            if progress_cb:
+                progress_cb({"case": case_id, "status": "ok", "winner": result.winner})
+            return result
+        
+        # Format the dates once; the gathered tasks inherit this context
+        token = _date_context.set(_build_date_context())
+        try:
+            outcomes = await asyncio.gather(
+                *(evaluate_one(args) for args in evaluations),
+                return_exceptions=True
+            )
+        finally:
+            _date_context.reset(token)
+        return [outcome for outcome in outcomes if not isinstance(outcome, Exception)]
 
     def evaluate_batch(
         self,
-        evaluations: List[Tuple[str, str, str, str, str]]
+        evaluations: List[Tuple[str, str, str, str, str]],
+        force_refresh: bool = False,
+        progress_cb: Optional[Callable[[Dict], None]] = None
     ) -> List[EvaluationResult]:
         """
         Evaluate multiple test cases.
         
         Args:
             evaluations: List of tuples (query, baseline_response, agentic_response, test_case_id, test_case_type)
+            progress_cb: Optional per-case progress callback (see aevaluate_batch)
             
         Returns:
             List of EvaluationResult objects
         """
-        results = []
-        for query, baseline, agentic, case_id, case_type in evaluations:
-            try:
-                result = self.evaluate(query, baseline, agentic, case_id, case_type)
-                results.append(result)
-                print(f"✓ Evaluated {case_id}: Winner = {result.winner}")
-            except Exception as e:
-                print(f"✗ Failed to evaluate {case_id}: {e}")
-        return results
+        # Run on the shared long-lived loop: the SDK's async gRPC channel is bound
+        # to the loop it was opened on, so a fresh asyncio.run() per batch would
+        # have to reconnect (and fails once the channel exists)
+        return get_queue().run(self.aevaluate_batch(evaluations, force_refresh, progress_cb))
 
 
-def generate_evaluation_report(results: List[EvaluationResult]) -> Dict:
+def generate_evaluation_report(results: List[EvaluationResult], as_bytes: bool = False) -> Union[Dict, bytes]:
     """
     Generate an aggregate evaluation report from multiple results.
     
-    Returns summary statistics and detailed breakdowns.
+    Returns summary statistics and detailed breakdowns, or the report already
+    serialized as indented JSON bytes when as_bytes is set.
     """
     if not results:
-        return {"error": "No results to analyze"}
+        report = {"error": "No results to analyze"}
+        return _json_dumps(report) if as_bytes else report
     
-    # Win counts
-    detailed_wins = sum(1 for r in results if r.winner == "baseline")  # baseline = detailed in current setup
-    agentic_wins = sum(1 for r in results if r.winner == "agentic")
-    ties = sum(1 for r in results if r.winner == "tie")
+    # One pass fills a (results, system, dimension) score matrix and the win counters;
+    # float32 because ensemble medians can land on half points
+    scores = np.empty((len(results), 2, len(SCORE_DIMENSIONS)), dtype=np.float32)
+    wins = Counter()
+    type_wins = Counter()
+    for i, r in enumerate(results):
+        scores[i, 0] = r.baseline_scores.values
+        scores[i, 1] = r.agentic_scores.values
+        wins[r.winner] += 1
+        type_wins[(r.test_case_type, r.winner)] += 1
     
-    # Average scores by dimension
-    detailed_avg = {
-        "accuracy": sum(r.baseline_scores.accuracy for r in results) / len(results),
-        "completeness": sum(r.baseline_scores.completeness for r in results) / len(results),
-        "actionability": sum(r.baseline_scores.actionability for r in results) / len(results),
-        "recency": sum(r.baseline_scores.recency for r in results) / len(results),
-        "structure": sum(r.baseline_scores.structure for r in results) / len(results),
-    }
+    detailed_wins = wins["baseline"]  # baseline = detailed in current setup
+    agentic_wins = wins["agentic"]
+    ties = wins["tie"]
     
-    agentic_avg = {
-        "accuracy": sum(r.agentic_scores.accuracy for r in results) / len(results),
-        "completeness": sum(r.agentic_scores.completeness for r in results) / len(results),
-        "actionability": sum(r.agentic_scores.actionability for r in results) / len(results),
-        "recency": sum(r.agentic_scores.recency for r in results) / len(results),
-        "structure": sum(r.agentic_scores.structure for r in results) / len(results),
-    }
+    # Average scores by dimension
+    detailed_means, agentic_means = scores.mean(axis=0)
+    detailed_avg = dict(zip(SCORE_DIMENSIONS, detailed_means.tolist()))
+    agentic_avg = dict(zip(SCORE_DIMENSIONS, agentic_means.tolist()))
     
     # Results by test type
     by_type = {}
-    for r in results:
-        if r.test_case_type not in by_type:
-            by_type[r.test_case_type] = {"detailed": 0, "agentic": 0, "tie": 0}
+    for (test_case_type, winner), count in type_wins.items():
+        counts = by_type.setdefault(test_case_type, {"detailed": 0, "agentic": 0, "tie": 0})
         # Map baseline to detailed for display
-        winner_label = "detailed" if r.winner == "baseline" else r.winner
-        by_type[r.test_case_type][winner_label] += 1
+        counts["detailed" if winner == "baseline" else winner] += count
     
-    return {
+    report = {
         "summary": {
             "total_evaluations": len(results),
             "detailed_wins": detailed_wins,
@@ -663,3 +1219,4 @@ def generate_evaluation_report(results: List[EvaluationResult]) -> Dict:
         "by_test_type": by_type,
         "individual_results": [r.to_dict() for r in results]
     }
+    return _json_dumps(report) if as_bytes else report
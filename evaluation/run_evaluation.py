@@ -9,233 +9,412 @@ baseline Gemini against the multi-agent CrewAI system.
 import os
 import sys
 import json
+import queue
+import atexit
+import asyncio
+import logging
+import logging.handlers
 import argparse
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from evaluation.llm_judge import LLMJudge, EvaluationResult, generate_evaluation_report
+from evaluation.llm_judge import LLMJudge, EvaluationResult, SCORE_DIMENSIONS, generate_evaluation_report
 from evaluation.baseline_gemini import BasicGemini
+from evaluation._llm_cache import cache_enabled, cached_call, store, DEFAULT_MAX_AGE, WEB_MAX_AGE
+from evaluation._gemini_queue import get_queue
 from evaluation.detailed_gemini import DetailedGemini
 from evaluation.agentic_system import AgenticSystem
 from evaluation.test_cases import (
-    TestCase, TestCaseType, ALL_TEST_CASES,
+    DocRegistry, TestCase, TestCaseType, get_test_case, get_test_cases_by_type,
     get_quick_evaluation_set, get_full_evaluation_set
 )
 
+logger = logging.getLogger(__name__)
+_log_listener: Optional[logging.handlers.QueueListener] = None
 
-def run_single_test(
+
+def _start_logging() -> None:
+    """
+    Send log records through a queue drained by a background thread.
+    
+    Progress lines are logged from inside the async fan-out; queueing them
+    keeps the event loop from waiting on a slow console. Does nothing when
+    the caller has already configured logging.
+    """
+    global _log_listener
+    root = logging.getLogger()
+    if _log_listener is not None or root.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    _log_listener = logging.handlers.QueueListener(log_queue, console)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+# Per test type: (system method shared by all three systems, its arguments,
+# progress label, query shown to the judge)
+DISPATCH = {
+    TestCaseType.COMPETITOR_IDENTIFICATION: (
+        "identify_competitors",
+        lambda tc: (tc.company_name,),
+        lambda tc: f"Identifying competitors for {tc.company_name}",
+        lambda tc: f"Identify the top 3 direct competitors of {tc.company_name}",
+    ),
+    TestCaseType.COMPETITIVE_INTELLIGENCE: (
+        "competitive_intelligence",
+        lambda tc: (tc.company_name, tc.competitor_name),
+        lambda tc: f"Generating intel on {tc.competitor_name}",
+        lambda tc: f"Provide competitive intelligence on {tc.competitor_name} from {tc.company_name}'s perspective",
+    ),
+    TestCaseType.FINANCIAL_ANALYSIS: (
+        "analyze_financial_document",
+        lambda tc: (tc.document_content,),
+        lambda tc: "Analyzing financial document",
+        lambda tc: "Analyze this financial document and extract key insights",
+    ),
+    TestCaseType.RATIO_ANALYSIS: (
+        "calculate_financial_ratios",
+        lambda tc: (tc.document_content,),
+        lambda tc: "Calculating financial ratios",
+        lambda tc: "Calculate and analyze key financial ratios from this data",
+    ),
+    TestCaseType.CHAT_QUESTION: (
+        "answer_question",
+        lambda tc: (tc.question, tc.context),
+        lambda tc: "Answering question",
+        lambda tc: tc.question,
+    ),
+    # Use specific question if provided (for recency tests), otherwise general research
+    TestCaseType.COMPANY_RESEARCH: (
+        "research_company",
+        lambda tc: (tc.company_name, tc.question or None),
+        lambda tc: f"Researching {tc.company_name}" + (" (specific query)" if tc.question else ""),
+        lambda tc: tc.question or f"Provide comprehensive research on {tc.company_name}",
+    ),
+    TestCaseType.REGULATORY_ANALYSIS: (
+        "regulatory_analysis",
+        lambda tc: (tc.company_name,),
+        lambda tc: f"Analyzing regulations for {tc.company_name}",
+        lambda tc: f"Analyze regulatory risks and compliance requirements for {tc.company_name}",
+    ),
+}
+
+
+def _basic_prompt(basic: BasicGemini, test_case: TestCase) -> Optional[Tuple[Callable[[], str], str]]:
+    """Return the prompt builder and cache key BasicGemini will use for a test case."""
+    if test_case.type not in DISPATCH:
+        return None
+    method, make_args, _, _ = DISPATCH[test_case.type]
+    # Each BasicGemini method builds its prompt with a matching _<method>_prompt helper
+    return basic._prompt_and_key(method, *make_args(test_case))
+
+
+def prefetch_basic_responses(basic: BasicGemini, test_cases: Sequence[TestCase]) -> None:
+    """
+    Answer every Basic Gemini prompt up front with a single Batch API job.
+    
+    Results land in the LLM response cache, so run_single_test picks them up
+    without new requests. Any failure falls back to the normal per-call path.
+    """
+    if not cache_enabled():
+        logger.warning("  ⚠ --batch needs the LLM response cache; skipping batch prefetch")
+        return
+    
+    # Prompts answered by an earlier run are skipped before any truncation work
+    model_id = basic.model.model_name
+    pending = [
+        entry for entry in (_basic_prompt(basic, tc) for tc in test_cases)
+        if entry and cached_call(model_id, entry[1]) is None
+    ]
+    if not pending:
+        return
+    
+    logger.info(f"\n📦 Submitting {len(pending)} Basic Gemini prompts as one batch job...")
+    try:
+        prompts = [build() for build, _ in pending]
+        responses = basic.run_batch(prompts, [cache_prompt for _, cache_prompt in pending])
+        answered = sum(1 for response in responses if response)
+        logger.info(f"  ✓ Batch answered {answered}/{len(prompts)} prompts")
+    except Exception as e:
+        logger.warning(f"  ⚠ Batch prefetch failed ({e}); falling back to per-call requests")
+
+
+# Systems in report order
+SYSTEMS = ("basic", "detailed", "agentic")
+
+# System calls in flight at once (each system still paces its own API requests)
+MAX_CONCURRENT_LLM = int(os.getenv("MAX_CONCURRENT_LLM", "3"))
+_llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM)
+
+
+def _system_cache_key(system, method: str, args: tuple) -> Tuple[str, str]:
+    """(model id, prompt) pair under which a system's answer to a test case is cached."""
+    model_name = getattr(getattr(system, "model", None), "model_name", "")
+    return f"eval:{type(system).__name__}:{model_name}", f"{method}\x00{json.dumps(args, default=str)}"
+
+
+async def _bounded(system, method: str, *args, max_age: Optional[float] = DEFAULT_MAX_AGE) -> str:
+    """
+    Answer `system.method(*args)`, reusing the stored answer from an earlier run
+    if it is at most `max_age` seconds old.
+    
+    Cache misses run the blocking call in a worker thread, at most
+    MAX_CONCURRENT_LLM at a time.
+    """
+    model_id, key = _system_cache_key(system, method, args)
+    cached = cached_call(model_id, key, max_age=max_age)
+    if cached is not None:
+        return cached
+    async with _llm_semaphore:
+        response = await asyncio.to_thread(getattr(system, method), *args)
+    store(model_id, key, response)
+    return response
+
+
+async def acollect_responses(
     test_case: TestCase,
     basic: BasicGemini,
     detailed: DetailedGemini,
     agentic: AgenticSystem,
-    judge: LLMJudge,
     verbose: bool = True
 ) -> Optional[dict]:
     """
-    Run a single test case through all three systems.
-    Returns dict with responses and evaluations from all three systems.
+    Run a single test case through all three systems concurrently.
     
-    Returns dict with all three responses and comparison results, or None if error occurred.
+    Returns the judge input (query, the three responses, test case id and type),
+    or None if error occurred.
     """
     if verbose:
-        print(f"\n{'='*60}")
-        print(f"Running: {test_case.id} - {test_case.name}")
-        print(f"Type: {test_case.type.value}")
-        print(f"{'='*60}")
+        logger.info(f"\n{'='*60}")
+        logger.info(f"Running: {test_case.id} - {test_case.name}")
+        logger.info(f"Type: {test_case.type.value}")
+        logger.info(f"{'='*60}")
     
     try:
-        import time
-        SYSTEM_DELAY = 20  # Delay between system calls to avoid Gemini rate limits (increased for free tier)
-        
-        # Generate responses from all three systems
-        if test_case.type == TestCaseType.COMPETITOR_IDENTIFICATION:
-            if verbose:
-                print(f"  → Basic: Identifying competitors for {test_case.company_name}...")
-            basic_response = basic.identify_competitors(test_case.company_name)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Detailed: Identifying competitors for {test_case.company_name}...")
-            detailed_response = detailed.identify_competitors(test_case.company_name)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Agentic: Identifying competitors for {test_case.company_name}...")
-            agentic_response = agentic.identify_competitors(test_case.company_name)
-            
-            query = f"Identify the top 3 direct competitors of {test_case.company_name}"
-            
-        elif test_case.type == TestCaseType.COMPETITIVE_INTELLIGENCE:
-            if verbose:
-                print(f"  → Basic: Generating intel on {test_case.competitor_name}...")
-            basic_response = basic.competitive_intelligence(
-                test_case.company_name, test_case.competitor_name
-            )
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Detailed: Generating intel on {test_case.competitor_name}...")
-            detailed_response = detailed.competitive_intelligence(
-                test_case.company_name, test_case.competitor_name
-            )
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Agentic: Generating intel on {test_case.competitor_name}...")
-            agentic_response = agentic.competitive_intelligence(
-                test_case.company_name, test_case.competitor_name
-            )
-            
-            query = f"Provide competitive intelligence on {test_case.competitor_name} from {test_case.company_name}'s perspective"
-            
-        elif test_case.type == TestCaseType.FINANCIAL_ANALYSIS:
-            if verbose:
-                print(f"  → Basic: Analyzing financial document...")
-            basic_response = basic.analyze_financial_document(test_case.document_content)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Detailed: Analyzing financial document...")
-            detailed_response = detailed.analyze_financial_document(test_case.document_content)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Agentic: Analyzing financial document...")
-            agentic_response = agentic.analyze_financial_document(test_case.document_content)
-            
-            query = f"Analyze this financial document and extract key insights"
-            
-        elif test_case.type == TestCaseType.RATIO_ANALYSIS:
-            if verbose:
-                print(f"  → Basic: Calculating financial ratios...")
-            basic_response = basic.calculate_financial_ratios(test_case.document_content)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Detailed: Calculating financial ratios...")
-            detailed_response = detailed.calculate_financial_ratios(test_case.document_content)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Agentic: Calculating financial ratios...")
-            agentic_response = agentic.calculate_financial_ratios(test_case.document_content)
-            
-            query = f"Calculate and analyze key financial ratios from this data"
-            
-        elif test_case.type == TestCaseType.CHAT_QUESTION:
-            if verbose:
-                print(f"  → Basic: Answering question...")
-            basic_response = basic.answer_question(test_case.question, test_case.context)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Detailed: Answering question...")
-            detailed_response = detailed.answer_question(test_case.question, test_case.context)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Agentic: Answering question...")
-            agentic_response = agentic.answer_question(test_case.question, test_case.context)
-            
-            query = test_case.question
-            
-        elif test_case.type == TestCaseType.COMPANY_RESEARCH:
-            # Use specific question if provided (for recency tests), otherwise general research
-            specific_question = test_case.question if test_case.question else None
-            
-            if verbose:
-                if specific_question:
-                    print(f"  → Basic: Researching {test_case.company_name} (specific query)...")
-                else:
-                    print(f"  → Basic: Researching {test_case.company_name}...")
-            basic_response = basic.research_company(test_case.company_name, specific_question)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                if specific_question:
-                    print(f"  → Detailed: Researching {test_case.company_name} (specific query)...")
-                else:
-                    print(f"  → Detailed: Researching {test_case.company_name}...")
-            detailed_response = detailed.research_company(test_case.company_name, specific_question)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                if specific_question:
-                    print(f"  → Agentic: Researching {test_case.company_name} (specific query)...")
-                else:
-                    print(f"  → Agentic: Researching {test_case.company_name}...")
-            agentic_response = agentic.research_company(test_case.company_name, specific_question)
-            
-            query = specific_question if specific_question else f"Provide comprehensive research on {test_case.company_name}"
-            
-        elif test_case.type == TestCaseType.REGULATORY_ANALYSIS:
-            if verbose:
-                print(f"  → Basic: Analyzing regulations for {test_case.company_name}...")
-            basic_response = basic.regulatory_analysis(test_case.company_name)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Detailed: Analyzing regulations for {test_case.company_name}...")
-            detailed_response = detailed.regulatory_analysis(test_case.company_name)
-            time.sleep(SYSTEM_DELAY)
-            
-            if verbose:
-                print(f"  → Agentic: Analyzing regulations for {test_case.company_name}...")
-            agentic_response = agentic.regulatory_analysis(test_case.company_name)
-            
-            query = f"Analyze regulatory risks and compliance requirements for {test_case.company_name}"
-            
-        else:
-            print(f"  ✗ Unknown test case type: {test_case.type}")
+        if test_case.type not in DISPATCH:
+            logger.error(f"  ✗ Unknown test case type: {test_case.type}")
             return None
+        method, make_args, describe, make_query = DISPATCH[test_case.type]
+        args, action, query = make_args(test_case), describe(test_case), make_query(test_case)
         
-        # Evaluate all three systems with judge (single call for efficiency)
+        # Generate responses from all three systems side by side
         if verbose:
-            print(f"  → Judge: Evaluating all three systems...")
-        
-        result = judge.evaluate_three_systems(
-            query=query,
-            basic_response=basic_response,
-            detailed_response=detailed_response,
-            agentic_response=agentic_response,
-            test_case_id=test_case.id,
-            test_case_type=test_case.type.value
+            for label in ("Basic", "Detailed", "Agentic"):
+                logger.info(f"  → {label}: {action}...")
+        # Answers that draw on web search or recent events expire like the web cache
+        recency = test_case.id.startswith("recency_")
+        basic_response, detailed_response, agentic_response = await asyncio.gather(
+            *(_bounded(system, method, *args,
+                       max_age=WEB_MAX_AGE if recency or system is agentic else DEFAULT_MAX_AGE)
+              for system in (basic, detailed, agentic))
         )
         
-        # Add the full responses to the result
-        result["basic_response"] = basic_response
-        result["detailed_response"] = detailed_response
-        result["agentic_response"] = agentic_response
-        
-        if verbose:
-            basic_total = sum(result["basic_scores"].values())
-            detailed_total = sum(result["detailed_scores"].values())
-            agentic_total = sum(result["agentic_scores"].values())
-            print(f"  ✓ Scores:")
-            print(f"    Basic:    {basic_total}/25 (avg: {basic_total/5:.1f})")
-            print(f"    Detailed: {detailed_total}/25 (avg: {detailed_total/5:.1f})")
-            print(f"    Agentic:  {agentic_total}/25 (avg: {agentic_total/5:.1f})")
-        
-        return result
+        return {
+            "query": query,
+            "basic_response": basic_response,
+            "detailed_response": detailed_response,
+            "agentic_response": agentic_response,
+            "test_case_id": test_case.id,
+            "test_case_type": test_case.type.value
+        }
         
     except Exception as e:
-        print(f"  ✗ Error running test case {test_case.id}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("  ✗ Error running test case %s: %s", test_case.id, e)
+        return None
+
+
+def _with_responses(result: dict, case: dict, verbose: bool) -> dict:
+    """Attach the full responses to a judge result and optionally print its scores."""
+    # Add the full responses to the result
+    result["basic_response"] = case["basic_response"]
+    result["detailed_response"] = case["detailed_response"]
+    result["agentic_response"] = case["agentic_response"]
+    
+    if verbose:
+        basic_total = sum(result["basic_scores"].values())
+        detailed_total = sum(result["detailed_scores"].values())
+        agentic_total = sum(result["agentic_scores"].values())
+        logger.info(f"  ✓ Scores ({case['test_case_id']}):")
+        logger.info(f"    Basic:    {basic_total}/25 (avg: {basic_total/5:.1f})")
+        logger.info(f"    Detailed: {detailed_total}/25 (avg: {detailed_total/5:.1f})")
+        logger.info(f"    Agentic:  {agentic_total}/25 (avg: {agentic_total/5:.1f})")
+    
+    return result
+
+
+async def arun_single_test(
+    test_case: TestCase,
+    basic: BasicGemini,
+    detailed: DetailedGemini,
+    agentic: AgenticSystem,
+    judge: LLMJudge,
+    verbose: bool = True
+) -> Optional[dict]:
+    """
+    Run a single test case through all three systems concurrently, then judge them.
+    
+    Returns dict with all three responses and comparison results, or None if error occurred.
+    """
+    case = await acollect_responses(test_case, basic, detailed, agentic, verbose)
+    if case is None:
+        return None
+    
+    # Evaluate all three systems with judge (single call for efficiency)
+    if verbose:
+        logger.info(f"  → Judge: Evaluating all three systems...")
+    try:
+        result = await judge.aevaluate_three_systems(
+            query=case["query"],
+            basic_response=case["basic_response"],
+            detailed_response=case["detailed_response"],
+            agentic_response=case["agentic_response"],
+            test_case_id=case["test_case_id"],
+            test_case_type=case["test_case_type"]
+        )
+    except Exception as e:
+        logger.error(f"  ✗ Error judging test case {test_case.id}: {e}")
         return None
+    return _with_responses(result, case, verbose)
+
+
+def run_single_test(
+    test_case: TestCase,
+    basic: BasicGemini,
+    detailed: DetailedGemini,
+    agentic: AgenticSystem,
+    judge: LLMJudge,
+    verbose: bool = True
+) -> Optional[dict]:
+    """
+    Run a single test case through all three systems.
+    Returns dict with responses and evaluations from all three systems.
+    
+    Returns dict with all three responses and comparison results, or None if error occurred.
+    """
+    _start_logging()
+    # The judge's async client lives on the shared Gemini loop, so run there
+    return get_queue().run(arun_single_test(test_case, basic, detailed, agentic, judge, verbose))
+
+
+async def arun_tests(
+    test_cases: Sequence[TestCase],
+    basic: BasicGemini,
+    detailed: DetailedGemini,
+    agentic: AgenticSystem,
+    judge: LLMJudge,
+    verbose: bool = True,
+    on_result: Optional[Callable[[dict], None]] = None
+) -> List[Optional[dict]]:
+    """
+    Run all test cases concurrently, then judge them in batches; results come back in test case order.
+    
+    `on_result` is called with each finished result as soon as it is judged.
+    
+    There are no fixed pauses between tests: every Gemini call takes a slot
+    from the shared per-minute token bucket (GEMINI_RPM) and 429s are retried
+    with backoff, so the combined request rate follows the real quota.
+    """
+    completed = 0
+    
+    async def collect_one(test_case: TestCase) -> Optional[dict]:
+        nonlocal completed
+        case = await acollect_responses(test_case, basic, detailed, agentic, verbose)
+        # The judge only needs the responses; drop the document text (reloaded if another case needs it)
+        if test_case.document_content_id:
+            DocRegistry.evict(test_case.document_content_id)
+        completed += 1
+        status = "✓" if case else "✗"
+        logger.info(f"\n[{completed}/{len(test_cases)}] {status} {test_case.id}")
+        return case
+    
+    cases = await asyncio.gather(*(collect_one(test_case) for test_case in test_cases))
+    collected = [case for case in cases if case]
+    
+    # Several cases share each judge prompt, so the judge pays one round trip per batch
+    logger.info(f"\n⚖️  Judging {len(collected)} test cases in batches...")
+    results: List[Optional[dict]] = [None] * len(test_cases)
+    positions = [position for position, case in enumerate(cases) if case]
+    
+    def judged(index: int, verdict: dict) -> None:
+        position = positions[index]
+        results[position] = _with_responses(verdict, cases[position], verbose)
+        if on_result:
+            on_result(results[position])
+    
+    await judge.aevaluate_three_systems_batch(collected, on_result=judged)
+    return results
+
+
+# Records which test cases already have a judged result, so a rerun skips them
+MANIFEST_FILE = "manifest.json"
+
+
+def _load_manifest(path: str) -> dict:
+    """Load the resume manifest ({test_case_id: {status, config, result_path}})."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(path: str, manifest: dict) -> None:
+    """Write the manifest atomically so an interrupted run never leaves it half-written."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _run_config(judge: LLMJudge) -> str:
+    """Identify the judging setup; results from a different setup are not reused."""
+    return "+".join(judge.model_names)
+
+
+def _prior_results(manifest: dict, test_case_ids: List[str], run_config: str) -> Dict[str, dict]:
+    """Read the logged results of test cases the manifest marks as done for this config."""
+    wanted: Dict[str, List[str]] = {}
+    for test_case_id in test_case_ids:
+        entry = manifest.get(test_case_id, {})
+        if entry.get("status") == "done" and entry.get("config") == run_config:
+            wanted.setdefault(entry.get("result_path", ""), []).append(test_case_id)
+    
+    found: Dict[str, dict] = {}
+    for result_path, ids in wanted.items():
+        ids = set(ids)
+        try:
+            with open(result_path) as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # partial line from an interrupted write
+                    # Later lines win, so a rerun's result replaces an older one
+                    if result.get("test_case_id") in ids:
+                        found[result["test_case_id"]] = result
+        except FileNotFoundError:
+            continue
+    return found
 
 
 def run_full_evaluation(
-    test_cases: Optional[List[TestCase]] = None,
+    test_cases: Optional[Sequence[TestCase]] = None,
     output_file: Optional[str] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    use_batch: bool = False,
+    force: bool = False
 ) -> dict:
     """
     Run full evaluation across all specified test cases.
@@ -244,10 +423,13 @@ def run_full_evaluation(
         test_cases: List of test cases to run. If None, uses quick evaluation set.
         output_file: Path to save JSON results. If None, uses timestamped default.
         verbose: Print progress to console.
+        use_batch: Prefetch Basic Gemini responses through the Batch API.
+        force: Re-run test cases the manifest already records as done.
         
     Returns:
         Evaluation report dictionary with summary and individual results.
     """
+    _start_logging()
     if test_cases is None:
         test_cases = get_quick_evaluation_set()
     
@@ -255,82 +437,107 @@ def run_full_evaluation(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"evaluation_results_{timestamp}.json"
     
-    print("\n" + "="*70)
-    print("LLM-as-a-Judge Evaluation: Basic vs Detailed vs Agentic")
-    print("Comparing all three systems with comprehensive scoring")
-    print("="*70)
-    print(f"Test cases to run: {len(test_cases)}")
-    print(f"Output file: {output_file}")
-    print("="*70)
-    
-    # Initialize systems
-    print("\nInitializing systems...")
-    basic = BasicGemini()
-    detailed = DetailedGemini()
-    agentic = AgenticSystem()
+    logger.info("\n" + "="*70)
+    logger.info("LLM-as-a-Judge Evaluation: Basic vs Detailed vs Agentic")
+    logger.info("Comparing all three systems with comprehensive scoring")
+    logger.info("="*70)
+    logger.info(f"Test cases to run: {len(test_cases)}")
+    logger.info(f"Output file: {output_file}")
+    logger.info("="*70)
+    
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "evaluation")
+    output_path = os.path.join(output_dir, output_file)
+    
     judge = LLMJudge()
-    print("  ✓ Basic Gemini initialized")
-    print("  ✓ Detailed Gemini initialized")
-    print("  ✓ Agentic System initialized")
-    print("  ✓ LLM Judge initialized")
-    
-    # Run evaluations with rate limiting
-    results: List[EvaluationResult] = []
-    
-    import time
-    DELAY_BETWEEN_TESTS = 45  # seconds to wait between test cases (increased for Gemini free tier)
-    
-    for i, test_case in enumerate(test_cases):
-        print(f"\n[{i+1}/{len(test_cases)}]", end="")
-        result = run_single_test(test_case, basic, detailed, agentic, judge, verbose)
-        if result:
-            results.append(result)
+    run_config = _run_config(judge)
+    
+    # Test cases already judged with this setup are taken from their logged results
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = _load_manifest(manifest_path)
+    prior = {} if force else _prior_results(manifest, [tc.id for tc in test_cases], run_config)
+    pending = [tc for tc in test_cases if tc.id not in prior]
+    if prior:
+        logger.info(f"Resuming: {len(prior)} test cases already done, {len(pending)} pending (--force to re-run)")
+    
+    outcomes: List[Optional[dict]] = []
+    if pending:
+        # Initialize systems
+        logger.info("\nInitializing systems...")
+        basic = BasicGemini()
+        detailed = DetailedGemini()
+        agentic = AgenticSystem()
+        logger.info("  ✓ Basic Gemini initialized")
+        logger.info("  ✓ Detailed Gemini initialized")
+        logger.info("  ✓ Agentic System initialized")
+        logger.info("  ✓ LLM Judge initialized")
+        
+        if use_batch:
+            prefetch_basic_responses(basic, pending)
+        
+        # Append each result to a JSONL log the moment it is judged, so a crash
+        # mid-run keeps finished tests and progress can be followed with tail -f
+        jsonl_path = os.path.splitext(output_path)[0] + ".jsonl"
+        logger.info(f"Streaming results to: {jsonl_path}")
+        
+        with open(jsonl_path, "a") as log:
+            def append_result(result: dict) -> None:
+                log.write(json.dumps(result) + "\n")
+                log.flush()
+                manifest[result["test_case_id"]] = {
+                    "status": "done", "config": run_config, "result_path": jsonl_path
+                }
+                _save_manifest(manifest_path, manifest)
+            
+            # Run evaluations concurrently (rate limited by the shared token bucket)
+            outcomes = get_queue().run(
+                arun_tests(pending, basic, detailed, agentic, judge, verbose, on_result=append_result)
+            )
         
-        # Rate limiting delay between tests (except for last one)
-        if i < len(test_cases) - 1:
-            print(f"\n  ⏳ Waiting {DELAY_BETWEEN_TESTS}s to avoid rate limits...")
-            time.sleep(DELAY_BETWEEN_TESTS)
+        failed = [tc.id for tc, result in zip(pending, outcomes) if not result]
+        for test_case_id in failed:
+            manifest[test_case_id] = {"status": "failed", "config": run_config, "result_path": None}
+        if failed:
+            _save_manifest(manifest_path, manifest)
+    
+    # Summarize the full set, including results carried over from earlier runs
+    new_results = {tc.id: result for tc, result in zip(pending, outcomes) if result}
+    results = [prior.get(tc.id) or new_results.get(tc.id) for tc in test_cases]
+    results = [result for result in results if result]
     
     # Generate report
-    print("\n" + "="*70)
-    print("Generating Evaluation Report...")
-    print("="*70)
+    logger.info("\n" + "="*70)
+    logger.info("Generating Evaluation Report...")
+    logger.info("="*70)
     
     # Calculate aggregate statistics for three systems
     report = generate_three_system_report(results)
     
     # Print summary
     summary = report.get("summary", {})
-    print(f"\n📊 EVALUATION SUMMARY")
-    print(f"   Total Evaluations: {summary.get('total_evaluations', 0)}")
+    logger.info(f"\n📊 EVALUATION SUMMARY")
+    logger.info(f"   Total Evaluations: {summary.get('total_evaluations', 0)}")
     
-    print(f"\n📈 AVERAGE SCORES (All Three Systems)")
+    logger.info(f"\n📈 AVERAGE SCORES (All Three Systems)")
     avg_scores = report.get("average_scores", {})
     basic_avg = avg_scores.get("basic", {})
     detailed_avg = avg_scores.get("detailed", {})
     agentic_avg = avg_scores.get("agentic", {})
     
-    print(f"   {'Dimension':<15} {'Basic':>10} {'Detailed':>10} {'Agentic':>10}")
-    print(f"   {'-'*15} {'-'*10} {'-'*10} {'-'*10}")
+    logger.info(f"   {'Dimension':<15} {'Basic':>10} {'Detailed':>10} {'Agentic':>10}")
+    logger.info(f"   {'-'*15} {'-'*10} {'-'*10} {'-'*10}")
     for dim in ["accuracy", "completeness", "actionability", "recency", "structure"]:
         b_score = basic_avg.get(dim, 0)
         d_score = detailed_avg.get(dim, 0)
         a_score = agentic_avg.get(dim, 0)
-        print(f"   {dim:<15} {b_score:>10.2f} {d_score:>10.2f} {a_score:>10.2f}")
-    
-    print(f"\n   {'TOTAL AVERAGE':<15} {basic_avg.get('total', 0):>10.2f} {detailed_avg.get('total', 0):>10.2f} {agentic_avg.get('total', 0):>10.2f}")
+        logger.info(f"   {dim:<15} {b_score:>10.2f} {d_score:>10.2f} {a_score:>10.2f}")
     
-    # Save results
-    output_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-        "evaluation",
-        output_file
-    )
+    logger.info(f"\n   {'TOTAL AVERAGE':<15} {basic_avg.get('total', 0):>10.2f} {detailed_avg.get('total', 0):>10.2f} {agentic_avg.get('total', 0):>10.2f}")
     
+    # Save the full report (read by the Evaluation Results page)
     with open(output_path, "w") as f:
         json.dump(report, f, indent=2)
     
-    print(f"\n💾 Results saved to: {output_path}")
+    logger.info(f"\n💾 Results saved to: {output_path}")
     
     return report
 
@@ -352,16 +559,11 @@ def generate_three_system_report(results: List[dict]) -> dict:
             "individual_results": []
         }
     
-    # Calculate average scores for each system
-    basic_totals = {"accuracy": 0, "completeness": 0, "actionability": 0, "recency": 0, "structure": 0, "total": 0}
-    detailed_totals = {"accuracy": 0, "completeness": 0, "actionability": 0, "recency": 0, "structure": 0, "total": 0}
-    agentic_totals = {"accuracy": 0, "completeness": 0, "actionability": 0, "recency": 0, "structure": 0, "total": 0}
-    
     # Filter out None results (failed test cases)
     valid_results = [r for r in results if r is not None]
     
     if not valid_results:
-        print("\n⚠️  Warning: No valid test results to generate report")
+        logger.warning("\n⚠️  Warning: No valid test results to generate report")
         return {
             "summary": {
                 "total_evaluations": 0,
@@ -372,25 +574,20 @@ def generate_three_system_report(results: List[dict]) -> dict:
             "individual_results": []
         }
     
-    for result in valid_results:
-        basic_scores = result["basic_scores"]
-        detailed_scores = result["detailed_scores"]
-        agentic_scores = result["agentic_scores"]
-        
-        for dim in ["accuracy", "completeness", "actionability", "recency", "structure"]:
-            basic_totals[dim] += basic_scores[dim]
-            detailed_totals[dim] += detailed_scores[dim]
-            agentic_totals[dim] += agentic_scores[dim]
-        
-        # Calculate totals from individual dimensions
-        basic_totals["total"] += sum(basic_scores[dim] for dim in ["accuracy", "completeness", "actionability", "recency", "structure"])
-        detailed_totals["total"] += sum(detailed_scores[dim] for dim in ["accuracy", "completeness", "actionability", "recency", "structure"])
-        agentic_totals["total"] += sum(agentic_scores[dim] for dim in ["accuracy", "completeness", "actionability", "recency", "structure"])
-    
+    # Stack every score once as (results, system, dimension) and reduce along the results axis
+    scores = np.array(
+        [[[result[f"{system}_scores"][dim] for dim in SCORE_DIMENSIONS] for system in SYSTEMS]
+         for result in valid_results],
+        dtype=np.float32
+    )
+    means = scores.mean(axis=0)                # (system, dimension)
+    totals = scores.sum(axis=-1).mean(axis=0)  # (system,)
+    basic_avg, detailed_avg, agentic_avg = (
+        {**{dim: round(float(value), 2) for dim, value in zip(SCORE_DIMENSIONS, system_means)},
+         "total": round(float(system_total), 2)}
+        for system_means, system_total in zip(means, totals)
+    )
     n = len(valid_results)
-    basic_avg = {dim: round(basic_totals[dim] / n, 2) for dim in basic_totals}
-    detailed_avg = {dim: round(detailed_totals[dim] / n, 2) for dim in detailed_totals}
-    agentic_avg = {dim: round(agentic_totals[dim] / n, 2) for dim in agentic_totals}
     
     # Include both valid and failed results for transparency
     failed_count = len(results) - len(valid_results)
@@ -449,16 +646,44 @@ def main():
         action="store_true",
         help="Reduce output verbosity"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Prefetch Basic Gemini responses with the Gemini Batch API (cheaper, may take hours)"
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the LLM response cache"
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached responses and overwrite them with fresh ones"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run test cases already recorded as done in the resume manifest"
+    )
     
     args = parser.parse_args()
     
+    # The cache reads these on every lookup, so they apply to all systems and the judge
+    if args.no_cache:
+        os.environ["LLM_CACHE_DISABLED"] = "1"
+    elif args.refresh_cache:
+        os.environ["LLM_CACHE_REFRESH"] = "1"
+    
     # Determine test cases to run
     if args.mode == "single":
         if not args.test_id:
             print("Error: --test-id required for single mode")
             sys.exit(1)
-        test_cases = [tc for tc in ALL_TEST_CASES if tc.id == args.test_id]
-        if not test_cases:
+        try:
+            test_cases = [get_test_case(args.test_id)]
+        except KeyError:
             print(f"Error: Test case '{args.test_id}' not found")
             sys.exit(1)
     elif args.mode == "full":
@@ -477,13 +702,18 @@ def main():
             "company_research": TestCaseType.COMPANY_RESEARCH,
         }
         target_type = type_map.get(args.category)
-        test_cases = [tc for tc in test_cases if tc.type == target_type]
+        if args.mode == "full":
+            test_cases = get_test_cases_by_type(target_type)
+        else:
+            test_cases = [tc for tc in test_cases if tc.type == target_type]
     
     # Run evaluation
     run_full_evaluation(
         test_cases=test_cases,
         output_file=args.output,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        use_batch=args.batch,
+        force=args.force
     )
 
 
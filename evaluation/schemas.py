@@ -0,0 +1,69 @@
+"""
+Structured Output Schemas
+
+Pydantic models passed to Gemini as `response_schema`, so the structured
+DetailedGemini methods get JSON that is constrained at decode time and
+validates without any text parsing. The judge's three-system verdicts are
+validated against the models at the bottom.
+"""
+
+from enum import Enum
+from typing import Annotated, List, Union
+
+from pydantic import BaseModel, Field
+
+
+class Severity(str, Enum):
+    LOW = "Low"
+    MEDIUM = "Medium"
+    HIGH = "High"
+
+
+class Competitor(BaseModel):
+    name: str
+    overlap: str
+    threat: str
+
+
+class Competitors(BaseModel):
+    items: List[Competitor]
+
+
+class Risk(BaseModel):
+    category: str  # financial, operational, market or strategic
+    description: str
+    severity: Severity
+
+
+class RiskAssessment(BaseModel):
+    risks: List[Risk]
+
+
+class FinancialRatio(BaseModel):
+    name: str
+    category: str  # liquidity, profitability or leverage
+    value: str
+    interpretation: str
+
+
+class FinancialRatios(BaseModel):
+    ratios: List[FinancialRatio]
+
+
+# Ensemble medians can land on half points, so scores are int or float
+Score = Annotated[Union[int, float], Field(ge=1, le=5)]
+
+
+class JudgeScores(BaseModel):
+    accuracy: Score
+    completeness: Score
+    actionability: Score
+    recency: Score
+    structure: Score
+
+
+class ThreeSystemVerdict(BaseModel):
+    basic_scores: JudgeScores
+    detailed_scores: JudgeScores
+    agentic_scores: JudgeScores
+    rationale: str = ""
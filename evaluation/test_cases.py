@@ -3,10 +3,20 @@ Test Cases for LLM-as-a-Judge Evaluation
 
 This module defines standardized test cases for comparing
 the baseline Gemini against the multi-agent CrewAI system.
+
+Cases are built per category on first use, and the sample documents
+they analyze are read from evaluation/data/ only when a case needs them.
+Cases refer to documents by id through DocRegistry, so a runner can evict
+a document's text once it is done with it.
 """
 
-from dataclasses import dataclass
-from typing import Optional, List
+import os
+import zlib
+import itertools
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Optional, List, Tuple
 from enum import Enum
 
 
@@ -22,26 +32,125 @@ class TestCaseType(Enum):
     REGULATORY_ANALYSIS = "regulatory_analysis"
 
 
-@dataclass
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Preset dictionary of common filing vocabulary; short documents compress far better with it
+ZDICT_PATH = os.path.join(DATA_DIR, "documents.zdict")
+
+
+@lru_cache(maxsize=1)
+def _zdict() -> bytes:
+    try:
+        with open(ZDICT_PATH, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+
+def load_document(name: str) -> str:
+    """Read a sample document from evaluation/data/ (name.txt, or compressed name.txt.z)."""
+    path = os.path.join(DATA_DIR, f"{name}.txt")
+    if os.path.exists(path + ".z"):
+        with open(path + ".z", "rb") as f:
+            return zlib.decompressobj(zdict=_zdict()).decompress(f.read()).decode("utf-8")
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def save_document(name: str, text: str) -> str:
+    """
+    Store a document as evaluation/data/name.txt.z, compressed with the preset dictionary.
+    
+    The shipped samples are stored this way; to edit one, load_document() it,
+    change the text and save it back. Returns the path written.
+    """
+    compressor = zlib.compressobj(9, zdict=_zdict())
+    path = os.path.join(DATA_DIR, f"{name}.txt.z")
+    with open(path, "wb") as f:
+        f.write(compressor.compress(text.encode("utf-8")) + compressor.flush())
+    return path
+
+
+class DocRegistry:
+    """
+    Process-wide store of document texts keyed by id.
+    
+    Test cases hold only the id, so the registry owns the only reference to
+    each text. Ids not registered explicitly are loaded from evaluation/data/
+    on first use, and evicted documents are loaded again if needed later.
+    """
+    _store: Dict[str, str] = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def register(cls, doc_id: str, text: str) -> None:
+        """Store `text` under `doc_id`, replacing any earlier text."""
+        with cls._lock:
+            cls._store[doc_id] = text
+    
+    @classmethod
+    def get(cls, doc_id: str) -> str:
+        """Return the text for `doc_id`, loading it from evaluation/data/ if needed."""
+        with cls._lock:
+            text = cls._store.get(doc_id)
+        if text is None:
+            text = load_document(doc_id)
+            with cls._lock:
+                text = cls._store.setdefault(doc_id, text)
+        return text
+    
+    @classmethod
+    def evict(cls, doc_id: str) -> None:
+        """Drop the text for `doc_id` (a no-op if it is not loaded)."""
+        with cls._lock:
+            cls._store.pop(doc_id, None)
+
+
+@dataclass(frozen=True, slots=True)
 class TestCase:
-    """A single test case for evaluation."""
+    """A single test case for evaluation (immutable; shared across concurrent runs)."""
     id: str
     type: TestCaseType
     name: str
-    description: str
+    description: str = ""
     
     # Input parameters
     company_name: Optional[str] = None
     competitor_name: Optional[str] = None
-    document_content: Optional[str] = None
+    document_content_id: Optional[str] = None  # resolved through DocRegistry
     question: Optional[str] = None
-    context: Optional[str] = None
+    context_id: Optional[str] = None  # resolved through DocRegistry
     
     # Expected elements (for human reference, not automated checking)
-    expected_elements: Optional[List[str]] = None
+    expected_elements: Tuple[str, ...] = ()
     
-    def get_query_description(self) -> str:
-        """Get a human-readable description of what's being tested."""
+    # Built on first use and kept, so constructing a case never reads its document
+    _query_description: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def document_content(self) -> Optional[str]:
+        """The document text, or None if this case has no document."""
+        if self.document_content_id is None:
+            return None
+        return DocRegistry.get(self.document_content_id)
+    
+    @property
+    def context(self) -> Optional[str]:
+        """The chat context text, or None if this case has no context."""
+        if self.context_id is None:
+            return None
+        return DocRegistry.get(self.context_id)
+    
+    @property
+    def query_description(self) -> str:
+        """Human-readable description of what's being tested, computed once."""
+        description = self._query_description
+        if description is None:
+            description = self._compute_desc()
+            object.__setattr__(self, "_query_description", description)
+        return description
+    
+    def _compute_desc(self) -> str:
+        """Build the human-readable description of what's being tested."""
         if self.type == TestCaseType.COMPETITOR_IDENTIFICATION:
             return f"Identify top 3 competitors for {self.company_name}"
         elif self.type == TestCaseType.COMPETITIVE_INTELLIGENCE:
@@ -53,508 +162,462 @@ class TestCase:
         elif self.type == TestCaseType.RISK_ASSESSMENT:
             return f"Risk assessment"
         elif self.type == TestCaseType.CHAT_QUESTION:
-            return f"Question: {self.question[:100]}..."
+            return f"Question: {(self.question or '')[:100]}..."
         elif self.type == TestCaseType.COMPANY_RESEARCH:
             return f"Research company: {self.company_name}"
         elif self.type == TestCaseType.REGULATORY_ANALYSIS:
             return f"Regulatory analysis for: {self.company_name}"
         return self.description
+    
+    def get_query_description(self) -> str:
+        """Get a human-readable description of what's being tested."""
+        return self.query_description
 
 
 # ============================================================================
 # COMPETITOR IDENTIFICATION TEST CASES
 # ============================================================================
 
-COMPETITOR_ID_CASES = [
-    TestCase(
-        id="comp_id_001",
-        type=TestCaseType.COMPETITOR_IDENTIFICATION,
-        name="Apple Competitors",
-        description="Identify Apple's top competitors across hardware and services",
-        company_name="Apple",
-        expected_elements=["Samsung", "Microsoft", "Google", "market overlap", "threat"]
-    ),
-    TestCase(
-        id="comp_id_002",
-        type=TestCaseType.COMPETITOR_IDENTIFICATION,
-        name="Tesla Competitors",
-        description="Identify Tesla's top competitors in EV and energy",
-        company_name="Tesla",
-        expected_elements=["BYD", "Rivian", "Ford", "GM", "market share"]
-    ),
-    TestCase(
-        id="comp_id_003",
-        type=TestCaseType.COMPETITOR_IDENTIFICATION,
-        name="Microsoft Competitors",
-        description="Identify Microsoft's top competitors across cloud and software",
-        company_name="Microsoft",
-        expected_elements=["Amazon", "Google", "Salesforce", "cloud", "enterprise"]
-    ),
-    TestCase(
-        id="comp_id_004",
-        type=TestCaseType.COMPETITOR_IDENTIFICATION,
-        name="Netflix Competitors",
-        description="Identify Netflix's top competitors in streaming",
-        company_name="Netflix",
-        expected_elements=["Disney+", "Amazon Prime", "HBO Max", "streaming", "content"]
-    ),
-    TestCase(
-        id="comp_id_005",
-        type=TestCaseType.COMPETITOR_IDENTIFICATION,
-        name="NVIDIA Competitors",
-        description="Identify NVIDIA's top competitors in AI/GPU",
-        company_name="NVIDIA",
-        expected_elements=["AMD", "Intel", "AI chips", "data center"]
-    ),
-]
+@lru_cache(maxsize=None)
+def _competitor_id_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="comp_id_001",
+            type=TestCaseType.COMPETITOR_IDENTIFICATION,
+            name="Apple Competitors",
+            description="Identify Apple's top competitors across hardware and services",
+            company_name="Apple",
+            expected_elements=("Samsung", "Microsoft", "Google", "market overlap", "threat")
+        ),
+        TestCase(
+            id="comp_id_002",
+            type=TestCaseType.COMPETITOR_IDENTIFICATION,
+            name="Tesla Competitors",
+            description="Identify Tesla's top competitors in EV and energy",
+            company_name="Tesla",
+            expected_elements=("BYD", "Rivian", "Ford", "GM", "market share")
+        ),
+        TestCase(
+            id="comp_id_003",
+            type=TestCaseType.COMPETITOR_IDENTIFICATION,
+            name="Microsoft Competitors",
+            description="Identify Microsoft's top competitors across cloud and software",
+            company_name="Microsoft",
+            expected_elements=("Amazon", "Google", "Salesforce", "cloud", "enterprise")
+        ),
+        TestCase(
+            id="comp_id_004",
+            type=TestCaseType.COMPETITOR_IDENTIFICATION,
+            name="Netflix Competitors",
+            description="Identify Netflix's top competitors in streaming",
+            company_name="Netflix",
+            expected_elements=("Disney+", "Amazon Prime", "HBO Max", "streaming", "content")
+        ),
+        TestCase(
+            id="comp_id_005",
+            type=TestCaseType.COMPETITOR_IDENTIFICATION,
+            name="NVIDIA Competitors",
+            description="Identify NVIDIA's top competitors in AI/GPU",
+            company_name="NVIDIA",
+            expected_elements=("AMD", "Intel", "AI chips", "data center")
+        ),
+    ]
+
 
 # ============================================================================
 # COMPETITIVE INTELLIGENCE TEST CASES
 # ============================================================================
 
-COMPETITIVE_INTEL_CASES = [
-    TestCase(
-        id="comp_intel_001",
-        type=TestCaseType.COMPETITIVE_INTELLIGENCE,
-        name="Apple vs Samsung",
-        description="Competitive intelligence on Samsung from Apple's perspective",
-        company_name="Apple",
-        competitor_name="Samsung",
-        expected_elements=[
-            "Recent Moves", "Major Markets", "Hero Products",
-            "Financial Snapshot", "Direct Threats", "Strategic Recommendations"
-        ]
-    ),
-    TestCase(
-        id="comp_intel_002",
-        type=TestCaseType.COMPETITIVE_INTELLIGENCE,
-        name="Tesla vs BYD",
-        description="Competitive intelligence on BYD from Tesla's perspective",
-        company_name="Tesla",
-        competitor_name="BYD",
-        expected_elements=[
-            "Recent Moves", "China market", "EV sales",
-            "price comparison", "Strategic Recommendations"
-        ]
-    ),
-    TestCase(
-        id="comp_intel_003",
-        type=TestCaseType.COMPETITIVE_INTELLIGENCE,
-        name="Microsoft vs Amazon",
-        description="Competitive intelligence on Amazon/AWS from Microsoft's perspective",
-        company_name="Microsoft",
-        competitor_name="Amazon",
-        expected_elements=[
-            "AWS", "Azure", "cloud market share",
-            "AI services", "Strategic Recommendations"
-        ]
-    ),
-    TestCase(
-        id="comp_intel_004",
-        type=TestCaseType.COMPETITIVE_INTELLIGENCE,
-        name="Coca-Cola vs PepsiCo",
-        description="Competitive intelligence on PepsiCo from Coca-Cola's perspective",
-        company_name="Coca-Cola",
-        competitor_name="PepsiCo",
-        expected_elements=[
-            "beverage", "snacks", "market share",
-            "distribution", "Strategic Recommendations"
-        ]
-    ),
-    TestCase(
-        id="comp_intel_005",
-        type=TestCaseType.COMPETITIVE_INTELLIGENCE,
-        name="NVIDIA vs AMD",
-        description="Competitive intelligence on AMD from NVIDIA's perspective",
-        company_name="NVIDIA",
-        competitor_name="AMD",
-        expected_elements=[
-            "GPU", "AI chips", "data center",
-            "gaming", "Strategic Recommendations"
-        ]
-    ),
-]
+@lru_cache(maxsize=None)
+def _competitive_intel_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="comp_intel_001",
+            type=TestCaseType.COMPETITIVE_INTELLIGENCE,
+            name="Apple vs Samsung",
+            description="Competitive intelligence on Samsung from Apple's perspective",
+            company_name="Apple",
+            competitor_name="Samsung",
+            expected_elements=(
+                "Recent Moves", "Major Markets", "Hero Products",
+                "Financial Snapshot", "Direct Threats", "Strategic Recommendations"
+            )
+        ),
+        TestCase(
+            id="comp_intel_002",
+            type=TestCaseType.COMPETITIVE_INTELLIGENCE,
+            name="Tesla vs BYD",
+            description="Competitive intelligence on BYD from Tesla's perspective",
+            company_name="Tesla",
+            competitor_name="BYD",
+            expected_elements=(
+                "Recent Moves", "China market", "EV sales",
+                "price comparison", "Strategic Recommendations"
+            )
+        ),
+        TestCase(
+            id="comp_intel_003",
+            type=TestCaseType.COMPETITIVE_INTELLIGENCE,
+            name="Microsoft vs Amazon",
+            description="Competitive intelligence on Amazon/AWS from Microsoft's perspective",
+            company_name="Microsoft",
+            competitor_name="Amazon",
+            expected_elements=(
+                "AWS", "Azure", "cloud market share",
+                "AI services", "Strategic Recommendations"
+            )
+        ),
+        TestCase(
+            id="comp_intel_004",
+            type=TestCaseType.COMPETITIVE_INTELLIGENCE,
+            name="Coca-Cola vs PepsiCo",
+            description="Competitive intelligence on PepsiCo from Coca-Cola's perspective",
+            company_name="Coca-Cola",
+            competitor_name="PepsiCo",
+            expected_elements=(
+                "beverage", "snacks", "market share",
+                "distribution", "Strategic Recommendations"
+            )
+        ),
+        TestCase(
+            id="comp_intel_005",
+            type=TestCaseType.COMPETITIVE_INTELLIGENCE,
+            name="NVIDIA vs AMD",
+            description="Competitive intelligence on AMD from NVIDIA's perspective",
+            company_name="NVIDIA",
+            competitor_name="AMD",
+            expected_elements=(
+                "GPU", "AI chips", "data center",
+                "gaming", "Strategic Recommendations"
+            )
+        ),
+    ]
+
 
 # ============================================================================
 # FINANCIAL ANALYSIS TEST CASES
 # ============================================================================
 
-# Sample financial data for testing - TechCorp (synthetic)
-SAMPLE_FINANCIAL_DATA_1 = """
-Company: TechCorp Inc.
-Fiscal Year 2024 Financial Summary
-
-INCOME STATEMENT:
-- Revenue: $45.2 billion (up 12% YoY)
-- Cost of Revenue: $28.1 billion
-- Gross Profit: $17.1 billion
-- Operating Expenses: $8.5 billion
-- Operating Income: $8.6 billion
-- Net Income: $7.2 billion
-
-BALANCE SHEET:
-- Total Assets: $82.4 billion
-- Current Assets: $31.2 billion
-- Cash & Equivalents: $15.8 billion
-- Inventory: $4.2 billion
-- Accounts Receivable: $6.8 billion
-- Total Liabilities: $35.6 billion
-- Current Liabilities: $18.2 billion
-- Long-term Debt: $12.4 billion
-- Shareholders' Equity: $46.8 billion
-
-CASH FLOW:
-- Operating Cash Flow: $12.4 billion
-- Capital Expenditures: $3.2 billion
-- Free Cash Flow: $9.2 billion
-
-KEY RATIOS:
-- P/E Ratio: 24.5
-- Market Cap: $176.4 billion
-"""
-
-# Microsoft FY2024 10K Summary (extracted from actual filing)
-MICROSOFT_10K_FY2024 = """
-Company: Microsoft Corporation
-Fiscal Year 2024 (ended June 30, 2024) - Form 10-K Summary
-
-OVERVIEW:
-Microsoft is a technology company committed to making digital technology and artificial intelligence 
-available broadly and responsibly, with a mission to empower every person and organization on the planet.
-
-KEY HIGHLIGHTS FY2024 vs FY2023:
-- Microsoft Cloud revenue increased 23% to $137.4 billion
-- Office Commercial products and cloud services revenue increased 14% (Office 365 Commercial +16%)
-- Office Consumer products and cloud services revenue increased 4% (82.5 million Microsoft 365 subscribers)
-- LinkedIn revenue increased 9%
-- Dynamics products and cloud services revenue increased 19% (Dynamics 365 +24%)
-- Server products and cloud services revenue increased 22% (Azure +30%)
-- Windows revenue increased 8% (Windows OEM +7%, Windows Commercial +11%)
-- Devices revenue decreased 15%
-- Xbox content and services revenue increased 50% (including 44 points from Activision Blizzard acquisition)
-- Search and news advertising revenue (ex-TAC) increased 12%
-- Operating income increased $20.9 billion or 24% across all segments
-
-MAJOR ACQUISITION:
-On October 13, 2023, Microsoft completed its acquisition of Activision Blizzard for $75.4 billion in cash.
-Activision Blizzard is now part of the More Personal Computing segment.
-
-SEGMENT PERFORMANCE - Productivity and Business Processes:
-- Revenue increased $8.5 billion or 12%
-- Operating income increased $6.4 billion or 19%
-- Gross margin increased $6.5 billion or 12% driven by Office 365 Commercial
-
-SEGMENT PERFORMANCE - Intelligent Cloud:
-- Revenue increased $17.5 billion or 20%
-- Server products and cloud services revenue increased $17.8 billion or 22%
-- Azure and other cloud services revenue grew 30% driven by consumption-based services
-
-TAX MATTERS:
-The company is currently under IRS audit for tax years 2004-2013. The IRS is seeking an additional 
-tax payment of $28.9 billion plus penalties and interest, primarily related to intercompany transfer pricing.
-
-RISK FACTORS:
-- Intense competition across all markets
-- Cybersecurity threats and data breaches
-- Regulatory compliance (antitrust, privacy, AI governance)
-- Intellectual property risks
-- ESG and sustainability requirements
-"""
-
-SAMPLE_FINANCIAL_DATA_2 = """
-Company: RetailMax Corp
-Q3 2024 Earnings Report
-
-Revenue: $12.8 billion (vs $11.2B prior year)
-Same-store sales growth: +4.2%
-E-commerce revenue: $3.1 billion (+28% YoY)
-
-Gross Margin: 28.4% (down from 29.1%)
-Operating Margin: 6.2%
-Net Income: $412 million
-
-Balance Sheet Highlights:
-- Inventory: $5.8 billion (inventory days: 68)
-- Accounts Payable: $4.2 billion
-- Long-term Debt: $8.4 billion
-- Cash: $1.2 billion
-
-Guidance: Expecting Q4 revenue of $15-16 billion
-Challenges: Supply chain costs, wage inflation
-"""
+@lru_cache(maxsize=None)
+def _financial_analysis_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="fin_analysis_001",
+            type=TestCaseType.FINANCIAL_ANALYSIS,
+            name="Microsoft FY24 10K Analysis",
+            description="Analyze Microsoft's FY2024 annual report (10-K)",
+            document_content_id="microsoft_10k_fy2024",
+            expected_elements=(
+                "cloud growth", "Azure", "AI", "Activision acquisition",
+                "segment performance", "risks", "Investment Perspective"
+            )
+        ),
+        TestCase(
+            id="fin_analysis_002",
+            type=TestCaseType.FINANCIAL_ANALYSIS,
+            name="TechCorp Analysis",
+            description="Analyze tech company annual financials",
+            document_content_id="sample_financial_data_1",
+            expected_elements=(
+                "Executive Summary", "revenue growth", "margins",
+                "cash flow", "Investment Perspective"
+            )
+        ),
+        TestCase(
+            id="fin_analysis_003",
+            type=TestCaseType.FINANCIAL_ANALYSIS,
+            name="RetailMax Quarterly",
+            description="Analyze retail company quarterly earnings",
+            document_content_id="sample_financial_data_2",
+            expected_elements=(
+                "same-store sales", "e-commerce growth", "margin pressure",
+                "guidance", "risks"
+            )
+        ),
+    ]
 
-FINANCIAL_ANALYSIS_CASES = [
-    TestCase(
-        id="fin_analysis_001",
-        type=TestCaseType.FINANCIAL_ANALYSIS,
-        name="Microsoft FY24 10K Analysis",
-        description="Analyze Microsoft's FY2024 annual report (10-K)",
-        document_content=MICROSOFT_10K_FY2024,
-        expected_elements=[
-            "cloud growth", "Azure", "AI", "Activision acquisition",
-            "segment performance", "risks", "Investment Perspective"
-        ]
-    ),
-    TestCase(
-        id="fin_analysis_002",
-        type=TestCaseType.FINANCIAL_ANALYSIS,
-        name="TechCorp Analysis",
-        description="Analyze tech company annual financials",
-        document_content=SAMPLE_FINANCIAL_DATA_1,
-        expected_elements=[
-            "Executive Summary", "revenue growth", "margins",
-            "cash flow", "Investment Perspective"
-        ]
-    ),
-    TestCase(
-        id="fin_analysis_003",
-        type=TestCaseType.FINANCIAL_ANALYSIS,
-        name="RetailMax Quarterly",
-        description="Analyze retail company quarterly earnings",
-        document_content=SAMPLE_FINANCIAL_DATA_2,
-        expected_elements=[
-            "same-store sales", "e-commerce growth", "margin pressure",
-            "guidance", "risks"
-        ]
-    ),
-]
 
 # ============================================================================
 # RATIO ANALYSIS TEST CASES
 # ============================================================================
 
-RATIO_ANALYSIS_CASES = [
-    TestCase(
-        id="ratio_001",
-        type=TestCaseType.RATIO_ANALYSIS,
-        name="TechCorp Ratios",
-        description="Calculate financial ratios for tech company",
-        document_content=SAMPLE_FINANCIAL_DATA_1,
-        expected_elements=[
-            "Current Ratio", "Quick Ratio", "ROE", "ROA",
-            "Debt-to-Equity", "interpretation"
-        ]
-    ),
-    TestCase(
-        id="ratio_002",
-        type=TestCaseType.RATIO_ANALYSIS,
-        name="Microsoft Margin Analysis",
-        description="Analyze profitability metrics from Microsoft 10K",
-        document_content=MICROSOFT_10K_FY2024,
-        expected_elements=[
-            "operating margin", "growth rates", "segment profitability",
-            "cloud economics", "interpretation"
-        ]
-    ),
-]
+@lru_cache(maxsize=None)
+def _ratio_analysis_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="ratio_001",
+            type=TestCaseType.RATIO_ANALYSIS,
+            name="TechCorp Ratios",
+            description="Calculate financial ratios for tech company",
+            document_content_id="sample_financial_data_1",
+            expected_elements=(
+                "Current Ratio", "Quick Ratio", "ROE", "ROA",
+                "Debt-to-Equity", "interpretation"
+            )
+        ),
+        TestCase(
+            id="ratio_002",
+            type=TestCaseType.RATIO_ANALYSIS,
+            name="Microsoft Margin Analysis",
+            description="Analyze profitability metrics from Microsoft 10K",
+            document_content_id="microsoft_10k_fy2024",
+            expected_elements=(
+                "operating margin", "growth rates", "segment profitability",
+                "cloud economics", "interpretation"
+            )
+        ),
+    ]
+
 
 # ============================================================================
 # CHAT QUESTION TEST CASES
 # ============================================================================
 
-SAMPLE_ANALYSIS_CONTEXT = """
-=== Analysis of Samsung ===
-TopLine: Samsung remains Apple's primary hardware competitor with $234B revenue.
-
-## Recent Moves (last 6 weeks)
-- Launched Galaxy S24 Ultra with enhanced AI features in November 2025
-- Announced $15B investment in Texas chip fab expansion
-- Partnership with Google on next-gen foldable displays
-
-## Financial Snapshot
-- FY2024 Revenue: $234.1 billion
-- Operating Profit: $28.4 billion
-- Smartphone market share: 19.2% globally
-
-## Strategic Recommendations for Apple
-- **[HIGH PRIORITY]** Accelerate foldable iPhone development
-  **Action:** Fast-track R&D on foldable display technology
-  **Impact:** Counter Samsung's 3-year lead in foldables market
-
-- **[MEDIUM PRIORITY]** Expand manufacturing in India
-  **Action:** Increase iPhone production capacity in India to 25%
-  **Impact:** Reduce supply chain risk and compete on price in emerging markets
-"""
+@lru_cache(maxsize=None)
+def _chat_question_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="chat_001",
+            type=TestCaseType.CHAT_QUESTION,
+            name="Priority Recommendation",
+            description="Ask about top priority recommendation",
+            question="What should we do first?",
+            context_id="sample_analysis_context",
+            expected_elements=("HIGH PRIORITY", "foldable", "action", "implementation")
+        ),
+        TestCase(
+            id="chat_002",
+            type=TestCaseType.CHAT_QUESTION,
+            name="Specific Threat",
+            description="Ask about specific competitive threat",
+            question="How is Samsung's AI chip investment threatening us?",
+            context_id="sample_analysis_context",
+            expected_elements=("chip", "investment", "competitive", "response")
+        ),
+        TestCase(
+            id="chat_003",
+            type=TestCaseType.CHAT_QUESTION,
+            name="Implementation Question",
+            description="Ask how to implement a recommendation",
+            question="How should we accelerate our foldable development?",
+            context_id="sample_analysis_context",
+            expected_elements=("R&D", "timeline", "partnerships", "steps")
+        ),
+    ]
 
-CHAT_QUESTION_CASES = [
-    TestCase(
-        id="chat_001",
-        type=TestCaseType.CHAT_QUESTION,
-        name="Priority Recommendation",
-        description="Ask about top priority recommendation",
-        question="What should we do first?",
-        context=SAMPLE_ANALYSIS_CONTEXT,
-        expected_elements=["HIGH PRIORITY", "foldable", "action", "implementation"]
-    ),
-    TestCase(
-        id="chat_002",
-        type=TestCaseType.CHAT_QUESTION,
-        name="Specific Threat",
-        description="Ask about specific competitive threat",
-        question="How is Samsung's AI chip investment threatening us?",
-        context=SAMPLE_ANALYSIS_CONTEXT,
-        expected_elements=["chip", "investment", "competitive", "response"]
-    ),
-    TestCase(
-        id="chat_003",
-        type=TestCaseType.CHAT_QUESTION,
-        name="Implementation Question",
-        description="Ask how to implement a recommendation",
-        question="How should we accelerate our foldable development?",
-        context=SAMPLE_ANALYSIS_CONTEXT,
-        expected_elements=["R&D", "timeline", "partnerships", "steps"]
-    ),
-]
 
 # ============================================================================
 # COMPANY RESEARCH TEST CASES
 # ============================================================================
 
-COMPANY_RESEARCH_CASES = [
-    TestCase(
-        id="research_001",
-        type=TestCaseType.COMPANY_RESEARCH,
-        name="Research NVIDIA",
-        description="Comprehensive research on NVIDIA",
-        company_name="NVIDIA",
-        expected_elements=[
-            "AI chips", "data center", "gaming",
-            "revenue growth", "competitive position"
-        ]
-    ),
-    TestCase(
-        id="research_002",
-        type=TestCaseType.COMPANY_RESEARCH,
-        name="Research Spotify",
-        description="Comprehensive research on Spotify",
-        company_name="Spotify",
-        expected_elements=[
-            "streaming", "podcasts", "subscribers",
-            "profitability", "competition"
-        ]
-    ),
-]
+@lru_cache(maxsize=None)
+def _company_research_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="research_001",
+            type=TestCaseType.COMPANY_RESEARCH,
+            name="Research NVIDIA",
+            description="Comprehensive research on NVIDIA",
+            company_name="NVIDIA",
+            expected_elements=(
+                "AI chips", "data center", "gaming",
+                "revenue growth", "competitive position"
+            )
+        ),
+        TestCase(
+            id="research_002",
+            type=TestCaseType.COMPANY_RESEARCH,
+            name="Research Spotify",
+            description="Comprehensive research on Spotify",
+            company_name="Spotify",
+            expected_elements=(
+                "streaming", "podcasts", "subscribers",
+                "profitability", "competition"
+            )
+        ),
+    ]
+
 
 # ============================================================================
 # REGULATORY ANALYSIS TEST CASES
 # ============================================================================
 
-REGULATORY_ANALYSIS_CASES = [
-    TestCase(
-        id="reg_001",
-        type=TestCaseType.REGULATORY_ANALYSIS,
-        name="Apple Regulatory",
-        description="Analyze regulatory risks and compliance for Apple",
-        company_name="Apple",
-        expected_elements=[
-            "antitrust", "App Store", "privacy", "EU regulations",
-            "compliance risks", "cross-border"
-        ]
-    ),
-    TestCase(
-        id="reg_002",
-        type=TestCaseType.REGULATORY_ANALYSIS,
-        name="Meta Regulatory",
-        description="Analyze regulatory risks and compliance for Meta",
-        company_name="Meta",
-        expected_elements=[
-            "privacy", "GDPR", "antitrust", "content moderation",
-            "FTC", "data protection"
-        ]
-    ),
-    TestCase(
-        id="reg_003",
-        type=TestCaseType.REGULATORY_ANALYSIS,
-        name="Tesla Regulatory",
-        description="Analyze regulatory risks and compliance for Tesla",
-        company_name="Tesla",
-        expected_elements=[
-            "autonomous driving", "NHTSA", "safety recalls",
-            "emissions credits", "manufacturing regulations"
-        ]
-    ),
-]
+@lru_cache(maxsize=None)
+def _regulatory_analysis_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="reg_001",
+            type=TestCaseType.REGULATORY_ANALYSIS,
+            name="Apple Regulatory",
+            description="Analyze regulatory risks and compliance for Apple",
+            company_name="Apple",
+            expected_elements=(
+                "antitrust", "App Store", "privacy", "EU regulations",
+                "compliance risks", "cross-border"
+            )
+        ),
+        TestCase(
+            id="reg_002",
+            type=TestCaseType.REGULATORY_ANALYSIS,
+            name="Meta Regulatory",
+            description="Analyze regulatory risks and compliance for Meta",
+            company_name="Meta",
+            expected_elements=(
+                "privacy", "GDPR", "antitrust", "content moderation",
+                "FTC", "data protection"
+            )
+        ),
+        TestCase(
+            id="reg_003",
+            type=TestCaseType.REGULATORY_ANALYSIS,
+            name="Tesla Regulatory",
+            description="Analyze regulatory risks and compliance for Tesla",
+            company_name="Tesla",
+            expected_elements=(
+                "autonomous driving", "NHTSA", "safety recalls",
+                "emissions credits", "manufacturing regulations"
+            )
+        ),
+    ]
+
 
 # ============================================================================
 # RECENCY-FOCUSED TEST CASES (require web search for current info)
 # ============================================================================
 
-RECENCY_TEST_CASES = [
-    TestCase(
-        id="recency_001",
-        type=TestCaseType.COMPANY_RESEARCH,
-        name="NVIDIA Recent News",
-        description="Research NVIDIA's most recent news and announcements from the past 2 weeks",
-        company_name="NVIDIA",
-        question="What are NVIDIA's most significant announcements and news from the past 2 weeks (late November - December 2025)? Include specific dates, product launches, partnerships, and stock movements.",
-        expected_elements=[
-            "specific dates", "recent announcements", "stock price",
-            "AI developments", "December 2025"
-        ]
-    ),
-    TestCase(
-        id="recency_002",
-        type=TestCaseType.COMPANY_RESEARCH,
-        name="Tesla Recent Developments",
-        description="Research Tesla's latest news and developments from December 2025",
-        company_name="Tesla",
-        question="What are Tesla's most recent news, stock movements, and announcements from December 2025? Include Cybertruck updates, FSD progress, and any regulatory news.",
-        expected_elements=[
-            "December 2025", "stock price", "Cybertruck",
-            "FSD updates", "recent events"
-        ]
-    ),
-    TestCase(
-        id="recency_003",
-        type=TestCaseType.COMPANY_RESEARCH,
-        name="OpenAI Recent News",
-        description="Research OpenAI's latest announcements and developments",
-        company_name="OpenAI",
-        question="What are OpenAI's most recent announcements from November-December 2025? Include any new model releases, partnerships, valuation updates, and leadership news.",
-        expected_elements=[
-            "GPT updates", "recent releases", "valuation",
-            "December 2025", "Sam Altman"
-        ]
-    ),
-]
+@lru_cache(maxsize=None)
+def _recency_test_cases() -> List[TestCase]:
+    return [
+        TestCase(
+            id="recency_001",
+            type=TestCaseType.COMPANY_RESEARCH,
+            name="NVIDIA Recent News",
+            description="Research NVIDIA's most recent news and announcements from the past 2 weeks",
+            company_name="NVIDIA",
+            question="What are NVIDIA's most significant announcements and news from the past 2 weeks (late November - December 2025)? Include specific dates, product launches, partnerships, and stock movements.",
+            expected_elements=(
+                "specific dates", "recent announcements", "stock price",
+                "AI developments", "December 2025"
+            )
+        ),
+        TestCase(
+            id="recency_002",
+            type=TestCaseType.COMPANY_RESEARCH,
+            name="Tesla Recent Developments",
+            description="Research Tesla's latest news and developments from December 2025",
+            company_name="Tesla",
+            question="What are Tesla's most recent news, stock movements, and announcements from December 2025? Include Cybertruck updates, FSD progress, and any regulatory news.",
+            expected_elements=(
+                "December 2025", "stock price", "Cybertruck",
+                "FSD updates", "recent events"
+            )
+        ),
+        TestCase(
+            id="recency_003",
+            type=TestCaseType.COMPANY_RESEARCH,
+            name="OpenAI Recent News",
+            description="Research OpenAI's latest announcements and developments",
+            company_name="OpenAI",
+            question="What are OpenAI's most recent announcements from November-December 2025? Include any new model releases, partnerships, valuation updates, and leadership news.",
+            expected_elements=(
+                "GPT updates", "recent releases", "valuation",
+                "December 2025", "Sam Altman"
+            )
+        ),
+    ]
+
 
 # ============================================================================
 # AGGREGATE TEST CASES
 # ============================================================================
 
-TEST_CASES = {
-    "competitor_identification": COMPETITOR_ID_CASES,
-    "competitive_intelligence": COMPETITIVE_INTEL_CASES,
-    "financial_analysis": FINANCIAL_ANALYSIS_CASES,
-    "ratio_analysis": RATIO_ANALYSIS_CASES,
-    "chat_question": CHAT_QUESTION_CASES,
-    "company_research": COMPANY_RESEARCH_CASES,
-    "regulatory_analysis": REGULATORY_ANALYSIS_CASES,
-    "recency_test": RECENCY_TEST_CASES,
+# Category name -> factory; a category's cases are only built when first requested
+_CATEGORY_FACTORIES: Dict[str, Callable[[], List[TestCase]]] = {
+    "competitor_identification": _competitor_id_cases,
+    "competitive_intelligence": _competitive_intel_cases,
+    "financial_analysis": _financial_analysis_cases,
+    "ratio_analysis": _ratio_analysis_cases,
+    "chat_question": _chat_question_cases,
+    "company_research": _company_research_cases,
+    "regulatory_analysis": _regulatory_analysis_cases,
+    "recency_test": _recency_test_cases,
 }
 
-# Quick access to all test cases as a flat list
-ALL_TEST_CASES: List[TestCase] = []
-for category_cases in TEST_CASES.values():
-    ALL_TEST_CASES.extend(category_cases)
 
+@lru_cache(maxsize=None)
+def all_test_cases() -> Tuple[TestCase, ...]:
+    """All test cases in category order (an immutable tuple, safe to share)."""
+    return tuple(itertools.chain.from_iterable(factory() for factory in _CATEGORY_FACTORIES.values()))
+
+
+@lru_cache(maxsize=None)
+def _test_cases() -> Dict[str, List[TestCase]]:
+    """Category name -> its test cases (what TEST_CASES resolves to)."""
+    return {name: factory() for name, factory in _CATEGORY_FACTORIES.items()}
+
+
+@lru_cache(maxsize=None)
+def test_cases_by_id() -> Dict[str, TestCase]:
+    """Index for O(1) selection by id."""
+    return {tc.id: tc for tc in all_test_cases()}
 
-def get_test_cases_by_type(test_type: TestCaseType) -> List[TestCase]:
+
+@lru_cache(maxsize=None)
+def test_cases_by_type() -> Dict[TestCaseType, Tuple[TestCase, ...]]:
+    """Index for O(1) selection by type (tuples, so callers can share them)."""
+    return {t: tuple(tc for tc in all_test_cases() if tc.type == t) for t in TestCaseType}
+
+
+def get_test_case(test_id: str) -> TestCase:
+    """Get a test case by id; raises KeyError if there is none."""
+    return test_cases_by_id()[test_id]
+
+
+def get_test_cases_by_type(test_type: TestCaseType) -> Tuple[TestCase, ...]:
     """Get all test cases of a specific type."""
-    return [tc for tc in ALL_TEST_CASES if tc.type == test_type]
+    return test_cases_by_type().get(test_type, ())
 
 
 def get_quick_evaluation_set() -> List[TestCase]:
     """Get a minimal set of test cases for quick evaluation - focused on recency."""
+    recency = _recency_test_cases()
     return [
-        RECENCY_TEST_CASES[0],  # NVIDIA recent news (requires web search)
-        RECENCY_TEST_CASES[1],  # Tesla recent developments (requires web search)
-        RECENCY_TEST_CASES[2],  # OpenAI recent news (requires web search)
-        COMPETITIVE_INTEL_CASES[0],  # Apple vs Samsung (benefits from web search)
-        REGULATORY_ANALYSIS_CASES[0],  # Apple Regulatory (benefits from web search)
+        recency[0],  # NVIDIA recent news (requires web search)
+        recency[1],  # Tesla recent developments (requires web search)
+        recency[2],  # OpenAI recent news (requires web search)
+        _competitive_intel_cases()[0],  # Apple vs Samsung (benefits from web search)
+        _regulatory_analysis_cases()[0],  # Apple Regulatory (benefits from web search)
     ]
 
 
-def get_full_evaluation_set() -> List[TestCase]:
+def get_full_evaluation_set() -> Tuple[TestCase, ...]:
     """Get all test cases for comprehensive evaluation."""
-    return ALL_TEST_CASES
+    return all_test_cases()
+
+
+# The former module-level lists and documents, resolved on first access (PEP 562)
+_LAZY_ATTRIBUTES: Dict[str, Callable[[], object]] = {
+    "COMPETITOR_ID_CASES": _competitor_id_cases,
+    "COMPETITIVE_INTEL_CASES": _competitive_intel_cases,
+    "FINANCIAL_ANALYSIS_CASES": _financial_analysis_cases,
+    "RATIO_ANALYSIS_CASES": _ratio_analysis_cases,
+    "CHAT_QUESTION_CASES": _chat_question_cases,
+    "COMPANY_RESEARCH_CASES": _company_research_cases,
+    "REGULATORY_ANALYSIS_CASES": _regulatory_analysis_cases,
+    "RECENCY_TEST_CASES": _recency_test_cases,
+    "TEST_CASES": _test_cases,
+    "ALL_TEST_CASES": all_test_cases,
+    "TEST_CASES_BY_ID": test_cases_by_id,
+    "TEST_CASES_BY_TYPE": test_cases_by_type,
+    "SAMPLE_FINANCIAL_DATA_1": lambda: DocRegistry.get("sample_financial_data_1"),
+    "SAMPLE_FINANCIAL_DATA_2": lambda: DocRegistry.get("sample_financial_data_2"),
+    "MICROSOFT_10K_FY2024": lambda: DocRegistry.get("microsoft_10k_fy2024"),
+    "SAMPLE_ANALYSIS_CONTEXT": lambda: DocRegistry.get("sample_analysis_context"),
+}
+
+
+def __getattr__(name):
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
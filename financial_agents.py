@@ -1,13 +1,20 @@
 import os
+import threading
+import importlib.util
+from functools import lru_cache, wraps
 from crewai import Agent, LLM
 from crewai_tools import SerperDevTool
 from dotenv import load_dotenv
 import streamlit as st
 
-load_dotenv()
+@lru_cache(maxsize=1)
+def _load_env():
+    """Read .env once, on first use rather than at import."""
+    load_dotenv()
 
 def get_api_key(key_name):
     """Try to get API key from environment variables or Streamlit secrets."""
+    _load_env()
     # First check environment variables
     api_key = os.getenv(key_name)
     if api_key:
@@ -24,58 +31,127 @@ def get_api_key(key_name):
         
     return None
 
-# Get API keys
-gemini_api_key = get_api_key("GEMINI_API_KEY")
-groq_api_key = get_api_key("GROQ_API_KEY")
-serper_api_key = get_api_key("SERPER_API_KEY")
+# API keys, the search tool and the LLMs are resolved on first use, so importing
+# this module does no file I/O and builds no clients until an agent is created.
 
-# Initialize search tool if Serper API key is available
-search_tool = None
-if serper_api_key:
+@lru_cache(maxsize=1)
+def _search_tool():
+    """Return the web search tool, or None if SERPER_API_KEY is not set."""
+    serper_api_key = get_api_key("SERPER_API_KEY")
+    if not serper_api_key:
+        print("Warning: SERPER_API_KEY not found. Web search will be disabled - agents will use training data only.")
+        return None
     os.environ["SERPER_API_KEY"] = serper_api_key  # Ensure it's in env for the tool
-    search_tool = SerperDevTool()
-else:
-    print("Warning: SERPER_API_KEY not found. Web search will be disabled - agents will use training data only.")
+    return SerperDevTool()
 
-# Validate keys - we need at least Gemini for the main agents
-if not gemini_api_key:
-    error_msg = (
-        "⚠️ GEMINI_API_KEY not found! \n"
-        "Please set it in your .env file (locally) or Streamlit Cloud Secrets.\n"
-        "In Streamlit Cloud: Manage App -> Settings -> Secrets"
+def _search_tools():
+    """Tool list for the web-searching agents (empty without a search tool)."""
+    tool = _search_tool()
+    return [tool] if tool else []
+
+@lru_cache(maxsize=1)
+def _gemini_api_key():
+    """Return the Gemini API key; we need at least Gemini for the main agents."""
+    gemini_api_key = get_api_key("GEMINI_API_KEY")
+    if not gemini_api_key:
+        error_msg = (
+            "⚠️ GEMINI_API_KEY not found! \n"
+            "Please set it in your .env file (locally) or Streamlit Cloud Secrets.\n"
+            "In Streamlit Cloud: Manage App -> Settings -> Secrets"
+        )
+        print(error_msg) # Print to server logs
+        try:
+            st.error(error_msg)
+            st.stop()
+        except:
+            raise ValueError(error_msg)
+    return gemini_api_key
+
+# Pool for the HTTP client shared by every LLM below
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE = 20
+
+@lru_cache(maxsize=1)
+def _share_http_client():
+    """
+    Send every synchronous LiteLLM request through one pooled keep-alive httpx client.
+    
+    CrewAI's LLM objects call LiteLLM, which otherwise builds its own clients;
+    with one shared client, agents invoked back to back or concurrently reuse
+    warm connections (pooled per host, so Gemini and Groq each keep theirs)
+    instead of repeating TCP+TLS setup. HTTP/2 is used when `h2` is installed.
+    """
+    import httpx
+    import litellm
+    
+    litellm.client_session = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        timeout=httpx.Timeout(300.0, connect=10.0),
     )
-    print(error_msg) # Print to server logs
-    try:
-        st.error(error_msg)
-        st.stop()
-    except:
-        raise ValueError(error_msg)
 
-# Define the LLMs
-gemini_llm = LLM(
-    api_key=gemini_api_key,
-    model="gemini/gemini-2.5-flash"
-)
+@lru_cache(maxsize=1)
+def _gemini():
+    """Return the default Gemini LLM."""
+    _share_http_client()
+    return LLM(
+        api_key=_gemini_api_key(),
+        model="gemini/gemini-2.5-flash"
+    )
 
-# Groq is optional for some agents, but used in the code. 
-# If missing, we can fallback to Gemini or raise warning.
-if not groq_api_key:
-    print("Warning: GROQ_API_KEY not found. Some agents might fail if they strictly require it.")
-    # Fallback to Gemini if Groq is missing, or let it fail later?
-    # The code uses groq_llm for 'market_comparison_agent'.
-    # Let's fallback to Gemini to prevent crash if possible, or just allow None and let it fail if used.
-    # For now, we'll initialize it with Gemini key if Groq is missing to keep the app running,
-    # but ideally the user should provide it.
-    groq_llm = gemini_llm
-else:
-    groq_llm = LLM(
+@lru_cache(maxsize=1)
+def _groq():
+    """Return the Groq LLM, falling back to Gemini if GROQ_API_KEY is missing."""
+    groq_api_key = get_api_key("GROQ_API_KEY")
+    # Groq is optional; market_comparison_agent uses it but can run on Gemini
+    if not groq_api_key:
+        print("Warning: GROQ_API_KEY not found. Some agents might fail if they strictly require it.")
+        return _gemini()
+    _share_http_client()
+    return LLM(
         api_key=groq_api_key,
         model="groq/llama3-70b-8192"
     )
 
+@lru_cache(maxsize=None)
+def get_llm(model):
+    """Return a shared Gemini LLM for the given model name (e.g. "gemini-2.5-flash-lite")."""
+    _share_http_client()
+    return LLM(
+        api_key=_gemini_api_key(),
+        model=f"gemini/{model}"
+    )
+
+# Agents built so far, per thread (shared by every FinancialAgents instance)
+_agents = threading.local()
+
+def _memoized_agent(factory):
+    """
+    Build each agent once per thread and `llm` override, then keep returning it.
+    
+    Agents carry per-run state inside CrewAI, so an instance is reused across
+    crews on the same thread but never shared between concurrent worker threads.
+    """
+    @wraps(factory)
+    def get_agent(llm=None):
+        cache = getattr(_agents, "cache", None)
+        if cache is None:
+            cache = _agents.cache = {}
+        # The cached agent references `llm`, so its id stays valid as a key
+        key = (factory.__name__, id(llm) if llm is not None else None)
+        agent = cache.get(key)
+        if agent is None:
+            agent = cache[key] = factory(llm)
+        return agent
+    return staticmethod(get_agent)
+
 class FinancialAgents:
+    # Every agent factory accepts an optional `llm` to override its default model.
+    # The factories keep no instance state, so instances are free to create.
+    __slots__ = ()
     
-    def financial_document_analyzer_agent(self):
+    @_memoized_agent
+    def financial_document_analyzer_agent(llm=None):
         return Agent(
             role='Financial Document Analyzer',
             goal="Analyze financial documents (annual reports, 10-K filings, earnings reports) to extract key financial metrics, trends, and insights.",
@@ -84,12 +160,13 @@ class FinancialAgents:
                 "ratio analysis, and industry benchmarking. You can quickly identify key financial metrics, "
                 "trends, risks, and opportunities from complex financial documents."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
         
-    def company_research_agent(self):
+    @_memoized_agent
+    def company_research_agent(llm=None):
         return Agent(
             role='Company Research Specialist',
             goal="Research and analyze companies by name, providing comprehensive financial and business insights with current market data.",
@@ -99,13 +176,14 @@ class FinancialAgents:
                 "competitive position, management quality, and investment prospects. "
                 "You always search for the most recent news and data to provide up-to-date insights."
             ),
-            tools=[search_tool] if search_tool else [],
-            llm=gemini_llm,
+            tools=_search_tools(),
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def financial_ratio_analyst_agent(self):
+    @_memoized_agent
+    def financial_ratio_analyst_agent(llm=None):
         return Agent(
             role='Financial Ratio Analyst',
             goal="Calculate and interpret key financial ratios, providing actionable insights about financial health and performance.",
@@ -114,12 +192,13 @@ class FinancialAgents:
                 "You excel at calculating liquidity ratios, profitability ratios, efficiency ratios, "
                 "and leverage ratios, and can interpret what these metrics mean for investors and stakeholders."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def investment_advisor_agent(self):
+    @_memoized_agent
+    def investment_advisor_agent(llm=None):
         return Agent(
             role='Investment Advisory Specialist',
             goal="Provide investment recommendations and risk assessments based on financial analysis.",
@@ -128,12 +207,13 @@ class FinancialAgents:
                 "market insights to provide balanced investment recommendations. You consider both "
                 "quantitative metrics and qualitative factors in your analysis."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def financial_trend_analyst_agent(self):
+    @_memoized_agent
+    def financial_trend_analyst_agent(llm=None):
         return Agent(
             role='Financial Trend Analyst',
             goal="Identify and analyze financial trends, patterns, and anomalies in company performance over time.",
@@ -142,12 +222,13 @@ class FinancialAgents:
                 "in financial data. You can spot growth trajectories, cyclical patterns, seasonal effects, "
                 "and potential red flags in financial performance."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def risk_assessment_agent(self):
+    @_memoized_agent
+    def risk_assessment_agent(llm=None):
         return Agent(
             role='Risk Assessment Specialist',
             goal="Evaluate and quantify various types of financial and business risks.",
@@ -156,12 +237,13 @@ class FinancialAgents:
                 "of risks including credit risk, market risk, operational risk, and strategic risk. "
                 "You provide clear risk ratings and mitigation strategies."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def market_comparison_agent(self):
+    @_memoized_agent
+    def market_comparison_agent(llm=None):
         return Agent(
             role='Market Comparison Analyst',
             goal="Compare companies against industry peers and market benchmarks.",
@@ -171,12 +253,13 @@ class FinancialAgents:
                 "strengths, weaknesses, and competitive positioning. Your advanced processing "
                 "capabilities allow you to quickly analyze and compare large amounts of market data."
             ),
-            llm=groq_llm,  # Using Groq for faster processing of comparative data
+            llm=llm or _groq(),  # Using Groq for faster processing of comparative data
             verbose=False,
             allow_delegation=False
         )
 
-    def competitor_identification_agent(self):
+    @_memoized_agent
+    def competitor_identification_agent(llm=None):
         return Agent(
             role='Competitive Intelligence Specialist',
             goal="Identify and analyze the top competitors of a given company in their industry.",
@@ -186,13 +269,14 @@ class FinancialAgents:
                 "identify the top 3-5 direct competitors of any company based on industry, "
                 "market share, product overlap, and strategic positioning."
             ),
-            tools=[search_tool] if search_tool else [],
-            llm=gemini_llm,
+            tools=_search_tools(),
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def competitive_intelligence_agent(self):
+    @_memoized_agent
+    def competitive_intelligence_agent(llm=None):
         return Agent(
             role='Competitive Analysis Specialist',
             goal="Provide deep competitive intelligence including recent moves, market position, threats, and financial comparisons.",
@@ -202,13 +286,14 @@ class FinancialAgents:
                 "and potential competitive threats. You provide comprehensive financial comparisons "
                 "and actionable competitive insights that help companies understand their competitive landscape."
             ),
-            tools=[search_tool] if search_tool else [],
-            llm=gemini_llm,
+            tools=_search_tools(),
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def regulatory_analyst_agent(self):
+    @_memoized_agent
+    def regulatory_analyst_agent(llm=None):
         return Agent(
             role='Regulatory & Compliance Analyst',
             goal="Identify regulatory concerns, compliance risks, and legal challenges related to strategic recommendations and industry operations.",
@@ -220,13 +305,14 @@ class FinancialAgents:
                 "You stay current on regulatory trends, government scrutiny areas, and emerging compliance requirements "
                 "across different industries and jurisdictions."
             ),
-            tools=[search_tool] if search_tool else [],
-            llm=gemini_llm,
+            tools=_search_tools(),
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def knowledge_graph_analyst_agent(self):
+    @_memoized_agent
+    def knowledge_graph_analyst_agent(llm=None):
         return Agent(
             role='Knowledge Graph Analyst',
             goal="Extract and structure entities and relationships from competitive analysis.",
@@ -236,12 +322,13 @@ class FinancialAgents:
                 "and their relationships from competitive analysis. You focus on clear, structured output that "
                 "can be easily parsed into a knowledge graph."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def online_research_agent(self):
+    @_memoized_agent
+    def online_research_agent(llm=None):
         return Agent(
             role='Online Research Specialist',
             goal="Research and gather current market information from online sources to supplement internal knowledge.",
@@ -252,13 +339,14 @@ class FinancialAgents:
                 "information to ensure accuracy and relevance. You always aim to provide the most up-to-date "
                 "and reliable market insights. Your fast processing of web data helps provide quick, accurate insights."
             ),
-            tools=[search_tool] if search_tool else [],
-            llm=gemini_llm,
+            tools=_search_tools(),
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def strategy_synthesis_agent(self):
+    @_memoized_agent
+    def strategy_synthesis_agent(llm=None):
         return Agent(
             role='Chief Strategy Officer',
             goal="Synthesize insights from multiple expert analysts to provide comprehensive, well-rounded strategic advice.",
@@ -270,12 +358,13 @@ class FinancialAgents:
                 "into clear, actionable insights. Your role is to consider all angles presented by "
                 "your team of experts and deliver a comprehensive yet concise strategic perspective."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
 
-    def company_insights_synthesis_agent(self):
+    @_memoized_agent
+    def company_insights_synthesis_agent(llm=None):
         return Agent(
             role='Company Insights Synthesis Agent',
             goal="Synthesize expert outputs into a short list of actionable, implementable insights for the company.",
@@ -285,7 +374,7 @@ class FinancialAgents:
                 "operationally relevant, and written as a short directive or suggested action. Avoid stating facts that "
                 "aren't directly actionable."
             ),
-            llm=gemini_llm,
+            llm=llm or _gemini(),
             verbose=False,
             allow_delegation=False
         )
@@ -5,7 +5,6 @@ class FinancialTasks:
     def analyze_financial_document_task(self, agent, document_content, analysis_focus="comprehensive"):
         return Task(
             description=f"""Analyze the provided financial document and extract key insights.
-            Focus: {analysis_focus}
             
             Please provide a comprehensive analysis including:
             1. **Executive Summary** - Key highlights and overall financial health
@@ -16,6 +15,8 @@ class FinancialTasks:
             6. **Risks & Concerns** - Areas of concern or potential red flags
             7. **Investment Perspective** - Overall assessment for potential investors
             
+            Focus: {analysis_focus}
+            
             DOCUMENT CONTENT:
             {document_content}""",
             expected_output="A structured financial analysis report with clear sections and actionable insights.",
@@ -126,8 +127,6 @@ class FinancialTasks:
         return Task(
             description=f"""Conduct a comprehensive risk assessment based on the company analysis.
             
-            Market Conditions: {market_conditions}
-            
             Assess the following risk categories:
             
             **Financial Risks:**
@@ -157,6 +156,8 @@ class FinancialTasks:
             4. Mitigation factors
             5. Monitoring indicators
             
+            Market Conditions: {market_conditions}
+            
             COMPANY ANALYSIS:
             {company_analysis}""",
             expected_output="A comprehensive risk assessment with risk ratings and mitigation strategies.",
@@ -343,10 +344,7 @@ Your response must be ONLY the final answer with no preamble or reasoning.""",
 
     def regulatory_concerns_task(self, agent, user_company, competitor_company, strategic_recommendations, industry_context):
         return Task(
-            description=f"""Quickly identify TOP 3 regulatory concerns for {user_company} in the {industry_context}.
-
-Strategic Recommendations:
-{strategic_recommendations}
+            description=f"""Quickly identify the TOP 3 regulatory concerns for the company and industry given at the end of these instructions.
 
 IMPORTANT: Output ONLY the formatted regulatory summary below. Do NOT include any reasoning, thoughts, planning, or process notes.
 
@@ -367,7 +365,13 @@ Provide a CONCISE regulatory summary in this EXACT format:
 - State "None identified" if not applicable
 
 Keep each section to 2-4 concise bullet points. Focus on ACTIONABLE, HIGH-IMPACT concerns only.
-Output MUST start with "## Regulatory & Compliance Concerns" - nothing before it.""",
+Output MUST start with "## Regulatory & Compliance Concerns" - nothing before it.
+
+Company: {user_company}
+Industry: {industry_context}
+
+Strategic Recommendations:
+{strategic_recommendations}""",
             expected_output="Concise Markdown regulatory summary with 3 sections, focusing on top 2-3 concerns per section. Must start with heading, no preamble or reasoning.",
             agent=agent
         )
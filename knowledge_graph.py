@@ -46,6 +46,49 @@ class CompetitiveKnowledgeGraph:
             'timestamp': attributes['added_at']
         })
         
+    def get_company(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a company's attributes, or None if it is not in the graph."""
+        attributes = self.entity_attributes.get(company_name)
+        if attributes is None or attributes.get('entity_type') != 'company':
+            return None
+        return dict(attributes)
+        
+    def update_company(self, company_name: str, attributes: Dict[str, Any]):
+        """Merge attributes into a company node, adding the company if it is missing."""
+        if self.get_company(company_name) is None:
+            self.add_company(company_name, dict(attributes))
+            return
+        
+        self.entity_attributes[company_name].update(attributes)
+        self.graph.nodes[company_name].update(attributes)
+        
+    def add_companies_bulk(self, companies: List[Tuple[str, Optional[Dict[str, Any]]]]):
+        """Add several (company_name, attributes) nodes in a single graph update."""
+        added_at = datetime.now().isoformat()
+        nodes = []
+        for company_name, attributes in companies:
+            attributes = dict(attributes or {}, added_at=added_at, entity_type='company')
+            nodes.append((company_name, attributes))
+            self.entity_attributes[company_name] = attributes
+        
+        self.graph.add_nodes_from(nodes)
+        
+    def add_relationships_bulk(self, relationships: List[Tuple[str, str, str, Optional[Dict[str, Any]]]]):
+        """Add several (source, target, relationship_type, attributes) edges in a single graph update."""
+        added_at = datetime.now().isoformat()
+        edges = []
+        for source, target, relationship_type, attributes in relationships:
+            attributes = dict(attributes or {}, relationship_type=relationship_type, added_at=added_at)
+            edges.append((source, target, attributes))
+            self.relationship_history.append({
+                'source': source,
+                'target': target,
+                'type': relationship_type,
+                'timestamp': added_at
+            })
+        
+        self.graph.add_edges_from(edges)
+        
     def add_product(self, product_name: str, company: str, attributes: Dict[str, Any] = None):
         """Add a product and link it to a company."""
         if attributes is None:
@@ -2,10 +2,8 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 from crewai import Crew, Process
-from financial_agents import FinancialAgents
-from financial_tasks import FinancialTasks
-from utils import process_financial_documents, get_memory
-import uuid
+from utils import process_financial_documents, get_memory, get_financial_agents, get_financial_tasks, inject_css
+import secrets
 import re
 from datetime import datetime
 
@@ -68,36 +66,7 @@ st.set_page_config(page_title="CEO AI Assistant - Internal Analysis", page_icon=
 memory = get_memory()
 memory.set_focus("internal_analysis")
 
-st.markdown("""
-<style>
-    .centered-cell .stButton > button {
-        margin: 0 auto;
-        display: block;
-    }
-    .analysis-card {
-        border: 1px solid #ddd;
-        border-radius: 8px;
-        padding: 20px;
-        background-color: #fafafa;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 10px 0;
-    }
-    .metric-container {
-        display: flex;
-        justify-content: space-around;
-        flex-wrap: wrap;
-        margin: 20px 0;
-    }
-    .metric-item {
-        text-align: center;
-        margin: 10px;
-        padding: 15px;
-        background-color: #f0f2f6;
-        border-radius: 8px;
-        min-width: 120px;
-    }
-</style>
-""", unsafe_allow_html=True)
+inject_css()
 
 # --- SESSION STATE INITIALIZATION ---
 if "internal_session" not in st.session_state:
@@ -110,7 +79,7 @@ def get_current_internal_session():
 def new_internal_session():
     """Create a new internal analysis session (replaces any existing one)."""
     st.session_state.internal_session = {
-        "id": str(uuid.uuid4()),
+        "id": secrets.token_hex(8),
         "title": "Document Analysis Session",
         "session_type": "document",
         "messages": [],
@@ -128,8 +97,8 @@ def reset_session():
     st.session_state.internal_session = None
 
 # --- AGENT & TASK DEFINITIONS ---
-financial_agents = FinancialAgents()
-financial_tasks = FinancialTasks()
+financial_agents = get_financial_agents()
+financial_tasks = get_financial_tasks()
 
 # --- MAIN LAYOUT ---
 session = get_current_internal_session()
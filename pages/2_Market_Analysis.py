@@ -1,13 +1,13 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-from crewai import Crew, Process
-from financial_agents import FinancialAgents
-from financial_tasks import FinancialTasks
-from utils import validate_company_name, get_memory
-import uuid
+from utils import validate_company_name, parse_competitors, strip_agent_scratch, extract_strategic_recommendations, get_memory, get_financial_agents, get_financial_tasks, inject_css
+import secrets
 import json
 import re
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
 # Load environment variables
@@ -150,40 +150,13 @@ st.set_page_config(page_title="CEO AI Assistant - Market Analysis", page_icon="
 memory = get_memory()
 memory.set_focus("market_analysis")
 
-st.markdown("""
-<style>
-    .centered-cell .stButton > button {
-        margin: 0 auto;
-        display: block;
-    }
-    .analysis-card {
-        border: 1px solid #ddd;
-        border-radius: 8px;
-        padding: 20px;
-        background-color: #fafafa;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 10px 0;
-    }
-    .metric-container {
-        display: flex;
-        justify-content: space-around;
-        flex-wrap: wrap;
-        margin: 20px 0;
-    }
-    .metric-item {
-        text-align: center;
-        margin: 10px;
-        padding: 15px;
-        background-color: #f0f2f6;
-        border-radius: 8px;
-        min-width: 120px;
-    }
-</style>
-""", unsafe_allow_html=True)
+inject_css()
 
 # --- SESSION STATE INITIALIZATION ---
 if "market_sessions" not in st.session_state:
     st.session_state.market_sessions = {}
+# company name -> id of its most recent market session, for O(1) restore
+st.session_state.setdefault("market_sessions_by_company", {})
 if "current_market_session_id" not in st.session_state:
     st.session_state.current_market_session_id = None
 if "editing_market_session_id" not in st.session_state:
@@ -203,13 +176,7 @@ if not st.session_state.get("current_market_session_id") and st.session_state.ge
     # Try to find by user company if available
     target_company = st.session_state.get("current_user_company")
     if target_company:
-        for sid, sess in st.session_state.market_sessions.items():
-            try:
-                if sess.get("user_company") == target_company:
-                    st.session_state.current_market_session_id = sid
-                    break
-            except Exception:
-                continue
+        st.session_state.current_market_session_id = st.session_state.market_sessions_by_company.get(target_company)
     # Fallback: pick the first existing session
     if not st.session_state.get("current_market_session_id"):
         try:
@@ -221,98 +188,6 @@ if not st.session_state.get("current_market_session_id") and st.session_state.ge
  
 
 
-def parse_competitors(competitor_text):
-    """Parse competitor names from the AI response.
-
-    Strategy:
-    1. Try to locate and parse a JSON array anywhere in the response.
-    2. If no JSON is found, fall back to several heuristic patterns ("**Competitor N: ...**",
-       numbered lists, bullet lists, simple left-hand name extraction).
-    3. Return up to 3 unique, trimmed names.
-    """
-    import re
-    import json
-
-    competitors = []
-    if not competitor_text:
-        return competitors
-
-    # 1) Try to find a JSON array anywhere in the text and parse it
-    try:
-        # Find the first balanced [...] substring (simple approach)
-        start = competitor_text.find('[')
-        if start != -1:
-            # attempt to find the corresponding closing bracket
-            end = competitor_text.find(']', start)
-            if end != -1:
-                maybe_json = competitor_text[start:end+1]
-                try:
-                    parsed = json.loads(maybe_json)
-                    if isinstance(parsed, list):
-                        names = [p.strip() for p in parsed if isinstance(p, str) and p.strip()]
-                        if names:
-                            return names[:3]
-                except Exception:
-                    pass
-        # Also try parsing the whole text as JSON (in case the model returned only the array)
-        try:
-            parsed_whole = json.loads(competitor_text)
-            if isinstance(parsed_whole, list):
-                names = [p.strip() for p in parsed_whole if isinstance(p, str) and p.strip()]
-                if names:
-                    return names[:3]
-        except Exception:
-            pass
-    except Exception:
-        # Non-fatal: move on to heuristics
-        pass
-
-    # 2) Heuristic: **Competitor N: Name** pattern
-    pattern = r'\*\*Competitor \d+:\s*([^*\n]+?)\*\*'
-    matches = re.findall(pattern, competitor_text)
-    if matches:
-        competitors = [m.strip() for m in matches[:3]]
-        return competitors
-
-    # 3) Heuristic: lines with bullets or numbered lists
-    lines = competitor_text.splitlines()
-    candidates = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        # remove leading list markers like '1. ', '- ', '* '
-        m = re.match(r'^(?:\d+\.\s*|[-*]\s*)(.+)$', line)
-        if m:
-            content = m.group(1)
-        else:
-            content = line
-
-        # If the line contains a delimiter (" - ", " — ", ":"), take the leftmost chunk
-        for sep in [' - ', ' — ', '\u2013', '\u2014', ':']:
-            if sep in content:
-                content = content.split(sep)[0]
-                break
-
-        # Remove parenthetical notes and trailing description
-        content = re.sub(r'\([^)]*\)', '', content).strip()
-        # Skip lines that are obviously long prose
-        if len(content) > 120:
-            continue
-        candidates.append(content)
-
-    # Deduplicate while preserving order
-    seen = set()
-    for c in candidates:
-        if c and c not in seen:
-            seen.add(c)
-            competitors.append(c)
-            if len(competitors) >= 3:
-                break
-
-    return competitors
-
-
 def sanitize_competitor_output(text: str) -> str:
     """Return the user-facing portion of an analysis output.
 
@@ -376,8 +251,205 @@ def format_strategic_recommendations(text: str) -> str:
     return text
 
 # --- AGENT & TASK DEFINITIONS ---
-financial_agents = FinancialAgents()
-financial_tasks = FinancialTasks()
+# crewai and the agent/task factories are imported lazily by the code paths
+# that run crews, so rendering the company form does not pay for them.
+
+# Upper bound (seconds) on how long page load waits for the identification crews
+IDENTIFICATION_TIMEOUT = 300
+# Upper bound (seconds) on the per-competitor insights crews that follow identification
+COMPETITOR_INSIGHTS_TIMEOUT = 120
+# How long identification and insights results stay cached per company
+CREW_CACHE_TTL = 24 * 3600
+# Insights longer than this are rendered as plain text rather than markdown
+MAX_MARKDOWN_INSIGHTS_CHARS = 5000
+# Cap on concurrent per-competitor insights crews, to stay under LLM rate limits
+MAX_INSIGHTS_WORKERS = 5
+
+
+def _run(agent_factory, task_factory, *args):
+    """Build a single-agent crew from the given factories and return its raw output."""
+    from crewai import Crew, Process
+
+    agent = agent_factory()
+    task = task_factory(agent, *args)
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential).kickoff().raw
+
+
+class _ThrottledPlaceholder:
+    """Redraw an st.empty() placeholder at most once per `interval` seconds."""
+
+    def __init__(self, placeholder, interval=0.1):
+        self.placeholder = placeholder
+        self.interval = interval
+        self._last_render = 0.0
+
+    def update(self, text, force=False):
+        now = time.monotonic()
+        if force or now - self._last_render >= self.interval:
+            self.placeholder.markdown(escape_dollars_for_markdown(text))
+            self._last_render = now
+
+
+# st.fragment (or its experimental predecessor) scopes reruns to the decorated
+# block; older Streamlit versions without it render the block as a plain function.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+@_fragment
+def render_company_insights(company_insights, title="Top Actionable Insights", expanded=True):
+    """Render the synthesized insights in a collapsible section."""
+    with st.expander(title, expanded=expanded):
+        # Long payloads skip the markdown renderer, which is slow on large text
+        if len(company_insights) > MAX_MARKDOWN_INSIGHTS_CHARS:
+            st.text(company_insights)
+        else:
+            st.markdown(escape_dollars_for_markdown(company_insights))
+
+
+def _company_cache_key(company_name):
+    """Normalize a company name so that e.g. "Apple Inc." and "apple inc" share a cache entry."""
+    is_valid, clean_name = validate_company_name(company_name)
+    return " ".join((clean_name if is_valid else company_name).split()).lower()
+
+
+# Arguments with a leading underscore are not hashed by st.cache_data, so the
+# crews below are cached on the normalized key only while the prompt still uses
+# the company name as the user typed it.
+@st.cache_data(ttl=CREW_CACHE_TTL, show_spinner=False)
+def _identify_competitors(company_key, _company_name):
+    """Run the competitor identification crew and return its raw output."""
+    return _run(
+        get_financial_agents().competitor_identification_agent,
+        get_financial_tasks().identify_competitors_task,
+        _company_name
+    )
+
+
+@st.cache_data(ttl=CREW_CACHE_TTL, show_spinner=False)
+def _synthesize_insights(company_key, _company_name):
+    """Ask the insights synthesis agent for a short list of actionable insights."""
+    company_name = _company_name
+    return _run(
+        get_financial_agents().company_insights_synthesis_agent,
+        get_financial_tasks().strategy_synthesis_task,
+        f"List up to 10 concise, actionable insights for {company_name} for an executive (each 1-2 short bullets).",
+        f"No prior expert outputs are available; rely on your knowledge of {company_name}."
+    )
+
+
+def add_competitors_to_graph(kg, user_company, competitors):
+    """Record the user's company, its competitors and competes_with edges in one batch."""
+    identified_at = datetime.now().isoformat()
+    kg.add_companies_bulk(
+        [(user_company, {'is_user_company': True})]
+        + [(competitor, {'is_competitor': True}) for competitor in competitors]
+    )
+    kg.add_relationships_bulk([
+        (user_company, competitor, 'competes_with', {'identified_at': identified_at})
+        for competitor in competitors
+    ])
+
+
+def _synthesize_competitor_insights(competitors, timeout=COMPETITOR_INSIGHTS_TIMEOUT):
+    """Synthesize insights for every competitor concurrently, waiting at most `timeout` seconds.
+
+    Competitors whose crew failed or did not finish in time are left out.
+    """
+    if not competitors:
+        return {}
+
+    # No `with` block: its exit would wait for every crew and defeat the timeout
+    executor = ThreadPoolExecutor(max_workers=min(MAX_INSIGHTS_WORKERS, len(competitors)))
+    futures = {
+        name: executor.submit(_synthesize_insights, _company_cache_key(name), name)
+        for name in competitors
+    }
+    wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    insights = {}
+    for name, future in futures.items():
+        if not future.done():
+            print(f"Insights synthesis for {name} timed out after {timeout} seconds")
+            continue
+        try:
+            result = future.result(timeout=0)
+        except Exception as e:
+            print(f"Insights synthesis failed for {name}: {str(e)}")
+            continue
+        if result:
+            insights[name] = result
+    return insights
+
+
+def identify_competitors_with_insights(user_company):
+    """Identify a company's competitors and synthesize insights for it and each competitor.
+
+    Competitor identification and the company insights synthesis only depend on the
+    company name, so both crews are dispatched in parallel and the caller waits for
+    the slower of the two instead of their sum. Raises TimeoutError when
+    identification takes longer than IDENTIFICATION_TIMEOUT.
+    """
+    company_key = _company_cache_key(user_company)
+    # No `with` block: its exit would wait for both crews and defeat the timeout
+    executor = ThreadPoolExecutor(max_workers=2)
+    competitors_future = executor.submit(_identify_competitors, company_key, user_company)
+    insights_future = executor.submit(_synthesize_insights, company_key, user_company)
+    wait([competitors_future, insights_future], timeout=IDENTIFICATION_TIMEOUT)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    if not competitors_future.done():
+        raise TimeoutError(f"Competitor identification timed out after {IDENTIFICATION_TIMEOUT} seconds. Please try again.")
+
+    competitor_analysis = competitors_future.result(timeout=0)
+    try:
+        company_insights = insights_future.result(timeout=0)
+    except Exception as e:
+        # Insights are a nice-to-have; never fail identification because of them
+        print(f"Company insights synthesis failed: {str(e)}")
+        company_insights = None
+
+    competitors = parse_competitors(competitor_analysis)
+    return {
+        'competitor_analysis': competitor_analysis,
+        'competitors': competitors,
+        'company_insights': company_insights,
+        'competitor_insights': _synthesize_competitor_insights(competitors),
+    }
+
+
+def store_competitor_identification(session, user_company, identification):
+    """Record an identification result in the session, knowledge graph, memory and chat context."""
+    competitors = identification['competitors']
+    competitor_analysis = identification['competitor_analysis']
+
+    # populate knowledge graph
+    add_competitors_to_graph(memory.get_knowledge_graph(), user_company, competitors)
+
+    # Store the crew results together once they have completed. We don't append
+    # a verbose list message to the chat UI; the UI renders buttons for each
+    # competitor. Keep raw output in analysis_data for records.
+    session.update({
+        'competitors': competitors,
+        'company_insights': identification['company_insights'],
+        'competitor_insights': identification['competitor_insights'],
+        'conversation_state': 'competitors_identified'
+    })
+    session['analysis_data']['competitor_identification'] = competitor_analysis
+
+    memory.update_competitive_intelligence({
+        'user_company': user_company,
+        'competitors': competitors,
+        'competitor_identification': competitor_analysis
+    })
+
+    # Save competitor identification to context for chat
+    save_analysis_context(
+        user_company=user_company,
+        competitor="__identification__",
+        analysis=competitor_analysis,
+        entities=""
+    )
 
 
 def run_competitor_identification(session):
@@ -390,44 +462,8 @@ def run_competitor_identification(session):
         return
 
     try:
-        competitor_agent = financial_agents.competitor_identification_agent()
-        competitor_task = financial_tasks.identify_competitors_task(competitor_agent, user_company)
-        crew = Crew(agents=[competitor_agent], tasks=[competitor_task], process=Process.sequential)
-        competitor_analysis = crew.kickoff().raw
-
-        # Raw AI output (keep for records) and parse competitor names
-        competitors = parse_competitors(competitor_analysis)
-
-        # We don't append a verbose list message to the chat UI; the UI will render
-        # buttons for each competitor. Keep raw output in analysis_data for records.
-
-        # populate knowledge graph
-        kg = memory.get_knowledge_graph()
-        kg.add_company(user_company, {'is_user_company': True})
-        for competitor in competitors:
-            kg.add_company(competitor, {'is_competitor': True})
-            kg.add_relationship(user_company, competitor, 'competes_with', {
-                'identified_at': datetime.now().isoformat()
-            })
-
-        session['competitors'] = competitors
-        session['analysis_data']['competitor_identification'] = competitor_analysis
-        session['conversation_state'] = 'competitors_identified'
-        # Do not append the competitor list to session messages — buttons are shown below.
-
-        memory.update_competitive_intelligence({
-            'user_company': user_company,
-            'competitors': competitors,
-            'competitor_identification': competitor_analysis
-        })
-        
-        # Save competitor identification to context for chat
-        save_analysis_context(
-            user_company=user_company,
-            competitor="__identification__",
-            analysis=competitor_analysis,
-            entities=""
-        )
+        identification = identify_competitors_with_insights(user_company)
+        store_competitor_identification(session, user_company, identification)
 
         # refresh the page to show new state
         st.rerun()
@@ -440,11 +476,13 @@ def run_competitor_identification(session):
 # (Sidebar removed — sessions are created on Home and main UI displays relevant info.)
 
 # --- Helper function to create a new session ---
-def create_new_market_session(company_name):
-    """Create a new market analysis session for the given company."""
-    session_id = str(uuid.uuid4())
-    st.session_state.current_market_session_id = session_id
-    st.session_state.market_sessions[session_id] = {
+def _new_market_session(company_name):
+    """Return a fresh market session dict for the given company.
+
+    A function rather than a copied prototype dict: dict.copy() is shallow, so
+    every session would share the same messages/competitors/analyses containers.
+    """
+    return {
         "title": f"Competitive Intelligence - {company_name}",
         "session_type": "competitive",
         "messages": [],
@@ -457,16 +495,26 @@ def create_new_market_session(company_name):
         "competitor_analyses": {},
         "analysis_results": {},
         "quick_metrics": {},
-        "company_insights": None
+        "company_insights": None,
+        "competitor_insights": {}
     }
+
+
+def create_new_market_session(company_name):
+    """Create a new market analysis session for the given company."""
+    session_id = secrets.token_hex(8)
+    st.session_state.current_market_session_id = session_id
+    st.session_state.market_sessions[session_id] = _new_market_session(company_name)
+    st.session_state.market_sessions_by_company[company_name] = session_id
     st.session_state["current_user_company"] = company_name
     
-    # Add the user company to the knowledge graph
+    # Add the user company to the knowledge graph on the script thread: the
+    # graph is not thread-safe, and an in-memory node insert is too cheap to
+    # be worth handing off. A graph failure must not break session creation.
     try:
-        kg = memory.get_knowledge_graph()
-        kg.add_company(company_name, {"is_user_company": True})
-    except Exception:
-        pass
+        memory.get_knowledge_graph().add_company(company_name, {"is_user_company": True})
+    except Exception as e:
+        logging.warning("Could not add %s to the knowledge graph: %s", company_name, e)
     
     return session_id
 
@@ -543,53 +591,13 @@ with main_col:
                         with st.spinner(f"Identifying top competitors for {user_company_input}..."):
                             try:
                                 session["user_company"] = user_company_input
+                                st.session_state.market_sessions_by_company[user_company_input] = st.session_state.current_market_session_id
                                 session["messages"].append({"role": "user", "content": f"My company: {user_company_input}"})
                                 session["conversation_state"] = "identifying_competitors"
                                 
-                                # Identify competitors
-                                competitor_agent = financial_agents.competitor_identification_agent()
-                                competitor_task = financial_tasks.identify_competitors_task(competitor_agent, user_company_input)
-                                crew = Crew(agents=[competitor_agent], tasks=[competitor_task], process=Process.sequential)
-                                competitor_analysis = crew.kickoff().raw
-
-                                # Parse competitor names
-                                competitors = parse_competitors(competitor_analysis)
-
-                                # Create concise UI-friendly summary
-                                if competitors:
-                                    concise_list = "\n".join([f"{i+1}. {c}" for i, c in enumerate(competitors)])
-                                    assistant_msg = f"I've identified the top {len(competitors)} competitors for {user_company_input}:\n\n{concise_list}\n\nClick on a competitor below to get detailed competitive intelligence."
-                                else:
-                                    assistant_msg = f"I could not extract clear competitor names for {user_company_input}."
-
-                                # Build knowledge graph - add user company and competitors
-                                kg = memory.get_knowledge_graph()
-                                kg.add_company(user_company_input, {'is_user_company': True})
-                                for competitor in competitors:
-                                    kg.add_company(competitor, {'is_competitor': True})
-                                    kg.add_relationship(user_company_input, competitor, 'competes_with', {
-                                        'identified_at': datetime.now().isoformat()
-                                    })
-
-                                session["competitors"] = competitors
-                                session["analysis_data"]["competitor_identification"] = competitor_analysis
-                                memory.update_competitive_intelligence({
-                                    "user_company": user_company_input,
-                                    "competitors": competitors,
-                                    "competitor_identification": competitor_analysis
-                                })
-                                
-                                # Save competitor identification to context for chat
-                                save_analysis_context(
-                                    user_company=user_company_input,
-                                    competitor="__identification__",
-                                    analysis=competitor_analysis,
-                                    entities=""
-                                )
-
-                                # Do not append the competitor list message into the chat UI;
-                                # the UI will render buttons for competitors below.
-                                session["conversation_state"] = "competitors_identified"
+                                # Identify competitors and synthesize insights, as on page load
+                                identification = identify_competitors_with_insights(user_company_input)
+                                store_competitor_identification(session, user_company_input, identification)
                                 session["title"] = f"Competitive Intelligence - {user_company_input}"
                                 
                                 st.rerun()
@@ -614,6 +622,13 @@ with main_col:
                                 session["conversation_state"] = "analyzing_competitor"
                                 st.rerun()
                     
+                    # Display the synthesized insights for the user's company, if available
+                    company_insights = session.get("company_insights")
+                    if company_insights:
+                        render_company_insights(company_insights)
+                    for competitor, insights in session.get("competitor_insights", {}).items():
+                        render_company_insights(insights, f"Insights: {competitor}", expanded=False)
+
                     # Display competitor descriptions (Why These Are Key Competitors section)
                     competitor_identification = session.get("analysis_data", {}).get("competitor_identification", "")
                     if competitor_identification:
@@ -639,13 +654,7 @@ with main_col:
                         if names:
                             session['competitors'] = names[:3]
                             # Update knowledge graph and memory
-                            kg = memory.get_knowledge_graph()
-                            kg.add_company(session['user_company'], {'is_user_company': True})
-                            for competitor in session['competitors']:
-                                kg.add_company(competitor, {'is_competitor': True})
-                                kg.add_relationship(session['user_company'], competitor, 'competes_with', {
-                                    'identified_at': datetime.now().isoformat()
-                                })
+                            add_competitors_to_graph(memory.get_knowledge_graph(), session['user_company'], session['competitors'])
 
                             # Record manual override
                             session['analysis_data']['competitor_identification_manual'] = manual
@@ -665,6 +674,10 @@ with main_col:
             elif state == "analyzing_competitor":
                 selected_competitor = session.get("selected_competitor")
                 if selected_competitor:
+                    from crewai import Crew, Process
+                    financial_agents = get_financial_agents()
+                    financial_tasks = get_financial_tasks()
+
                     # Initialize progress and status containers
                     progress_container = st.empty()
                     status_container = st.empty()
@@ -719,15 +732,8 @@ Analysis State: Starting competitive intelligence analysis""")
                         # Step 2: Regulatory Analysis
                         status_container.info("⚖️ Step 2/4: Analyzing regulatory concerns...")
                         
-                        # Extract strategic recommendations from competitive analysis
-                        strategic_recs = ""
-                        if "## Strategic Recommendations" in competitive_analysis:
-                            recs_section = competitive_analysis.split("## Strategic Recommendations")[1]
-                            # Get just the recommendations section (stop at next ## heading or end)
-                            if "\n##" in recs_section:
-                                strategic_recs = recs_section.split("\n##")[0]
-                            else:
-                                strategic_recs = recs_section
+                        # Extract strategic recommendations from competitive analysis (up to the next ## heading)
+                        strategic_recs = extract_strategic_recommendations(competitive_analysis)
                         
                         # Determine industry context from the companies
                         industry_context = f"{selected_competitor} and {session['user_company']} industry"
@@ -753,35 +759,7 @@ Analysis State: Starting competitive intelligence analysis""")
                             regulatory_analysis = regulatory_analysis.raw
                             
                             # Clean up any agent thinking/reasoning text that leaked into output
-                            # Remove everything before the first markdown heading
-                            if "##" in regulatory_analysis:
-                                # Find the first ## heading
-                                first_heading_idx = regulatory_analysis.find("##")
-                                regulatory_analysis = regulatory_analysis[first_heading_idx:]
-                            
-                            # Remove any lines that start with "Thought:" or contain agent reasoning
-                            lines = regulatory_analysis.split('\n')
-                            cleaned_lines = []
-                            skip_mode = False
-                            
-                            for line in lines:
-                                # Skip lines that are agent thoughts/reasoning
-                                if line.strip().startswith("Thought:") or \
-                                   line.strip().startswith("Action:") or \
-                                   line.strip().startswith("Using Tool:") or \
-                                   line.strip().startswith("Tool Input:") or \
-                                   line.strip().startswith("Observation:"):
-                                    skip_mode = True
-                                    continue
-                                
-                                # Exit skip mode when we hit a markdown heading
-                                if line.strip().startswith("##"):
-                                    skip_mode = False
-                                
-                                if not skip_mode:
-                                    cleaned_lines.append(line)
-                            
-                            regulatory_analysis = '\n'.join(cleaned_lines)
+                            regulatory_analysis = strip_agent_scratch(regulatory_analysis)
                         else:
                             regulatory_analysis = "## Regulatory & Compliance Concerns\n\nNo significant regulatory concerns identified at this time."
                         
@@ -947,6 +925,10 @@ with chat_col:
 
     # Chat input
     if prompt := st.chat_input("Ask about competitive analysis..."):
+        from crewai import Crew, Process
+        financial_agents = get_financial_agents()
+        financial_tasks = get_financial_tasks()
+
         st.session_state.chat_history.append({"role": "user", "content": prompt})
         
         with st.chat_message("user"):
@@ -1057,11 +1039,21 @@ with chat_col:
                         )
                         tasks.append(comparison_task)
                     
+                    # Show each task's output as soon as it finishes instead of
+                    # waiting for the whole crew; the final answer replaces it below.
+                    preview = _ThrottledPlaceholder(st.empty())
+
+                    def _show_task_output(task_output):
+                        text = strip_thinking_from_response(getattr(task_output, "raw", "") or "")
+                        if text:
+                            preview.update(text)
+
                     # Run all tasks with the crew
                     crew = Crew(
                         agents=[primary_agent, online_agent, financial_agents.market_comparison_agent()],
                         tasks=tasks,
-                        process=Process.sequential
+                        process=Process.sequential,
+                        task_callback=_show_task_output
                     )
                     
                     crew_result = crew.kickoff()
@@ -1072,14 +1064,15 @@ with chat_col:
                         fallback_crew = Crew(
                             agents=[online_agent],
                             tasks=[online_task],
-                            process=Process.sequential
+                            process=Process.sequential,
+                            task_callback=_show_task_output
                         )
                         fallback_result = fallback_crew.kickoff()
                         response = strip_thinking_from_response(fallback_result.raw) if fallback_result else "I apologize, but I couldn't generate a complete analysis. Please try rephrasing your question."
                     
                     # Format recommendation responses with proper line breaks
                     formatted_response = format_recommendation_response(response)
-                    st.markdown(escape_dollars_for_markdown(formatted_response))
+                    preview.update(formatted_response, force=True)
                     st.session_state.chat_history.append({"role": "assistant", "content": formatted_response})
                 except Exception as e:
                     error_msg = f"Sorry, I encountered an error: {e}"
@@ -0,0 +1,43 @@
+from utils import extract_strategic_recommendations, strip_agent_scratch
+
+
+def test_strip_agent_scratch_drops_preamble_and_tool_blocks():
+    text = (
+        "I will look up the filings first.\n"
+        "## Regulatory Landscape\n"
+        "Key rules apply.\n"
+        "Thought: I should search for fines.\n"
+        "Action: web_search\n"
+        "Observation: nothing new\n"
+        "## Compliance Risks\n"
+        "Data privacy."
+    )
+    assert strip_agent_scratch(text) == (
+        "## Regulatory Landscape\n"
+        "Key rules apply.\n"
+        "## Compliance Risks\n"
+        "Data privacy."
+    )
+
+
+def test_strip_agent_scratch_keeps_clean_text():
+    text = "## Summary\nNo tool use here."
+    assert strip_agent_scratch(text) == text
+
+
+def test_extract_strategic_recommendations_returns_section_body():
+    text = (
+        "## Overview\nMarket share is growing.\n"
+        "## Strategic Recommendations\n1. Expand into Europe.\n"
+        "## Risks\nSupply chain."
+    )
+    assert extract_strategic_recommendations(text) == "\n1. Expand into Europe."
+
+
+def test_extract_strategic_recommendations_runs_to_end_of_text():
+    text = "## Strategic Recommendations\n- Cut costs."
+    assert extract_strategic_recommendations(text) == "\n- Cut costs."
+
+
+def test_extract_strategic_recommendations_missing_section():
+    assert extract_strategic_recommendations("## Overview\nNothing to recommend.") == ""
@@ -1,6 +1,8 @@
 import streamlit as st
 from pypdf import PdfReader
 import io
+import json
+import os
 import re
 import pandas as pd
 from knowledge_graph import CompetitiveKnowledgeGraph
@@ -92,10 +94,36 @@ class CentralMemory:
         return ""
 
 def get_memory():
+    # Deliberately session-scoped rather than st.cache_resource: the memory and
+    # knowledge graph hold one user's companies and analyses, and a cached
+    # resource would be shared by every session on the server.
     if 'central_memory' not in st.session_state:
         st.session_state.central_memory = CentralMemory()
     return st.session_state.central_memory
 
+@st.cache_data(show_spinner=False)
+def load_css(filename="analysis.css"):
+    """Read a stylesheet from the static/ directory once per process."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", filename)
+    with open(path, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+def inject_css(filename="analysis.css"):
+    """Inject a shared stylesheet into the current page."""
+    st.markdown(load_css(filename), unsafe_allow_html=True)
+
+@st.cache_resource
+def get_financial_agents():
+    """Return the process-wide FinancialAgents factory (stateless, safe to share)."""
+    from financial_agents import FinancialAgents
+    return FinancialAgents()
+
+@st.cache_resource
+def get_financial_tasks():
+    """Return the process-wide FinancialTasks factory (stateless, safe to share)."""
+    from financial_tasks import FinancialTasks
+    return FinancialTasks()
+
 def process_uploaded_files(uploaded_files):
     """Reads text from uploaded files (PDF, TXT, MD, CSV) and combines them."""
     combined_text = ""
@@ -183,6 +211,119 @@ def validate_company_name(company_name):
     
     return True, clean_name.strip()
 
+# An agent scratch block starts at a Thought:/Action:/... line and runs until the
+# next "##" heading (or the end of the text).
+_AGENT_SCRATCH_RE = re.compile(
+    r'(?:\A|\n)[ \t]*(?:Thought|Action|Using Tool|Tool Input|Observation):.*?(?=\n[ \t]*##|\Z)',
+    re.DOTALL
+)
+
+def strip_agent_scratch(text):
+    """Drop agent reasoning before the first heading and any tool-use scratch blocks."""
+    first_heading_idx = text.find("##")
+    if first_heading_idx != -1:
+        text = text[first_heading_idx:]
+    return _AGENT_SCRATCH_RE.sub('', text)
+
+# Body of the "## Strategic Recommendations" section, up to the next heading
+_STRATEGIC_RECS_RE = re.compile(r'## Strategic Recommendations(.*?)(?=\n##|\Z)', re.DOTALL)
+
+def extract_strategic_recommendations(text):
+    """Return the Strategic Recommendations section body, or "" if there is none."""
+    match = _STRATEGIC_RECS_RE.search(text)
+    return match.group(1) if match else ""
+
+# Patterns used by parse_competitors, compiled once at import
+_COMPETITOR_RE = re.compile(r'\*\*Competitor \d+:\s*([^*\n]+?)\*\*')
+_LIST_MARKER_RE = re.compile(r'^(?:\d+\.\s*|[-*]\s*)(.+)$')
+_PARENTHETICAL_RE = re.compile(r'\([^)]*\)')
+_LINE_RE = re.compile(r'[^\r\n]+')
+
+def parse_competitors(competitor_text):
+    """Parse competitor names from the AI response.
+
+    Strategy:
+    1. Try to locate and parse a JSON array anywhere in the response.
+    2. If no JSON is found, fall back to several heuristic patterns ("**Competitor N: ...**",
+       numbered lists, bullet lists, simple left-hand name extraction).
+    3. Return up to 3 unique, trimmed names.
+    """
+    competitors = []
+    if not competitor_text:
+        return competitors
+
+    # 1) Try to find a JSON array anywhere in the text and parse it
+    try:
+        # Find the first balanced [...] substring (simple approach)
+        start = competitor_text.find('[')
+        if start != -1:
+            # attempt to find the corresponding closing bracket
+            end = competitor_text.find(']', start)
+            if end != -1:
+                maybe_json = competitor_text[start:end+1]
+                try:
+                    parsed = json.loads(maybe_json)
+                    if isinstance(parsed, list):
+                        names = [p.strip() for p in parsed if isinstance(p, str) and p.strip()]
+                        if names:
+                            return names[:3]
+                except Exception:
+                    pass
+        # Also try parsing the whole text as JSON (in case the model returned only the array)
+        try:
+            parsed_whole = json.loads(competitor_text)
+            if isinstance(parsed_whole, list):
+                names = [p.strip() for p in parsed_whole if isinstance(p, str) and p.strip()]
+                if names:
+                    return names[:3]
+        except Exception:
+            pass
+    except Exception:
+        # Non-fatal: move on to heuristics
+        pass
+
+    # 2) Heuristic: **Competitor N: Name** pattern
+    for match in _COMPETITOR_RE.finditer(competitor_text):
+        competitors.append(match.group(1).strip())
+        if len(competitors) == 3:
+            break
+    if competitors:
+        return competitors
+
+    # 3) Heuristic: lines with bullets or numbered lists (scanned lazily, stops at 3 names)
+    seen = set()
+    for line_match in _LINE_RE.finditer(competitor_text):
+        line = line_match.group().strip()
+        if not line:
+            continue
+        # remove leading list markers like '1. ', '- ', '* '
+        m = _LIST_MARKER_RE.match(line)
+        if m:
+            content = m.group(1)
+        else:
+            content = line
+
+        # If the line contains a delimiter (" - ", " — ", ":"), take the leftmost chunk
+        for sep in [' - ', ' — ', '\u2013', '\u2014', ':']:
+            if sep in content:
+                content = content.split(sep)[0]
+                break
+
+        # Remove parenthetical notes and trailing description
+        content = _PARENTHETICAL_RE.sub('', content).strip()
+        # Skip lines that are obviously long prose
+        if len(content) > 120:
+            continue
+
+        # Deduplicate while preserving order
+        if content and content not in seen:
+            seen.add(content)
+            competitors.append(content)
+            if len(competitors) >= 3:
+                break
+
+    return competitors
+
 def format_financial_number(value, format_type="auto"):
     """Format financial numbers for display."""
     try: